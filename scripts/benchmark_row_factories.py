@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark result row shapes (dict vs tuple vs record vs columns)
+
+Uses synthetic rows shaped like the policy roles query
+(OipaQueryBuilder.ROLE_COLUMNS), so no database connection is required. Reports time and peak allocation per
+10,000 rows for each format supported by OipaDatabase.execute_query().
+"""
+
+import re
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from oipa_mcp.connectors.database import OipaQueryBuilder
+from oipa_mcp.connectors.rows import ROW_FORMATS, column_names, convert_rows
+
+ROWS = 10_000
+REPEAT = 20
+
+# Column names as the driver reports them for the roles query
+RAW_COLUMNS = tuple(name.upper() for name in re.findall(r"\bas (\w+)", OipaQueryBuilder.ROLE_COLUMNS))
+
+
+def build_rows():
+    """Build synthetic driver tuples"""
+    birth = datetime(1985, 1, 1)
+    return [
+        (
+            f"ROLE-{i:08d}", "01", 100.0, None, "01", f"CLIENT-{i:08d}", "María", "García", None, "GARM850101ABC", "01",
+            birth, "F", f"client{i}@example.com"
+        )
+        for i in range(ROWS)
+    ]
+
+
+def measure(row_format, columns, rows):
+    """Return (best seconds, peak bytes) for converting all rows"""
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        convert_rows(columns, rows, row_format)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    result = convert_rows(columns, rows, row_format)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return best, peak
+
+
+def main():
+    print(f"🔍 Row format benchmark: {ROWS:,} rows x {len(RAW_COLUMNS)} columns (best of {REPEAT})\n")
+    rows = build_rows()
+    columns = column_names(RAW_COLUMNS)
+
+    baseline = None
+    print(f"{'format':<10} {'time (ms)':>10} {'peak (KiB)':>12} {'vs dict':>10}")
+    for row_format in ROW_FORMATS:
+        seconds, peak = measure(row_format, columns, rows)
+        if baseline is None:
+            baseline = (seconds, peak)
+        ratio = f"{seconds / baseline[0]:.2f}x" if baseline[0] else "-"
+        print(f"{row_format:<10} {seconds * 1000:>10.2f} {peak / 1024:>12.1f} {ratio:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark free-text policy search SQL: OR'ed predicates vs UNION ALL branches
+
+Runs OipaQueryBuilder.search_policies with each SEARCH_QUERY_STRATEGY for
+the given terms against the configured database. For every match mode it
+reports the best and median elapsed time and the number of policies found,
+and flags any term where the two strategies return different policies.
+
+Usage:
+    python scripts/benchmark_search_strategies.py [term ...] [--repeat N] [--limit N]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from oipa_mcp.connectors import OipaQueryBuilder, oipa_db
+from oipa_mcp.connectors.database import MATCH_MODES, SEARCH_STRATEGIES, SearchRoute
+
+DEFAULT_TERMS = ["Garcia", "Maria", "ACME", "850101"]
+
+
+async def measure(term, match_mode, strategy, repeat, limit):
+    """Return (timings in seconds, policy GUIDs) for one search shape"""
+    query, parameters = OipaQueryBuilder.search_policies(
+        search_term=term,
+        limit=limit,
+        route=SearchRoute("text", term),
+        match_mode=match_mode,
+        strategy=strategy
+    )
+    timings = []
+    guids = set()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = await oipa_db.execute_query(query, parameters, row_format="tuple")
+        timings.append(time.perf_counter() - start)
+        guids = {row[0] for row in rows}
+    return timings, guids
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("terms", nargs="*", default=DEFAULT_TERMS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"🔍 Search strategy benchmark ({args.repeat} runs per shape, limit {args.limit})\n")
+    await oipa_db.initialize()
+    try:
+        print(f"{'term':<16} {'mode':<9} {'strategy':<9} {'best (ms)':>10} {'median (ms)':>12} {'policies':>9}")
+        for term in args.terms:
+            for match_mode in MATCH_MODES:
+                found = {}
+                for strategy in SEARCH_STRATEGIES:
+                    timings, guids = await measure(term, match_mode, strategy, args.repeat, args.limit)
+                    found[strategy] = guids
+                    print(
+                        f"{term:<16} {match_mode:<9} {strategy:<9} {min(timings) * 1000:>10.1f} "
+                        f"{statistics.median(timings) * 1000:>12.1f} {len(guids):>9}"
+                    )
+                # Top-N can legitimately differ on UpdatedGmt ties
+                if len(set(map(frozenset, found.values()))) > 1:
+                    print(f"⚠️  '{term}' ({match_mode}): strategies returned different policies")
+    finally:
+        await oipa_db.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Check the function-based indexes used by prefix searches
+
+oipa_search_policies and search_clients match names with UPPER(col).
+Prefix searches (UPPER(col) LIKE :term || '%') can use an index only when
+an UPPER(col) function-based index exists on each searched column. This
+script lists what is missing on AsPolicy/AsClient and prints the DDL.
+With SEARCH_MATCH_MODE=auto the server switches its default to prefix
+once all of them exist.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from oipa_mcp.config import config
+from oipa_mcp.connectors import oipa_db
+from oipa_mcp.connectors.database import SEARCH_INDEX_COLUMNS
+
+
+async def check_search_indexes():
+    """Report missing UPPER(col) indexes and print their DDL"""
+    print("🔍 Checking search indexes...")
+    print(f"📋 Schema: {config.database.default_schema or '(current user)'}")
+
+    try:
+        await oipa_db.initialize()
+        missing = await oipa_db.detect_search_indexes()
+    except Exception as e:
+        print(f"❌ Search index check failed: {e}")
+        return False
+    finally:
+        await oipa_db.close()
+
+    if missing is None:
+        print("❌ Could not read ALL_IND_EXPRESSIONS (see log for details)")
+        return False
+
+    total = sum(len(columns) for columns in SEARCH_INDEX_COLUMNS.values())
+    print(f"✅ {total - len(missing)}/{total} search columns have UPPER(col) indexes")
+
+    if not missing:
+        print("\n🎉 All search indexes present - prefix searches can use them")
+        return True
+
+    print("\n⚠️  Missing indexes; run this DDL (as the schema owner) to enable index-friendly prefix search:\n")
+    for ddl in missing:
+        print(f"{ddl};")
+    return True
+
+
+async def main():
+    """Main function"""
+    print("🚀 OIPA MCP Server Search Index Advisor")
+    print("=" * 40)
+
+    success = await check_search_indexes()
+    if not success:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
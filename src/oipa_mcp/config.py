@@ -14,6 +14,20 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def _parse_key_value_list(value: Optional[str]) -> Dict[str, str]:
+    """Parse a 'KEY=VALUE,KEY=VALUE' environment setting into a dictionary"""
+    result = {}
+    if not value:
+        return result
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        key, val = item.split("=", 1)
+        if key.strip():
+            result[key.strip().upper()] = val.strip()
+    return result
+
+
 @dataclass
 class DatabaseConfig:
     """Oracle Database connection configuration"""
@@ -26,21 +40,68 @@ class DatabaseConfig:
     # Schema settings
     default_schema: Optional[str] = field(default_factory=lambda: os.getenv("OIPA_DB_DEFAULT_SCHEMA"))
     
+    # Session state applied once per physical connection
+    session_nls: Dict[str, str] = field(default_factory=lambda: _parse_key_value_list(os.getenv("OIPA_DB_SESSION_NLS")))
+    session_module: str = field(default_factory=lambda: os.getenv("OIPA_DB_SESSION_MODULE", "oipa-mcp"))
+    session_action: str = field(default_factory=lambda: os.getenv("OIPA_DB_SESSION_ACTION", "mcp-tool"))
+    
     # Cloud Wallet settings
     wallet_location: Optional[str] = field(default_factory=lambda: os.getenv("OIPA_DB_WALLET_LOCATION"))
     wallet_password: Optional[str] = field(default_factory=lambda: os.getenv("OIPA_DB_WALLET_PASSWORD"))
     connection_type: str = field(default_factory=lambda: os.getenv("OIPA_DB_CONNECTION_TYPE", "traditional"))
     
+    # Database Resident Connection Pooling: server processes shared across MCP processes
+    drcp_enabled: bool = field(default_factory=lambda: os.getenv("OIPA_DB_DRCP", "false").lower() == "true")
+    drcp_connection_class: str = field(default_factory=lambda: os.getenv("OIPA_DB_DRCP_CLASS", "OIPAMCP"))
+    drcp_purity: str = field(default_factory=lambda: os.getenv("OIPA_DB_DRCP_PURITY", "self").lower())
+    
     # Connection pool settings
     pool_min_size: int = field(default_factory=lambda: int(os.getenv("DB_POOL_MIN_SIZE", "1")))
     pool_max_size: int = field(default_factory=lambda: int(os.getenv("DB_POOL_MAX_SIZE", "10")))
     pool_timeout: int = field(default_factory=lambda: int(os.getenv("DB_POOL_TIMEOUT", "30")))
+    pool_warmup_size: int = field(default_factory=lambda: int(os.getenv("DB_POOL_WARMUP_SIZE", "2")))
+    
+    # Adaptive pool sizing from acquire-wait telemetry (interval 0 disables)
+    autoscale_interval: int = field(default_factory=lambda: int(os.getenv("DB_POOL_AUTOSCALE_INTERVAL", "30")))
+    autoscale_min_ceiling: int = field(default_factory=lambda: int(os.getenv("DB_POOL_AUTOSCALE_MIN_CEILING", "0")))
+    autoscale_max_increment: int = field(default_factory=lambda: int(os.getenv("DB_POOL_AUTOSCALE_MAX_INCREMENT", "4")))
+    autoscale_wait_target_ms: int = field(default_factory=lambda: int(os.getenv("DB_POOL_ACQUIRE_WAIT_TARGET_MS", "50")))
+    
+    # Read-only replica (e.g. Active Data Guard standby) for query tools; unset disables it
+    replica_dsn: Optional[str] = field(default_factory=lambda: os.getenv("OIPA_DB_REPLICA_DSN") or None)
+    replica_username: Optional[str] = field(default_factory=lambda: os.getenv("OIPA_DB_REPLICA_USERNAME") or None)
+    replica_password: Optional[str] = field(default_factory=lambda: os.getenv("OIPA_DB_REPLICA_PASSWORD") or None)
+    replica_pool_max_size: int = field(default_factory=lambda: int(os.getenv("DB_REPLICA_POOL_MAX_SIZE", "0")))
+    replica_max_lag: int = field(default_factory=lambda: int(os.getenv("DB_REPLICA_MAX_LAG", "30")))
+    replica_check_interval: int = field(default_factory=lambda: int(os.getenv("DB_REPLICA_CHECK_INTERVAL", "15")))
+    
+    # Bulk key lookups (fetch_by_keys): collection type for bound key lists, and an
+    # optional ON COMMIT DELETE ROWS temporary table used above the threshold
+    key_list_type: str = field(default_factory=lambda: os.getenv("OIPA_DB_KEY_LIST_TYPE", "SYS.ODCIVARCHAR2LIST"))
+    keys_gtt: Optional[str] = field(default_factory=lambda: os.getenv("OIPA_DB_KEYS_GTT") or None)
+    keys_gtt_threshold: int = field(default_factory=lambda: int(os.getenv("DB_KEYS_GTT_THRESHOLD", "5000")))
+    
+    # Driver statement cache (per connection); 0 disables it
+    stmt_cache_size: int = field(default_factory=lambda: int(os.getenv("DB_STMT_CACHE_SIZE", "40")))
+    
+    # Retry of read-only statements on transient errors (0 attempts disables)
+    retry_attempts: int = field(default_factory=lambda: int(os.getenv("DB_RETRY_ATTEMPTS", "2")))
+    retry_backoff_ms: int = field(default_factory=lambda: int(os.getenv("DB_RETRY_BACKOFF_MS", "100")))
+    retry_max_backoff_ms: int = field(default_factory=lambda: int(os.getenv("DB_RETRY_MAX_BACKOFF_MS", "2000")))
+    
+    # Pool health monitoring and circuit breaker settings
+    health_check_interval: int = field(default_factory=lambda: int(os.getenv("DB_HEALTH_CHECK_INTERVAL", "30")))
+    circuit_failure_threshold: int = field(default_factory=lambda: int(os.getenv("DB_CIRCUIT_FAILURE_THRESHOLD", "3")))
+    circuit_reset_timeout: int = field(default_factory=lambda: int(os.getenv("DB_CIRCUIT_RESET_TIMEOUT", "15")))
     
     @property
     def dsn(self) -> str:
         """Build Oracle DSN string"""
         if self.connection_type == "cloud_wallet":
             return self.service_name
+        if self.drcp_enabled:
+            # Easy Connect form that asks the listener for a DRCP pooled server
+            return f"{self.host}:{self.port}/{self.service_name}:pooled"
         return f"{self.host}:{self.port}/{self.service_name}"
     
     @property
@@ -93,8 +154,56 @@ class LoggingConfig:
 class PerformanceConfig:
     """Performance and caching configuration"""
     cache_ttl: int = field(default_factory=lambda: int(os.getenv("CACHE_TTL", "300")))
+    # Hard caps on rows / approximate bytes fetched per query; larger results are truncated
     max_query_results: int = field(default_factory=lambda: int(os.getenv("MAX_QUERY_RESULTS", "1000")))
+    max_result_bytes: int = field(default_factory=lambda: int(os.getenv("MAX_RESULT_BYTES", str(16 * 1024 * 1024))))
     query_timeout: int = field(default_factory=lambda: int(os.getenv("QUERY_TIMEOUT", "30")))
+    # Per-tool overrides of QUERY_TIMEOUT, e.g. "oipa_policy_counts_by_status=120"
+    tool_timeouts: Dict[str, str] = field(default_factory=lambda: _parse_key_value_list(os.getenv("TOOL_TIMEOUTS")))
+    # Batch size for result sets of unknown size (small/top-N queries are sized per shape)
+    fetch_array_size: int = field(default_factory=lambda: int(os.getenv("FETCH_ARRAY_SIZE", "1000")))
+    stream_batch_size: int = field(default_factory=lambda: int(os.getenv("STREAM_BATCH_SIZE", "500")))
+    arrow_batch_size: int = field(default_factory=lambda: int(os.getenv("ARROW_BATCH_SIZE", "50000")))
+    # Bulk DML (execute_many): rows per executemany and chunks run in parallel
+    bulk_chunk_size: int = field(default_factory=lambda: int(os.getenv("BULK_CHUNK_SIZE", "5000")))
+    bulk_concurrency: int = field(default_factory=lambda: int(os.getenv("BULK_CONCURRENCY", "1")))
+    # Search-term classifier: terms fully matching one of these regexes (after
+    # upper-casing) are searched with indexed equality/prefix lookups instead of LIKE '%term%'
+    search_policy_number_pattern: str = field(default_factory=lambda: os.getenv(
+        "SEARCH_POLICY_NUMBER_PATTERN", r"[A-Z]{2}\d{2}(-\d+){3}"))
+    search_policy_prefix_pattern: str = field(default_factory=lambda: os.getenv(
+        "SEARCH_POLICY_PREFIX_PATTERN", r"[A-Z]{2}\d{2}-[\d-]*"))
+    search_guid_pattern: str = field(default_factory=lambda: os.getenv(
+        "SEARCH_GUID_PATTERN", r"[0-9A-F]{8}-[0-9A-F]{4}-[0-9A-F]{4}-[0-9A-F]{4}-[0-9A-F]{12}"))
+    search_tax_id_pattern: str = field(default_factory=lambda: os.getenv(
+        "SEARCH_TAX_ID_PATTERN", r"[A-ZÑ&]{3,4}\d{6}[A-Z0-9]{3}"))
+    # Free-text match mode: exact, prefix, contains, or auto (prefix when the
+    # UPPER(col) indexes exist, else contains)
+    search_match_mode: str = field(default_factory=lambda: os.getenv("SEARCH_MATCH_MODE", "auto").lower())
+    # Free-text search SQL: "or" (one OR'ed predicate) or "union" (one UNION ALL
+    # branch per column, so per-column indexes can be used)
+    search_query_strategy: str = field(default_factory=lambda: os.getenv("SEARCH_QUERY_STRATEGY", "or").lower())
+    # In-process trigram index for substring searches: refreshed from UpdatedGmt
+    # every interval seconds, deleted policies dropped every reconcile interval;
+    # terms matching more policies than max candidates use Oracle
+    search_index_enabled: bool = field(default_factory=lambda: os.getenv("SEARCH_INDEX_ENABLED", "false").lower() == "true")
+    search_index_refresh_interval: float = field(default_factory=lambda: float(os.getenv("SEARCH_INDEX_REFRESH_INTERVAL", "60")))
+    search_index_max_candidates: int = field(default_factory=lambda: int(os.getenv("SEARCH_INDEX_MAX_CANDIDATES", "1000")))
+    search_index_reconcile_interval: float = field(default_factory=lambda: float(os.getenv("SEARCH_INDEX_RECONCILE_INTERVAL", "3600")))
+    # In-process policy counts by status: changes applied every refresh interval
+    # seconds, full recount every reconcile interval seconds
+    status_counts_enabled: bool = field(default_factory=lambda: os.getenv("STATUS_COUNTS_ENABLED", "false").lower() == "true")
+    status_counts_refresh_interval: float = field(default_factory=lambda: float(os.getenv("STATUS_COUNTS_REFRESH_INTERVAL", "60")))
+    status_counts_reconcile_interval: float = field(default_factory=lambda: float(os.getenv("STATUS_COUNTS_RECONCILE_INTERVAL", "3600")))
+    # DBA-maintained materialized view/table of policy counts (StatusCode, PlanGUID,
+    # IssueStateCode, PolicyCount) used by dashboard aggregates while refreshed within
+    # max staleness seconds (0 = no freshness check)
+    summary_policy_counts_view: Optional[str] = field(default_factory=lambda: os.getenv("SUMMARY_POLICY_COUNTS_VIEW") or None)
+    summary_max_staleness: float = field(default_factory=lambda: float(os.getenv("SUMMARY_MAX_STALENESS", "3600")))
+    # AsCode descriptions are cached in memory and reloaded every interval seconds (0 disables reloads)
+    code_refresh_interval: float = field(default_factory=lambda: float(os.getenv("CODE_REFRESH_INTERVAL", "3600")))
+    # Latency histograms are written here on shutdown (recorded when ENABLE_MONITORING=true)
+    latency_dump_file: Optional[str] = field(default_factory=lambda: os.getenv("LATENCY_DUMP_FILE") or None)
 
 
 @dataclass
@@ -3,14 +3,38 @@ Connectors package for OIPA integration
 
 Provides various connection methods to OIPA:
 - database.py: Direct Oracle database connection
+- codes.py: In-memory AsCode dictionary (status, state and role descriptions)
+- rows.py: Result row shapes (dicts, tuples, slotted records, columns)
+- frames.py: Columnar (Arrow) results for analytics queries
+- metrics.py: Hot-path latency histograms
+- trigram.py: In-memory trigram index for substring search
 - web_service.py: FileReceived SOAP web service  
 - push_framework.py: Push Framework integration
 """
 
-from .database import OipaDatabase, OipaQueryBuilder, oipa_db
+from .database import (
+    BulkDmlError, BulkDmlResult, OipaDatabase, OipaQueryBuilder, QueryTimeoutError, SearchRoute,
+    code_dictionary, collect_truncations, oipa_db, policy_search_index, policy_status_counts, query_deadline,
+    replica_reads, search_classifier, summary_views, truncation_notes
+)
+from .metrics import latency_metrics
 
 __all__ = [
+    "BulkDmlError",
+    "BulkDmlResult",
     "OipaDatabase", 
     "OipaQueryBuilder",
-    "oipa_db"
+    "QueryTimeoutError",
+    "SearchRoute",
+    "code_dictionary",
+    "collect_truncations",
+    "latency_metrics",
+    "oipa_db",
+    "policy_search_index",
+    "policy_status_counts",
+    "query_deadline",
+    "replica_reads",
+    "search_classifier",
+    "summary_views",
+    "truncation_notes"
 ]
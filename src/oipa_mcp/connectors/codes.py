@@ -0,0 +1,126 @@
+"""
+In-memory AsCode dictionary
+
+OIPA decodes status, state and role codes through the AsCode table
+(CodeName, CodeValue, ShortDescription, LongDescription). The queries in
+``OipaQueryBuilder`` return bare codes; ``CodeTables`` is an immutable
+snapshot of the AsCode rows the server needs, so decoding a value is one
+dict lookup instead of a LEFT JOIN per code column.
+
+``FALLBACK_CODES`` holds the standard OIPA descriptions used before the
+first load (or when AsCode cannot be read).
+"""
+
+import time
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, Mapping, NamedTuple, Optional, Tuple
+
+STATUS = "AsCodeStatus"
+STATE = "AsCodeState"
+ROLE = "AsCodeRole"
+
+CODE_NAMES = (STATUS, STATE, ROLE)
+
+
+class CodeEntry(NamedTuple):
+    """One AsCode row"""
+    short: Optional[str]
+    long: Optional[str]
+
+
+FALLBACK_CODES: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    STATUS: MappingProxyType({
+        "01": "Active",
+        "08": "Pending",
+        "99": "Cancelled",
+        "13": "Suspended",
+        "14": "Lapsed"
+    }),
+    ROLE: MappingProxyType({
+        "01": "Primary Insured",
+        "02": "Secondary Insured",
+        "03": "Tertiary Insured",
+        "04": "Payor",
+        "05": "Insured",
+        "06": "Co-Insured",
+        "07": "Joint Insured",
+        "08": "Contingent Owner",
+        "09": "Successor Owner",
+        "10": "Trustee",
+        "11": "Producer",
+        "12": "Agent",
+        "13": "Policy Owner",
+        "14": "Producer Payee",
+        "15": "Broker",
+        "16": "Case Manager",
+        "17": "Servicing Agent",
+        "18": "Billing Contact",
+        "19": "Alternative Payor",
+        "20": "Contingent Payor",
+        "21": "Premium Payor",
+        "22": "Other",
+        "23": "Power of Attorney",
+        "24": "Guardian",
+        "25": "Conservator",
+        "26": "Primary Beneficiary",
+        "27": "Annuitant",
+        "28": "Joint Annuitant",
+        "29": "Contingent Annuitant",
+        "30": "Successor Annuitant",
+        "31": "Beneficiary Payee",
+        "32": "Contingent Beneficiary",
+        "33": "Tertiary Beneficiary",
+        "34": "Beneficiary",
+        "35": "Estate Beneficiary",
+        "36": "Trust Beneficiary",
+        "37": "Corporation",
+        "38": "Partnership",
+        "39": "Charity",
+        "40": "Other Entity"
+    })
+})
+
+
+def fallback_rows() -> Iterator[Tuple[str, str, Optional[str], Optional[str]]]:
+    """``FALLBACK_CODES`` as AsCode rows"""
+    for code_name, values in FALLBACK_CODES.items():
+        for code_value, short in values.items():
+            yield code_name, code_value, short, None
+
+
+class CodeTables:
+    """Immutable snapshot of AsCode rows keyed by (CodeName, CodeValue)"""
+
+    __slots__ = ("_entries", "code_names", "loaded_at")
+
+    def __init__(self, rows: Iterable[Tuple[str, str, Optional[str], Optional[str]]] = (), loaded_at: Optional[float] = None):
+        entries: Dict[Tuple[str, str], CodeEntry] = {}
+        names = set()
+        # Later rows win, so loaded AsCode rows can follow the fallback ones
+        for code_name, code_value, short, long in rows:
+            entries[(code_name, code_value)] = CodeEntry(short, long)
+            names.add(code_name)
+        self._entries = MappingProxyType(entries)
+        self.code_names = frozenset(names)
+        self.loaded_at = loaded_at if loaded_at is not None else time.time()
+
+    @classmethod
+    def fallback(cls) -> "CodeTables":
+        """Snapshot built from ``FALLBACK_CODES``"""
+        return cls(fallback_rows(), loaded_at=0.0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, code_name: str, code_value: Optional[str]) -> Optional[CodeEntry]:
+        return self._entries.get((code_name, code_value))
+
+    def short(self, code_name: str, code_value: Optional[str]) -> Optional[str]:
+        """ShortDescription for a code, or None if unknown"""
+        entry = self._entries.get((code_name, code_value))
+        return entry.short if entry else None
+
+    def long(self, code_name: str, code_value: Optional[str]) -> Optional[str]:
+        """LongDescription for a code, or None if unknown"""
+        entry = self._entries.get((code_name, code_value))
+        return entry.long if entry else None
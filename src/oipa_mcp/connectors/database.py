@@ -9,12 +9,1065 @@ Uses modern python-oracledb library (no Oracle Client required).
 """
 
 import asyncio
+import base64
+import hashlib
+import json
+import math
+import random
+import re
+import time
 import oracledb
-from typing import List, Dict, Any, Optional, Union
-from contextlib import asynccontextmanager
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from functools import lru_cache
+from contextvars import Context, ContextVar
+from typing import List, Dict, Any, NamedTuple, Optional, Tuple, Union, AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
 from loguru import logger
 
 from ..config import Config
+from .rows import column_names, convert_rows, description_columns
+from .frames import (
+    columns_to_arrow, concat_tables, driver_supports_dataframes,
+    oracle_frame_to_arrow, require_arrow
+)
+from .metrics import latency_metrics
+from .codes import CODE_NAMES, CodeTables, fallback_rows
+from .trigram import TrigramIndex
+
+
+# Error codes that mean the session or network path is gone, as opposed to
+# SQL errors raised by a healthy database (ORA-00942, ORA-01722, ...)
+CONNECTION_ERROR_CODES = frozenset({
+    "ORA-03113",  # end-of-file on communication channel
+    "ORA-03114",  # not connected to ORACLE
+    "ORA-03135",  # connection lost contact
+    "ORA-12170",  # TNS connect timeout
+    "ORA-12514",  # listener does not know of service
+    "ORA-12528",  # listener: all instances are blocking
+    "ORA-12537",  # TNS connection closed
+    "ORA-12541",  # no listener
+    "ORA-12547",  # TNS lost contact
+    "ORA-25408",  # cannot safely replay call
+    "DPY-4011",   # database or network closed the connection
+    "DPY-6000",   # listener refused connection
+    "DPY-6005",   # cannot connect to database
+})
+
+
+def is_connection_error(error: Exception) -> bool:
+    """Check whether an oracledb error indicates a lost or unreachable database"""
+    if not isinstance(error, oracledb.Error):
+        return False
+    error_obj = error.args[0] if error.args else None
+    if getattr(error_obj, "full_code", None) in CONNECTION_ERROR_CODES:
+        return True
+    return bool(getattr(error_obj, "is_session_dead", False))
+
+
+# Errors worth retrying on a fresh connection: the session or instance went
+# away, or the database is briefly refusing work (restart, failover)
+RETRYABLE_ERROR_CODES = CONNECTION_ERROR_CODES | frozenset({
+    "ORA-01033",  # initialization or shutdown in progress
+    "ORA-01034",  # ORACLE not available
+    "ORA-01089",  # immediate shutdown in progress
+    "ORA-03150",  # end-of-file on communication channel for database link
+    "ORA-12516",  # listener could not find an available handler
+    "ORA-12520",  # listener could not find a handler for the server type
+    "ORA-12521",  # listener does not know of instance
+    "ORA-12571",  # TNS packet writer failure
+})
+
+
+def error_code(error: Exception) -> Optional[str]:
+    """Get the ``ORA-``/``DPY-`` code of an oracledb error"""
+    error_obj = error.args[0] if error.args else None
+    return getattr(error_obj, "full_code", None)
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """Check whether an oracledb error is transient, so the call may succeed on retry"""
+    if not isinstance(error, oracledb.Error):
+        return False
+    if error_code(error) in RETRYABLE_ERROR_CODES or is_connection_error(error):
+        return True
+    error_obj = error.args[0] if error.args else None
+    return getattr(error_obj, "isrecoverable", False) is True
+
+
+_READ_ONLY_STATEMENT = re.compile(r"^\s*(?:--[^\n]*\n\s*|/\*.*?\*/\s*)*(SELECT|WITH)\b", re.IGNORECASE | re.DOTALL)
+
+
+def is_read_only_statement(query: str) -> bool:
+    """Check whether a statement only reads (SELECT/WITH), so re-running it is safe"""
+    return bool(_READ_ONLY_STATEMENT.match(query))
+
+
+# Error codes raised when a call was interrupted by call_timeout or a break
+TIMEOUT_ERROR_CODES = frozenset({
+    "DPY-4024",   # call timeout exceeded (Thin mode)
+    "ORA-03156",  # OCI call timed out (Thick mode)
+    "ORA-01013",  # user requested cancel of current operation
+})
+
+
+def is_timeout_error(error: Exception) -> bool:
+    """Check whether an oracledb error was caused by a call timeout or cancel"""
+    if not isinstance(error, oracledb.Error):
+        return False
+    error_obj = error.args[0] if error.args else None
+    return getattr(error_obj, "full_code", None) in TIMEOUT_ERROR_CODES
+
+
+class QueryTimeoutError(Exception):
+    """Raised when a database call does not finish before its deadline"""
+    pass
+
+
+@dataclass
+class BulkDmlResult:
+    """
+    Outcome of a bulk ``execute_many`` load
+    
+    Row numbers are positions in the caller's ``parameters_list``. Chunks
+    commit independently, so after a failure ``resume_offset`` is the first
+    row not known to be committed. Concurrent chunks already in flight when
+    a chunk fails may still commit; their ``[start, end)`` row ranges past
+    ``resume_offset`` are listed in ``committed_ranges``. Pass both back
+    (``start_offset=resume_offset, skip_ranges=committed_ranges``) to
+    continue the load without applying any row twice.
+    """
+    rows: int = 0
+    rows_affected: int = 0
+    chunks: int = 0
+    committed_chunks: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    failed_chunks: List[Dict[str, Any]] = field(default_factory=list)
+    row_counts: Optional[List[Optional[int]]] = None
+    resume_offset: int = 0
+    committed_ranges: List[Tuple[int, int]] = field(default_factory=list)
+    
+    @property
+    def complete(self) -> bool:
+        """True when every chunk was committed (rows may still have batch errors)"""
+        return not self.failed_chunks and self.committed_chunks == self.chunks
+
+
+class BulkDmlError(Exception):
+    """Raised when a bulk load chunk fails as a whole; carries the partial result"""
+    
+    def __init__(self, message: str, result: BulkDmlResult):
+        super().__init__(message)
+        self.result = result
+
+
+_query_deadline: ContextVar[Optional[float]] = ContextVar("oipa_query_deadline", default=None)
+
+
+@contextmanager
+def query_deadline(timeout: Optional[float]) -> Iterator[Optional[float]]:
+    """
+    Bound every database call made in this context to ``timeout`` seconds
+    
+    Deadlines are absolute (monotonic clock) and propagate through awaits
+    via a context variable. A nested deadline can only shorten an outer
+    one. ``None`` or a non-positive timeout leaves the current deadline as is.
+    """
+    if not timeout or timeout <= 0:
+        yield _query_deadline.get()
+        return
+    
+    deadline = time.monotonic() + timeout
+    outer = _query_deadline.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+    
+    token = _query_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _query_deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current query deadline, or None without one"""
+    deadline = _query_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+_replica_reads: ContextVar[bool] = ContextVar("oipa_replica_reads", default=False)
+
+
+@contextmanager
+def replica_reads(enabled: bool = True) -> Iterator[None]:
+    """
+    Allow read-only queries made in this context to run on the replica pool
+    
+    Only read paths (``execute_query``, streaming, Arrow and pipeline
+    fetches) honour it; ``execute_many`` always uses the primary.
+    """
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+_truncations: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar("oipa_truncations", default=None)
+
+
+@contextmanager
+def collect_truncations() -> Iterator[List[Dict[str, Any]]]:
+    """Collect notes about results cut short by the row/byte caps in this context"""
+    notes: List[Dict[str, Any]] = []
+    token = _truncations.set(notes)
+    try:
+        yield notes
+    finally:
+        _truncations.reset(token)
+
+
+def truncation_notes() -> List[Dict[str, Any]]:
+    """Truncation notes recorded so far in the current ``collect_truncations()`` context"""
+    return list(_truncations.get() or ())
+
+
+def _spawn_background(coro: Awaitable[Any]) -> "asyncio.Task[Any]":
+    """
+    Start a background loop on the running event loop in an empty context
+    
+    Tasks copy the caller's context, so a loop started by a lazy
+    ``initialize()`` inside a tool call would otherwise inherit that call's
+    deadline, replica routing, truncation collector and tool label.
+    """
+    return Context().run(asyncio.get_running_loop().create_task, coro)
+
+
+def estimate_row_bytes(rows: List[tuple], sample: int = 50) -> int:
+    """Approximate in-memory size of one row, from a sample of ``rows``"""
+    sampled = rows[:sample]
+    if not sampled:
+        return 0
+    total = 0
+    for row in sampled:
+        # Tuple and per-value object overhead, plus the payload of strings/bytes
+        total += 56 + 8 * len(row)
+        for value in row:
+            if isinstance(value, (str, bytes)):
+                total += 49 + len(value)
+            elif value is not None:
+                total += 32
+    return max(1, total // len(sampled))
+
+
+# Apply lag reported by an Active Data Guard standby (needs SELECT on V$DATAGUARD_STATS)
+REPLICA_LAG_QUERY = "SELECT value FROM v$dataguard_stats WHERE name = 'apply lag'"
+
+
+# Placeholder for the key set in fetch_by_keys() query shapes; it is replaced
+# by a row source with one ``key_value`` column
+KEYS_PLACEHOLDER = "{keys}"
+
+# Schema-qualified object names allowed for the key list type and keys table
+_QUALIFIED_NAME = re.compile(r"^[A-Za-z][A-Za-z0-9_$#]*(\.[A-Za-z][A-Za-z0-9_$#]*)?$")
+
+# DRCP purity names accepted in OIPA_DB_DRCP_PURITY
+DRCP_PURITIES = {
+    "self": oracledb.PURITY_SELF,
+    "new": oracledb.PURITY_NEW,
+    "default": oracledb.PURITY_DEFAULT
+}
+
+# Pooled-server reuse for one connection class (needs SELECT on V$CPOOL_CC_STATS)
+DRCP_STATS_QUERY = """
+    SELECT num_requests, num_hits, num_misses, num_waits
+    FROM v$cpool_cc_stats
+    WHERE cclass_name = :cclass_name
+"""
+
+
+def parse_lag_seconds(value: Any) -> Optional[float]:
+    """Convert a V$DATAGUARD_STATS interval ('+00 00:00:05') or timedelta to seconds"""
+    if value is None:
+        return None
+    if hasattr(value, "total_seconds"):
+        return value.total_seconds()
+    match = re.match(r"^\s*\+?(\d+)\s+(\d+):(\d+):(\d+(?:\.\d+)?)\s*$", str(value))
+    if not match:
+        return None
+    days, hours, minutes, seconds = match.groups()
+    return int(days) * 86400 + int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for the OIPA connection pool
+    
+    Tracks connectivity failures from real queries. After
+    ``failure_threshold`` consecutive failures the circuit opens and
+    tool calls fail fast instead of queueing on a dead database. Once
+    ``reset_timeout`` seconds have passed a single trial request is let
+    through (half-open); its outcome closes or re-opens the circuit.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 15.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_started_at: Optional[float] = None
+        self.total_failures = 0
+        self.times_opened = 0
+        self.rejected_requests = 0
+    
+    @property
+    def state(self) -> str:
+        """Current state, promoting OPEN to HALF_OPEN once the reset timeout expires"""
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self._state
+    
+    def allow_request(self) -> bool:
+        """In-memory check used on the hot path before touching the pool"""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        
+        if state == self.HALF_OPEN:
+            now = time.monotonic()
+            # Only one trial request at a time; a stuck trial expires after reset_timeout
+            if self._trial_started_at is None or now - self._trial_started_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+                self._trial_started_at = now
+                return True
+        
+        self.rejected_requests += 1
+        return False
+    
+    def record_success(self) -> None:
+        """Record a round trip that reached the database"""
+        if self._state != self.CLOSED:
+            logger.info("Database circuit breaker closed after successful request")
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._trial_started_at = None
+    
+    def record_failure(self) -> None:
+        """Record a connectivity failure"""
+        self.total_failures += 1
+        self._consecutive_failures += 1
+        
+        if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                self.times_opened += 1
+                logger.warning(
+                    f"Database circuit breaker opened after {self._consecutive_failures} "
+                    f"consecutive failures"
+                )
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._trial_started_at = None
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get breaker state and counters for monitoring"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            "total_failures": self.total_failures,
+            "times_opened": self.times_opened,
+            "rejected_requests": self.rejected_requests
+        }
+
+
+class PoolHealthMonitor:
+    """
+    Background health monitor for the OIPA connection pool
+    
+    Keeps the circuit breaker and a pool snapshot up to date without putting
+    a probe query in front of every tool call. While the circuit is closed
+    and traffic is flowing, real queries are the health signal; the monitor
+    only probes the database when the pool has been idle for a full interval
+    or when the circuit needs a trial request to recover.
+    """
+    
+    def __init__(self, database: "OipaDatabase", interval: float = 30.0):
+        self.database = database
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self.last_check_at: Optional[float] = None
+        self.last_check_ok: Optional[bool] = None
+        self.last_activity_at = time.monotonic()
+        self.checks_run = 0
+        self.pool_snapshot: Dict[str, Any] = {}
+    
+    def start(self) -> None:
+        """Start the monitor task on the running event loop"""
+        if self.interval <= 0 or (self._task and not self._task.done()):
+            return
+        self._task = _spawn_background(self._run())
+        logger.debug(f"Pool health monitor started (interval={self.interval}s)")
+    
+    async def stop(self) -> None:
+        """Stop the monitor task"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def touch(self) -> None:
+        """Note that a real query just completed"""
+        self.last_activity_at = time.monotonic()
+    
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"Pool health check failed: {e}")
+    
+    async def check(self) -> bool:
+        """Run one health check cycle"""
+        breaker = self.database.circuit_breaker
+        idle = time.monotonic() - self.last_activity_at >= self.interval
+        
+        if breaker.state != CircuitBreaker.CLOSED or idle:
+            self.last_check_ok = await self.database.test_connection()
+        
+        if breaker.state == CircuitBreaker.CLOSED:
+            await self.database.refresh_drcp_stats()
+        
+        self.pool_snapshot = self.database._pool_counters()
+        self.last_check_at = time.monotonic()
+        self.checks_run += 1
+        return bool(self.last_check_ok) if self.last_check_ok is not None else True
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get monitor state for monitoring"""
+        now = time.monotonic()
+        return {
+            "running": bool(self._task and not self._task.done()),
+            "interval": self.interval,
+            "checks_run": self.checks_run,
+            "last_check_ok": self.last_check_ok,
+            "seconds_since_check": round(now - self.last_check_at, 1) if self.last_check_at else None,
+            "seconds_since_activity": round(now - self.last_activity_at, 1)
+        }
+
+
+class PoolAutoscaler:
+    """
+    Adaptive pool sizing driven by acquire-wait telemetry
+    
+    Every ``interval`` seconds the autoscaler looks at the acquire waits
+    recorded since the last cycle and the pool's busy ratio. Slow acquires
+    or a mostly busy pool raise the target minimum and growth increment;
+    a quiet pool lowers them again, always within the configured bounds.
+    Pools that support ``reconfigure()`` get the new min/increment directly.
+    The async pool does not, so the target is applied by opening sessions
+    ahead of demand, and surplus sessions expire through the pool's idle
+    timeout.
+    """
+    
+    GROW_BUSY_RATIO = 0.8
+    SHRINK_BUSY_RATIO = 0.3
+    MAX_SAMPLES = 10000
+    
+    def __init__(
+        self,
+        database: "OipaDatabase",
+        interval: float,
+        min_floor: int,
+        min_ceiling: int,
+        max_increment: int,
+        wait_target_ms: float
+    ):
+        self.database = database
+        self.interval = interval
+        self.min_floor = max(0, min_floor)
+        self.min_ceiling = max(self.min_floor, min_ceiling)
+        self.max_increment = max(1, max_increment)
+        self.wait_target = wait_target_ms / 1000
+        self.target_min = self.min_floor
+        self.increment = 1
+        self._task: Optional[asyncio.Task] = None
+        self._waits: List[float] = []
+        self.acquires = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.decisions: List[Dict[str, Any]] = []
+    
+    def start(self) -> None:
+        """Start the autoscaler task on the running event loop"""
+        if self.interval <= 0 or (self._task and not self._task.done()):
+            return
+        self._task = _spawn_background(self._run())
+        logger.debug(f"Pool autoscaler started (interval={self.interval}s)")
+    
+    async def stop(self) -> None:
+        """Stop the autoscaler task"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def record_acquire(self, wait: float) -> None:
+        """Record how long one pool acquire waited, in seconds"""
+        if self.interval > 0 and len(self._waits) < self.MAX_SAMPLES:
+            self._waits.append(wait)
+        self.acquires += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+    
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"Pool autoscaler cycle failed: {e}")
+    
+    async def check(self) -> Optional[str]:
+        """Run one sizing cycle; returns "grow", "shrink" or None"""
+        waits, self._waits = self._waits, []
+        counters = self.database._pool_counters()
+        opened = counters.get("opened") or 0
+        busy_ratio = counters.get("busy", 0) / opened if opened else 0.0
+        
+        waits.sort()
+        p90_wait = waits[int(len(waits) * 0.9)] if waits else 0.0
+        
+        decision = None
+        if (p90_wait > self.wait_target or busy_ratio >= self.GROW_BUSY_RATIO) and (
+            self.target_min < self.min_ceiling or self.increment < self.max_increment
+        ):
+            decision = "grow"
+            self.target_min = min(self.min_ceiling, self.target_min + self.increment)
+            self.increment = min(self.max_increment, self.increment * 2)
+        elif p90_wait <= self.wait_target / 2 and busy_ratio < self.SHRINK_BUSY_RATIO and (
+            self.target_min > self.min_floor or self.increment > 1
+        ):
+            decision = "shrink"
+            self.target_min = max(self.min_floor, self.target_min - 1)
+            self.increment = max(1, self.increment // 2)
+        
+        if decision:
+            logger.info(
+                f"Pool autoscaler: {decision} to min={self.target_min} increment={self.increment} "
+                f"(p90 acquire wait={p90_wait * 1000:.1f}ms over {len(waits)} acquires, "
+                f"busy ratio={busy_ratio:.2f}, opened={opened})"
+            )
+            self.decisions.append({
+                "decision": decision,
+                "target_min": self.target_min,
+                "increment": self.increment,
+                "p90_wait_ms": round(p90_wait * 1000, 1),
+                "busy_ratio": round(busy_ratio, 2),
+                "at": time.time()
+            })
+            del self.decisions[:-20]
+            await self.apply()
+        
+        return decision
+    
+    async def apply(self) -> None:
+        """Push the current target to the pool"""
+        pool = self.database._pool
+        if pool is None:
+            return
+        if hasattr(pool, "reconfigure"):
+            pool.reconfigure(min=self.target_min, increment=self.increment)
+        else:
+            await self.database.warm_up(self.target_min)
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get autoscaler state for monitoring"""
+        return {
+            "running": bool(self._task and not self._task.done()),
+            "target_min": self.target_min,
+            "increment": self.increment,
+            "bounds": {"min_floor": self.min_floor, "min_ceiling": self.min_ceiling, "max_increment": self.max_increment},
+            "acquires": self.acquires,
+            "avg_acquire_wait_ms": round(self.total_wait / self.acquires * 1000, 2) if self.acquires else None,
+            "max_acquire_wait_ms": round(self.max_wait * 1000, 2),
+            "recent_decisions": self.decisions[-5:]
+        }
+
+
+class ReplicaRouter:
+    """
+    Routing of read-only queries to a replica pool
+    
+    Holds the optional second pool (e.g. an Active Data Guard standby).
+    Reads are sent there only while its own circuit breaker is closed and
+    the last measured apply lag is within ``max_lag`` seconds; otherwise
+    they fall back to the primary. A background task refreshes the lag
+    every ``interval`` seconds. ``max_lag`` 0 skips lag checks and only
+    pings the replica.
+    """
+    
+    # Upper bound for the lag query / ping on the replica
+    CHECK_CALL_TIMEOUT_MS = 5000
+    
+    def __init__(
+        self,
+        max_lag: float,
+        interval: float,
+        failure_threshold: int = 3,
+        reset_timeout: float = 15.0
+    ):
+        self.pool: Optional[oracledb.AsyncConnectionPool] = None
+        self.max_lag = max_lag
+        self.interval = interval
+        self.circuit_breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self._task: Optional[asyncio.Task] = None
+        self.lag: Optional[float] = None
+        self.last_check_at: Optional[float] = None
+        self.routed = 0
+        self.fallbacks = {"lagging": 0, "unavailable": 0, "acquire_failed": 0}
+    
+    @property
+    def enabled(self) -> bool:
+        return self.pool is not None
+    
+    def should_route(self) -> bool:
+        """Decide whether a read in the current context goes to the replica"""
+        if self.pool is None or not _replica_reads.get():
+            return False
+        if self.max_lag > 0 and (self.lag is None or self.lag > self.max_lag):
+            self.fallbacks["lagging"] += 1
+            return False
+        if not self.circuit_breaker.allow_request():
+            self.fallbacks["unavailable"] += 1
+            return False
+        self.routed += 1
+        return True
+    
+    def record_acquire_failure(self, error: Exception) -> None:
+        """Note a read that had to move to the primary because the replica refused it or timed out"""
+        self.fallbacks["acquire_failed"] += 1
+        if isinstance(error, asyncio.TimeoutError) or is_connection_error(error):
+            self.circuit_breaker.record_failure()
+        logger.warning(f"Replica connection failed, reading from the primary: {error or type(error).__name__}")
+    
+    def start(self) -> None:
+        """Start the lag monitor task on the running event loop"""
+        if self.pool is None or self.interval <= 0 or (self._task and not self._task.done()):
+            return
+        self._task = _spawn_background(self._run())
+        logger.debug(f"Replica lag monitor started (interval={self.interval}s)")
+    
+    async def stop(self) -> None:
+        """Stop the lag monitor task"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def close(self) -> None:
+        """Stop monitoring and close the replica pool"""
+        await self.stop()
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
+    
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"Replica lag check failed: {e}")
+    
+    async def check(self) -> Optional[float]:
+        """Measure the replica's apply lag (or ping it when lag checks are off)"""
+        if self.pool is None:
+            return None
+        
+        try:
+            connection = await self.pool.acquire()
+            reusable = True
+            try:
+                connection.call_timeout = self.CHECK_CALL_TIMEOUT_MS
+                if self.max_lag > 0:
+                    cursor = connection.cursor()
+                    try:
+                        await cursor.execute(REPLICA_LAG_QUERY)
+                        row = await cursor.fetchone()
+                    finally:
+                        cursor.close()
+                    self.lag = parse_lag_seconds(row[0] if row else None)
+                    if self.lag is None:
+                        logger.warning(
+                            "Replica apply lag is not reported (not a standby?); reads stay on "
+                            "the primary. Set DB_REPLICA_MAX_LAG=0 to skip lag checks"
+                        )
+                else:
+                    await connection.ping()
+            except oracledb.Error as e:
+                # A timed-out or dead session must not serve later replica reads
+                reusable = not (is_connection_error(e) or is_timeout_error(e))
+                raise
+            finally:
+                if reusable:
+                    connection.call_timeout = 0
+                    await self.pool.release(connection)
+                else:
+                    await self.pool.drop(connection)
+            self.circuit_breaker.record_success()
+        except oracledb.Error as e:
+            if is_connection_error(e):
+                self.circuit_breaker.record_failure()
+            else:
+                # e.g. ORA-00942 without SELECT on V$DATAGUARD_STATS
+                self.lag = None
+            logger.warning(f"Replica check failed: {e}")
+        
+        self.last_check_at = time.monotonic()
+        return self.lag
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get replica routing state for monitoring"""
+        if self.pool is None:
+            return {"enabled": False}
+        return {
+            "enabled": True,
+            "opened": self.pool.opened,
+            "busy": self.pool.busy,
+            "max_lag": self.max_lag,
+            "lag_seconds": self.lag,
+            "seconds_since_check": round(time.monotonic() - self.last_check_at, 1) if self.last_check_at else None,
+            "circuit_breaker": self.circuit_breaker.get_status(),
+            "routed": self.routed,
+            "fallbacks": dict(self.fallbacks)
+        }
+
+
+class SessionInitializer:
+    """
+    Per-physical-connection session setup for the OIPA pool
+    
+    Registered as the pool ``session_callback`` so schema, NLS settings and
+    module/action tags are applied once when a session is created, not on
+    every acquire. The resulting state is recorded as a connection tag.
+    python-oracledb Thin mode ignores tags on ``acquire()``, so sessions are
+    also tracked by (session id, serial#) and ``ensure()`` only runs the
+    callback for sessions that have not been initialized yet.
+    """
+    
+    _IDENTIFIER = re.compile(r"^[A-Za-z][A-Za-z0-9_$#]*$")
+    _NLS_PARAMETER = re.compile(r"^NLS_[A-Z_]+$")
+    
+    def __init__(self, db_config: Any):
+        self.schema = db_config.default_schema
+        self.nls_settings = dict(getattr(db_config, "session_nls", {}) or {})
+        self.module = getattr(db_config, "session_module", None)
+        self.action = getattr(db_config, "session_action", None)
+        self.alter_session_sql = self._build_alter_session()
+        self.tag = self._build_tag()
+        self._max_tracked = max(16, db_config.pool_max_size * 4)
+        self._initialized_sessions: Dict[Any, None] = {}
+        self.acquires = 0
+        self.callback_invocations = 0
+        self.failures = 0
+    
+    def _build_alter_session(self) -> Optional[str]:
+        """Build a single ALTER SESSION statement for all configured settings"""
+        settings = []
+        if self.schema:
+            if not self._IDENTIFIER.match(self.schema):
+                raise ValueError(f"Invalid OIPA_DB_DEFAULT_SCHEMA: {self.schema!r}")
+            settings.append(f"CURRENT_SCHEMA = {self.schema}")
+        for name, value in sorted(self.nls_settings.items()):
+            if not self._NLS_PARAMETER.match(name):
+                raise ValueError(f"Invalid NLS session parameter: {name!r}")
+            escaped = value.replace("'", "''")
+            settings.append(f"{name} = '{escaped}'")
+        if not settings:
+            return None
+        return "ALTER SESSION SET " + " ".join(settings)
+    
+    def _build_tag(self) -> str:
+        """Build the connection tag describing the applied session state"""
+        parts = []
+        if self.schema:
+            parts.append(f"SCHEMA={self.schema.upper()}")
+        parts.extend(f"{name}={value}" for name, value in sorted(self.nls_settings.items()))
+        if self.module:
+            parts.append(f"MODULE={self.module}")
+        return ";".join(parts) or "DEFAULT"
+    
+    @staticmethod
+    def _session_key(connection: Any) -> Any:
+        # (SID, serial#) is only unique within one database; the primary and
+        # replica pools can hand out sessions with the same pair
+        return (connection.dsn, connection.session_id, connection.serial_num)
+    
+    async def __call__(self, connection: Any, requested_tag: Optional[str] = None) -> None:
+        """Session callback: apply session state to a fresh physical connection"""
+        self.callback_invocations += 1
+        
+        if self.alter_session_sql:
+            cursor = connection.cursor()
+            try:
+                await cursor.execute(self.alter_session_sql)
+                logger.debug(f"Initialized session state: {self.tag}")
+            except oracledb.Error as e:
+                self.failures += 1
+                logger.warning(f"Failed to initialize session state: {e}")
+                return
+            finally:
+                cursor.close()
+        
+        # Module and action are sent with the next round trip, no extra call needed
+        if self.module:
+            connection.module = self.module
+        if self.action:
+            connection.action = self.action
+        connection.tag = self.tag
+        
+        self._initialized_sessions[self._session_key(connection)] = None
+        if len(self._initialized_sessions) > self._max_tracked:
+            # Drop the oldest entry; sessions that long gone have been replaced
+            del self._initialized_sessions[next(iter(self._initialized_sessions))]
+    
+    async def ensure(self, connection: Any) -> None:
+        """Initialize the session if the pool callback has not done so already"""
+        self.acquires += 1
+        if self._session_key(connection) not in self._initialized_sessions:
+            await self(connection, self.tag)
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get session initialization counters for monitoring"""
+        return {
+            "tag": self.tag,
+            "acquires": self.acquires,
+            "callback_invocations": self.callback_invocations,
+            # Share of acquires that found their session already initialized (no ALTER SESSION
+            # needed); this is client-side pool reuse, DRCP server reuse is reported under "drcp"
+            "initialized_hit_ratio": round(max(0.0, 1 - self.callback_invocations / self.acquires), 3) if self.acquires else None,
+            "failures": self.failures,
+            "initialized_sessions": len(self._initialized_sessions)
+        }
+
+
+@lru_cache(maxsize=512)
+def query_shape(query: str) -> str:
+    """Stable short identifier for a SQL text, used to label per-statement metrics"""
+    normalized = " ".join(query.split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:12]
+
+
+class StatementCacheTracker:
+    """
+    Statement cache hit/miss accounting per query shape
+    
+    python-oracledb keeps an LRU statement cache of ``stmtcachesize`` entries
+    per connection but does not report hits. This tracker mirrors that LRU
+    for each physical session (keyed like ``SessionInitializer``), so a
+    statement counts as a hit when the driver would reuse its cached cursor
+    and as a miss when it has to send a new parse to the server.
+    """
+    
+    def __init__(self, cache_size: int, max_sessions: int = 64, max_shapes: int = 256):
+        self.cache_size = cache_size
+        self._max_sessions = max_sessions
+        self._max_shapes = max_shapes
+        self._sessions: "OrderedDict[Any, OrderedDict[str, None]]" = OrderedDict()
+        self._shapes: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def record(self, connection: Any, query: str) -> bool:
+        """Record one execution of ``query`` on ``connection``; returns True on a cache hit"""
+        key = SessionInitializer._session_key(connection)
+        cache = self._sessions.get(key)
+        if cache is None:
+            cache = self._sessions[key] = OrderedDict()
+            if len(self._sessions) > self._max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(key)
+        
+        hit = query in cache
+        if hit:
+            cache.move_to_end(query)
+            self.hits += 1
+        else:
+            self.misses += 1
+            if self.cache_size > 0:
+                cache[query] = None
+                if len(cache) > self.cache_size:
+                    cache.popitem(last=False)
+        
+        shape = query_shape(query)
+        stats = self._shapes.get(shape)
+        if stats is None:
+            if len(self._shapes) >= self._max_shapes:
+                return hit
+            stats = self._shapes[shape] = {"sql": " ".join(query.split())[:80], "hits": 0, "misses": 0}
+        stats["hits" if hit else "misses"] += 1
+        return hit
+    
+    @staticmethod
+    def _hit_rate(hits: int, misses: int) -> Optional[float]:
+        total = hits + misses
+        return round(hits / total, 3) if total else None
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get statement cache counters for monitoring"""
+        return {
+            "size": self.cache_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self._hit_rate(self.hits, self.misses),
+            "shapes": {
+                shape: dict(stats, hit_rate=self._hit_rate(stats["hits"], stats["misses"]))
+                for shape, stats in self._shapes.items()
+            }
+        }
+
+
+class FetchPlan(NamedTuple):
+    """Cursor fetch settings for one execution"""
+    prefetch_rows: int
+    array_size: int
+    reason: str
+
+
+class FetchPlanner:
+    """
+    Per-query-shape choice of ``prefetchrows`` and ``arraysize``
+    
+    Rows prefetched with the execute call arrive in the same round trip, and
+    prefetching one row more than will be returned lets the driver see the
+    end of the result without an extra fetch call. Plans therefore follow
+    what a statement is expected to return:
+    
+    - single-row lookups: prefetch 2, arraysize 1
+    - top-N queries (``FETCH FIRST n ROWS ONLY``): prefetch N+1, arraysize N
+    - shapes seen before: prefetch sized to the largest recent result, so
+      repeat small lookups finish in one round trip; arraysize stays at the
+      default so a result larger than usual still comes in large batches
+    - everything else (scans): large batches, first batch with the execute
+    
+    Round trips per execution are derived from the plan and the number of
+    rows fetched (the driver does not count them), and reported per shape.
+    """
+    
+    _TOP_N = re.compile(r"FETCH\s+FIRST\s+(?::(\w+)|(\d+))\s+ROWS?\s+ONLY", re.IGNORECASE)
+    HISTORY = 20
+    
+    def __init__(self, default_array_size: int = 1000, max_array_size: int = 10000, max_shapes: int = 256):
+        self.default_array_size = max(1, default_array_size)
+        self.max_array_size = max(self.default_array_size, max_array_size)
+        self._max_shapes = max_shapes
+        self._shapes: Dict[str, Dict[str, Any]] = {}
+    
+    def plan(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        expected_rows: Optional[int] = None
+    ) -> FetchPlan:
+        """Pick fetch settings for ``query``; ``expected_rows`` is the caller's row count hint"""
+        if expected_rows == 1:
+            return FetchPlan(2, 1, "single_row")
+        
+        top_n = self._top_n(query, parameters)
+        if expected_rows:
+            top_n = min(top_n, expected_rows) if top_n else expected_rows
+        if top_n:
+            size = min(top_n, self.max_array_size)
+            return FetchPlan(size + 1, size, "top_n")
+        
+        stats = self._shapes.get(query_shape(query))
+        if stats and stats["recent_rows"]:
+            largest = max(stats["recent_rows"])
+            if largest < self.default_array_size:
+                return FetchPlan(max(1, largest) + 1, self.default_array_size, "history")
+        
+        return self.scan_plan()
+    
+    def scan_plan(self, batch_size: Optional[int] = None) -> FetchPlan:
+        """Large-batch plan for full scans and streams (an explicit batch size is used as is)"""
+        size = batch_size or self.default_array_size
+        return FetchPlan(size, size, "scan")
+    
+    def _top_n(self, query: str, parameters: Optional[Dict[str, Any]]) -> Optional[int]:
+        match = self._TOP_N.search(query)
+        if not match:
+            return None
+        bind_name, literal = match.groups()
+        value = literal if literal else (parameters or {}).get(bind_name)
+        try:
+            return max(1, int(value))
+        except (TypeError, ValueError):
+            return None
+    
+    @staticmethod
+    def round_trips(plan: FetchPlan, rows: int) -> int:
+        """Round trips needed to fetch ``rows`` rows (including end of fetch) under ``plan``"""
+        if rows < plan.prefetch_rows:
+            return 1
+        # Remaining rows plus the end-of-fetch check, in arraysize batches
+        return 1 + math.ceil((rows - plan.prefetch_rows + 1) / plan.array_size)
+    
+    def record(self, query: str, plan: FetchPlan, rows: int) -> int:
+        """Record an execution's row count; returns its round trips"""
+        trips = self.round_trips(plan, rows)
+        shape = query_shape(query)
+        stats = self._shapes.get(shape)
+        if stats is None:
+            if len(self._shapes) >= self._max_shapes:
+                return trips
+            stats = self._shapes[shape] = {
+                "sql": " ".join(query.split())[:80],
+                "executions": 0,
+                "rows": 0,
+                "round_trips": 0,
+                "recent_rows": deque(maxlen=self.HISTORY),
+                "plan": None
+            }
+        stats["executions"] += 1
+        stats["rows"] += rows
+        stats["round_trips"] += trips
+        stats["recent_rows"].append(rows)
+        stats["plan"] = plan
+        return trips
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get per-shape fetch plans and round trips for monitoring"""
+        return {
+            "default_array_size": self.default_array_size,
+            "shapes": {
+                shape: {
+                    "sql": stats["sql"],
+                    "executions": stats["executions"],
+                    "avg_rows": round(stats["rows"] / stats["executions"], 1),
+                    "avg_round_trips": round(stats["round_trips"] / stats["executions"], 2),
+                    "plan": stats["plan"]._asdict() if stats["plan"] else None
+                }
+                for shape, stats in self._shapes.items()
+            }
+        }
 
 
 class OipaDatabase:
@@ -28,10 +1081,57 @@ class OipaDatabase:
     require Oracle Client installation and provides better async support.
     """
     
+    # Upper bound for the rollback/ping that cleans up a timed-out session
+    RESET_CALL_TIMEOUT_MS = 5000
+    
+    # Element limit of SYS.ODCIVARCHAR2LIST; larger key lists are split
+    MAX_KEY_COLLECTION = 32767
+    
     def __init__(self, config: Config):
         self.config = config
         self._pool: Optional[oracledb.AsyncConnectionPool] = None
         self._initialized = False
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=config.database.circuit_failure_threshold,
+            reset_timeout=config.database.circuit_reset_timeout
+        )
+        self.health_monitor = PoolHealthMonitor(self, interval=config.database.health_check_interval)
+        self.autoscaler = PoolAutoscaler(
+            self,
+            interval=config.database.autoscale_interval,
+            min_floor=config.database.pool_min_size,
+            min_ceiling=config.database.autoscale_min_ceiling or config.database.pool_max_size // 2,
+            max_increment=config.database.autoscale_max_increment,
+            wait_target_ms=config.database.autoscale_wait_target_ms
+        )
+        self.replica = ReplicaRouter(
+            max_lag=config.database.replica_max_lag,
+            interval=config.database.replica_check_interval,
+            failure_threshold=config.database.circuit_failure_threshold,
+            reset_timeout=config.database.circuit_reset_timeout
+        )
+        self.session_initializer = SessionInitializer(config.database)
+        self.statement_cache = StatementCacheTracker(
+            config.database.stmt_cache_size,
+            max_sessions=max(16, config.database.pool_max_size * 4)
+        )
+        self.fetch_planner = FetchPlanner(
+            default_array_size=config.performance.fetch_array_size,
+            max_array_size=max(config.performance.fetch_array_size, config.performance.max_query_results)
+        )
+        self.dataframe_fetches = {"native": 0, "fallback": 0}
+        # Components started once the pool is up and stopped before it closes
+        # (see register_component)
+        self._startup_hooks: List[Callable[[], Any]] = []
+        self._shutdown_hooks: List[Callable[[], Any]] = []
+        self.pipeline_executions = {"pipelined": 0, "sequential": 0}
+        self.timeouts = 0
+        self.latency = latency_metrics
+        self.drcp_stats: Optional[Dict[str, Any]] = None
+        self._key_list_types: "OrderedDict[Any, Any]" = OrderedDict()
+        self.key_lookups = {"collection": 0, "temp_table": 0}
+        self.retries: Dict[str, Any] = {"attempted": 0, "succeeded": 0, "exhausted": 0, "by_code": {}}
+        self.truncations = {"row_limit": 0, "byte_limit": 0}
     
     async def initialize(self) -> None:
         """Initialize the async database connection pool"""
@@ -48,10 +1148,47 @@ class OipaDatabase:
             self._initialized = True
             logger.info(f"Async database pool initialized: {self.config.database.dsn}")
             logger.info(f"Pool configuration: min={self.config.database.pool_min_size}, max={self.config.database.pool_max_size}")
+            if self.config.database.drcp_enabled:
+                logger.info(
+                    f"Using DRCP pooled servers: class={self.config.database.drcp_connection_class}, "
+                    f"purity={self.config.database.drcp_purity}"
+                )
+            
+            # Open sessions up front so the first burst of tool calls does not
+            # queue on serial connection creation
+            await self.warm_up()
+            self.health_monitor.start()
+            self.autoscaler.start()
+            
+            if self.config.database.replica_dsn:
+                await self._initialize_replica()
             
         except oracledb.Error as e:
             logger.error(f"Failed to initialize database pool: {e}")
             raise
+        
+        await self._run_hooks(self._startup_hooks, "startup")
+    
+    def register_component(self, start: Callable[[], Any], stop: Optional[Callable[[], Any]] = None) -> None:
+        """
+        Register a component to start after ``initialize()`` and stop in ``close()``
+        
+        ``start`` and ``stop`` may be plain or async callables. Components
+        start in registration order and stop in reverse order; a failing hook
+        is logged and does not stop the others.
+        """
+        self._startup_hooks.append(start)
+        if stop is not None:
+            self._shutdown_hooks.insert(0, stop)
+    
+    async def _run_hooks(self, hooks: List[Callable[[], Any]], phase: str) -> None:
+        for hook in hooks:
+            try:
+                result = hook()
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.warning(f"{phase} hook {getattr(hook, '__qualname__', hook)} failed: {e}")
     
     async def _initialize_cloud_wallet(self) -> None:
         """Initialize connection using Oracle Cloud Wallet"""
@@ -81,8 +1218,14 @@ class OipaDatabase:
             'ping_interval': 60,  # Test connections every 60 seconds
             'timeout': 30,        # Connection timeout
             'retry_count': 3,     # Retry on connection failures
-            'retry_delay': 1      # Delay between retries
+            'retry_delay': 1,     # Delay between retries
+            'getmode': oracledb.POOL_GETMODE_TIMEDWAIT,
+            'wait_timeout': self.config.database.pool_timeout * 1000,  # Max acquire wait (ms)
+            'stmtcachesize': self.config.database.stmt_cache_size,
+            # Apply schema/NLS/module once per physical connection
+            'session_callback': self.session_initializer
         }
+        pool_params.update(self._drcp_params())
         
         # Configure wallet usage
         if self.config.database.wallet_password:
@@ -137,11 +1280,154 @@ class OipaDatabase:
             ping_interval=60,  # Test connections every 60 seconds
             timeout=30,        # Connection timeout
             retry_count=3,     # Retry on connection failures
-            retry_delay=1      # Delay between retries
+            retry_delay=1,     # Delay between retries
+            getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+            wait_timeout=self.config.database.pool_timeout * 1000,  # Max acquire wait (ms)
+            stmtcachesize=self.config.database.stmt_cache_size,
+            # Apply schema/NLS/module once per physical connection
+            session_callback=self.session_initializer,
+            # Connection class and purity when DRCP is enabled
+            **self._drcp_params()
         )
     
-    async def close(self) -> None:
-        """Close the database connection pool"""
+    def _drcp_params(self) -> Dict[str, Any]:
+        """
+        Pool parameters for Database Resident Connection Pooling
+        
+        Sessions in the same connection class can be handed to any oipa-mcp
+        process, so many stdio server processes share a small set of pooled
+        servers. Easy Connect DSNs select a pooled server with the ``:pooled``
+        suffix (see ``DatabaseConfig.dsn``); wallet aliases use ``server_type``.
+        """
+        db_config = self.config.database
+        if not db_config.drcp_enabled:
+            return {}
+        if db_config.drcp_purity not in DRCP_PURITIES:
+            raise ValueError(
+                f"Invalid OIPA_DB_DRCP_PURITY: {db_config.drcp_purity!r} "
+                f"(expected one of {', '.join(DRCP_PURITIES)})"
+            )
+        params = {
+            'cclass': db_config.drcp_connection_class,
+            'purity': DRCP_PURITIES[db_config.drcp_purity]
+        }
+        if db_config.is_cloud_wallet:
+            params['server_type'] = "pooled"
+        return params
+    
+    async def _initialize_replica(self) -> None:
+        """Create the read-only replica pool used by query tools"""
+        db_config = self.config.database
+        logger.info(f"Initializing read-only replica pool: {db_config.replica_dsn}")
+        
+        pool_params = {
+            'user': db_config.replica_username or db_config.username,
+            'password': db_config.replica_password or db_config.password,
+            'dsn': db_config.replica_dsn,
+            'min': db_config.pool_min_size,
+            'max': db_config.replica_pool_max_size or db_config.pool_max_size,
+            'increment': 1,
+            'ping_interval': 60,
+            'timeout': 30,
+            'retry_count': 3,
+            'retry_delay': 1,
+            'getmode': oracledb.POOL_GETMODE_TIMEDWAIT,
+            'wait_timeout': db_config.pool_timeout * 1000,
+            'stmtcachesize': db_config.stmt_cache_size,
+            'session_callback': self.session_initializer
+        }
+        if db_config.is_cloud_wallet:
+            pool_params['config_dir'] = db_config.wallet_location
+            pool_params['wallet_location'] = db_config.wallet_location
+            if db_config.wallet_password:
+                pool_params['wallet_password'] = db_config.wallet_password
+        
+        try:
+            self.replica.pool = oracledb.create_pool_async(**pool_params)
+        except oracledb.Error as e:
+            # The replica is optional; everything keeps running on the primary
+            logger.warning(f"Read-only replica pool could not be created: {e}")
+            return
+        
+        lag = await self.replica.check()
+        logger.info(f"Read-only replica pool initialized (apply lag: {lag}s, max: {self.replica.max_lag}s)")
+        self.replica.start()
+    
+    async def detect_search_indexes(self) -> Optional[List[str]]:
+        """
+        Check AsPolicy/AsClient for the ``UPPER(col)`` indexes prefix searches use
+        
+        The result decides the default free-text match mode (see
+        ``SearchClassifier``). Failures are logged and leave it at "contains".
+        
+        Returns:
+            DDL for the missing indexes, or None if the check failed
+        """
+        try:
+            rows = await self.execute_query(
+                SEARCH_INDEX_QUERY, {"owner": self.config.database.default_schema}, row_format="tuple"
+            )
+        except Exception as e:
+            logger.warning(f"Could not check search indexes: {e}")
+            return None
+        
+        missing = missing_search_indexes(rows)
+        search_classifier.missing_indexes = missing
+        if missing:
+            logger.info(f"{len(missing)} UPPER(col) search indexes missing; free-text searches default to contains")
+        else:
+            logger.info("UPPER(col) search indexes present; free-text searches default to prefix")
+        return missing
+    
+    async def warm_up(self, size: Optional[int] = None) -> int:
+        """
+        Open pooled sessions concurrently until ``size`` are open
+        
+        Connections are acquired in parallel (which also runs the session
+        callback on each) and released straight back to the pool. Failures
+        are logged and do not fail initialization.
+        
+        Args:
+            size: Sessions to have open (defaults to DB_POOL_WARMUP_SIZE)
+            
+        Returns:
+            Number of sessions opened
+        """
+        if not self._pool:
+            return 0
+        size = min(self.config.database.pool_warmup_size if size is None else size,
+                   self.config.database.pool_max_size)
+        needed = size - (self._pool.opened or 0)
+        if needed <= 0:
+            return 0
+        
+        start_time = time.monotonic()
+        results = await asyncio.gather(
+            *(self._pool.acquire(tag=self.session_initializer.tag) for _ in range(needed)),
+            return_exceptions=True
+        )
+        
+        opened = 0
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.warning(f"Pool warm-up could not open a session: {result}")
+                continue
+            try:
+                await self.session_initializer.ensure(result)
+                opened += 1
+            finally:
+                await self._pool.release(result)
+        
+        logger.info(f"Pool warm-up opened {opened}/{needed} sessions in {(time.monotonic() - start_time) * 1000:.0f}ms")
+        return opened
+    
+    async def close(self) -> None:
+        """Close the database connection pool"""
+        await self.health_monitor.stop()
+        await self.autoscaler.stop()
+        await self.replica.close()
+        await self._run_hooks(self._shutdown_hooks, "shutdown")
+        self.dump_latency()
         if self._pool:
             await self._pool.close()
             self._pool = None
@@ -149,79 +1435,201 @@ class OipaDatabase:
             logger.info("Database pool closed")
     
     @asynccontextmanager
-    async def get_connection(self):
-        """Get an async database connection from the pool"""
+    async def get_connection(self, read_only: bool = False):
+        """
+        Get an async database connection from the pool
+        
+        With ``read_only`` and inside ``replica_reads()`` the connection comes
+        from the replica pool when the replica is healthy and within its lag
+        tolerance; otherwise, or if the replica refuses the connection, it
+        comes from the primary.
+        
+        When a query deadline is active (see ``query_deadline``) the acquire
+        wait counts against it and the remaining time is set as the
+        connection's ``call_timeout``, so the driver breaks the running call
+        on the server once the deadline passes. Timed-out connections are
+        rolled back and pinged before going back to the pool, or dropped if
+        they cannot be cleaned up.
+        """
         if not self._initialized:
             await self.initialize()
-            
+        
+        remaining = remaining_time()
+        if remaining is not None and remaining <= 0:
+            self.timeouts += 1
+            raise QueryTimeoutError("Query deadline expired before a connection was acquired")
+        
+        on_replica = read_only and self.replica.should_route()
+        pool = self.replica.pool if on_replica else self._pool
         connection = None
+        reusable = True
         try:
-            # Get async connection from pool
-            connection = await self._pool.acquire()
+            acquire_started = time.monotonic()
+            try:
+                # Leave the primary half the deadline in case the replica cannot serve the read
+                connection = await self._acquire(pool, remaining / 2 if on_replica and remaining else remaining)
+            except (oracledb.Error, asyncio.TimeoutError) as e:
+                if not on_replica:
+                    raise
+                self.replica.record_acquire_failure(e)
+                on_replica, pool = False, self._pool
+                connection = await self._acquire(pool, remaining_time())
+            acquire_wait = time.monotonic() - acquire_started
+            if not on_replica:
+                self.autoscaler.record_acquire(acquire_wait)
+            self.latency.record("acquire", acquire_wait)
             
-            # Set default schema if configured
-            if self.config.database.default_schema:
-                cursor = connection.cursor()
-                try:
-                    alter_session_sql = f"ALTER SESSION SET CURRENT_SCHEMA = {self.config.database.default_schema}"
-                    await cursor.execute(alter_session_sql)
-                    logger.debug(f"Set default schema to: {self.config.database.default_schema}")
-                except oracledb.Error as e:
-                    logger.warning(f"Failed to set default schema: {e}")
-                finally:
-                    cursor.close()
+            # No-op unless this physical session has never been initialized
+            await self.session_initializer.ensure(connection)
+            
+            remaining = remaining_time()
+            if remaining is not None:
+                connection.call_timeout = max(1, int(remaining * 1000))
             
             yield connection
+            self._record_outcome(on_replica=on_replica)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise QueryTimeoutError("Query deadline expired while waiting for a pooled connection")
+        except asyncio.CancelledError:
+            # The caller gave up; stop the statement on the server as well
+            if connection:
+                self.timeouts += 1
+                reusable = await self._cancel_call(connection)
+            raise
         except oracledb.Error as e:
+            self._record_outcome(e, on_replica)
+            if connection and is_connection_error(e):
+                # Never hand a dead session back to the pool
+                reusable = False
+            if is_timeout_error(e):
+                self.timeouts += 1
+                logger.warning(f"Database call exceeded its deadline: {e}")
+                if connection:
+                    reusable = await self._reset_after_timeout(connection)
+                raise QueryTimeoutError(f"Query exceeded its deadline: {e}") from e
             logger.error(f"Database connection error: {e}")
             raise
         finally:
             if connection:
-                await self._pool.release(connection)
+                if reusable:
+                    connection.call_timeout = 0
+                    await pool.release(connection)
+                else:
+                    await pool.drop(connection)
+    
+    def _renew_call_timeout(self, connection: Any) -> None:
+        """Bound the next round trip on ``connection`` by the time left before the deadline"""
+        remaining = remaining_time()
+        if remaining is None:
+            return
+        if remaining <= 0:
+            self.timeouts += 1
+            raise QueryTimeoutError("Query deadline expired between fetches")
+        connection.call_timeout = max(1, int(remaining * 1000))
+    
+    async def _acquire(self, pool: Any, remaining: Optional[float]) -> Any:
+        """Acquire from ``pool``, preferring sessions already set up, within the deadline"""
+        acquire = pool.acquire(tag=self.session_initializer.tag)
+        if remaining is None:
+            return await acquire
+        return await asyncio.wait_for(acquire, timeout=remaining)
+    
+    async def _cancel_call(self, connection: Any) -> bool:
+        """Send a break for the running call and clean the session up"""
+        try:
+            connection.cancel()
+        except Exception as e:
+            logger.warning(f"Failed to cancel database call: {e}")
+            return False
+        return await self._reset_after_timeout(connection)
+    
+    async def _reset_after_timeout(self, connection: Any) -> bool:
+        """Bring an interrupted session back to a clean state; False if it must be dropped"""
+        try:
+            connection.call_timeout = self.RESET_CALL_TIMEOUT_MS
+            await connection.rollback()
+            await connection.ping()
+            return True
+        except Exception as e:
+            logger.warning(f"Dropping connection that could not be reset after a timeout: {e}")
+            return False
     
     async def execute_query(
         self, 
         query: str, 
         parameters: Optional[Dict[str, Any]] = None,
-        fetch_size: Optional[int] = None
-    ) -> List[Dict[str, Any]]:
+        fetch_size: Optional[int] = None,
+        row_format: str = "dict",
+        retry: Optional[bool] = None,
+        max_rows: Optional[int] = None
+    ) -> Any:
         """
         Execute a SELECT query and return results as list of dictionaries
         
         Args:
             query: SQL query string
             parameters: Query parameters (named parameters recommended)
-            fetch_size: Maximum number of rows to fetch
+            fetch_size: Expected number of rows; 1 plans a single-row fetch
+                (see ``FetchPlanner``)
+            row_format: Result shape - "dict" (default), "tuple", "record"
+                or "columns" (see connectors.rows)
+            retry: Retry transient errors on a fresh connection; by default
+                only read-only (SELECT/WITH) statements are retried
+            max_rows: Row cap for this call (defaults to MAX_QUERY_RESULTS).
+                Fetching also stops once the result exceeds MAX_RESULT_BYTES;
+                cut-short results are reported through ``collect_truncations()``
             
         Returns:
-            List of dictionaries representing query results
+            List of rows in the requested format, or a dict of column
+            lists for "columns"
         """
-        async with self.get_connection() as conn:
+        if retry is None:
+            retry = is_read_only_statement(query)
+        return await self._with_retry(
+            lambda: self._execute_query_once(query, parameters, fetch_size, row_format, max_rows),
+            retry
+        )
+    
+    async def _execute_query_once(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]],
+        fetch_size: Optional[int],
+        row_format: str,
+        max_rows: Optional[int] = None
+    ) -> Any:
+        """Run ``execute_query`` once, without retries"""
+        shape = query_shape(query)
+        
+        async with self.get_connection(read_only=True) as conn:
+            self.statement_cache.record(conn, query)
             cursor = conn.cursor()
             
             try:
-                # Set fetch size for better performance
-                if fetch_size:
-                    cursor.arraysize = min(fetch_size, self.config.performance.max_query_results)
-                else:
-                    cursor.arraysize = 1000  # Default batch size
+                # Size prefetch and batches to what this query is expected to return
+                plan = self.fetch_planner.plan(query, parameters, fetch_size)
+                cursor.prefetchrows = plan.prefetch_rows
+                cursor.arraysize = plan.array_size
                 
                 # Execute query with parameters
-                if parameters:
-                    await cursor.execute(query, parameters)
-                else:
-                    await cursor.execute(query)
+                with self.latency.time("execute", shape):
+                    if parameters:
+                        await cursor.execute(query, parameters)
+                    else:
+                        await cursor.execute(query)
                 
-                # Fetch results
-                columns = [col[0].lower() for col in cursor.description]
-                rows = await cursor.fetchall()
+                # Fetch results, stopping at the row/byte caps
+                columns = description_columns(cursor.description)
+                with self.latency.time("fetch", shape):
+                    rows, rows_scanned = await self._fetch_capped(cursor, query, max_rows)
                 
-                # Convert to list of dictionaries
-                results = []
-                for row in rows:
-                    results.append(dict(zip(columns, row)))
+                # Convert to the requested row shape
+                with self.latency.time("convert", shape):
+                    results = convert_rows(columns, rows, row_format)
                 
-                logger.debug(f"Query executed successfully, returned {len(results)} rows")
+                trips = self.fetch_planner.record(query, plan, rows_scanned)
+                logger.debug(f"Query executed successfully, returned {len(rows)} rows in {trips} round trips")
                 return results
                 
             except oracledb.Error as e:
@@ -232,6 +1640,521 @@ class OipaDatabase:
             finally:
                 cursor.close()
     
+    async def stream_batches(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        batch_size: Optional[int] = None,
+        row_format: str = "dict"
+    ) -> AsyncIterator[Any]:
+        """
+        Execute a SELECT query and yield results in batches as they arrive
+        
+        Rows are pulled with ``fetchmany`` so only one batch is held in
+        memory at a time. The cursor is closed and the connection returned
+        to the pool when the stream is exhausted or closed early; callers
+        that stop iterating before the end should ``await stream.aclose()``.
+        
+        Args:
+            query: SQL query string
+            parameters: Query parameters (named parameters recommended)
+            batch_size: Rows per batch (defaults to STREAM_BATCH_SIZE)
+            row_format: Batch shape - "dict" (default), "tuple", "record"
+                or "columns"
+            
+        Yields:
+            Batches of at most ``batch_size`` rows in the requested format
+        """
+        batch_size = batch_size or self.config.performance.stream_batch_size
+        shape = query_shape(query)
+        
+        async with self.get_connection(read_only=True) as conn:
+            self.statement_cache.record(conn, query)
+            cursor = conn.cursor()
+            
+            try:
+                plan = self.fetch_planner.scan_plan(batch_size)
+                cursor.prefetchrows = plan.prefetch_rows
+                cursor.arraysize = plan.array_size
+                
+                with self.latency.time("execute", shape):
+                    if parameters:
+                        await cursor.execute(query, parameters)
+                    else:
+                        await cursor.execute(query)
+                
+                columns = description_columns(cursor.description)
+                total_rows = 0
+                
+                while True:
+                    self._renew_call_timeout(conn)
+                    with self.latency.time("fetch", shape):
+                        rows = await cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    total_rows += len(rows)
+                    with self.latency.time("convert", shape):
+                        batch = convert_rows(columns, rows, row_format)
+                    yield batch
+                
+                logger.debug(f"Streamed query completed, returned {total_rows} rows")
+                
+            except oracledb.Error as e:
+                logger.error(f"Streaming query error: {e}")
+                logger.error(f"Query: {query}")
+                logger.error(f"Parameters: {parameters}")
+                raise
+            finally:
+                cursor.close()
+    
+    async def stream_query(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        batch_size: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute a SELECT query and yield rows one at a time
+        
+        Thin wrapper over ``stream_batches()``; memory use is bounded by
+        the batch size, not the result size.
+        """
+        batches = self.stream_batches(query, parameters, batch_size)
+        try:
+            async for batch in batches:
+                for row in batch:
+                    yield row
+        finally:
+            await batches.aclose()
+    
+    async def stream_arrow(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        batch_size: Optional[int] = None
+    ) -> AsyncIterator[Any]:
+        """
+        Execute a SELECT query and yield results as ``pyarrow.Table`` batches
+        
+        Uses python-oracledb's native DataFrame fetch when the driver supports
+        it, so rows are never materialized as Python objects. Older drivers
+        fall back to ``fetchmany`` batches converted column-wise. Column names
+        are lower-cased, as in the dict row path.
+        
+        Args:
+            query: SQL query string
+            parameters: Query parameters (named parameters recommended)
+            batch_size: Rows per batch (defaults to ARROW_BATCH_SIZE)
+        
+        Yields:
+            ``pyarrow.Table`` batches of at most ``batch_size`` rows
+        """
+        require_arrow()
+        batch_size = batch_size or self.config.performance.arrow_batch_size
+        shape = query_shape(query)
+        
+        async with self.get_connection(read_only=True) as conn:
+            self.statement_cache.record(conn, query)
+            if driver_supports_dataframes(conn):
+                self.dataframe_fetches["native"] += 1
+                try:
+                    async for frame in conn.fetch_df_batches(query, parameters or {}, size=batch_size):
+                        with self.latency.time("convert", shape):
+                            table = oracle_frame_to_arrow(frame)
+                        yield table
+                except oracledb.Error as e:
+                    logger.error(f"Arrow query error: {e}")
+                    logger.error(f"Query: {query}")
+                    logger.error(f"Parameters: {parameters}")
+                    raise
+                return
+            
+            self.dataframe_fetches["fallback"] += 1
+            cursor = conn.cursor()
+            
+            try:
+                plan = self.fetch_planner.scan_plan(batch_size)
+                cursor.prefetchrows = plan.prefetch_rows
+                cursor.arraysize = plan.array_size
+                
+                with self.latency.time("execute", shape):
+                    if parameters:
+                        await cursor.execute(query, parameters)
+                    else:
+                        await cursor.execute(query)
+                
+                columns = description_columns(cursor.description)
+                
+                while True:
+                    self._renew_call_timeout(conn)
+                    with self.latency.time("fetch", shape):
+                        rows = await cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    with self.latency.time("convert", shape):
+                        table = columns_to_arrow(columns, convert_rows(columns, rows, "columns"))
+                    yield table
+            
+            except oracledb.Error as e:
+                logger.error(f"Arrow query error: {e}")
+                logger.error(f"Query: {query}")
+                logger.error(f"Parameters: {parameters}")
+                raise
+            finally:
+                cursor.close()
+    
+    async def fetch_arrow(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        batch_size: Optional[int] = None
+    ) -> Any:
+        """
+        Execute a SELECT query and return the whole result as a ``pyarrow.Table``
+        
+        Suited to analytics queries that aggregate with ``pyarrow.compute``;
+        use ``stream_arrow()`` when the result should not be held at once.
+        The same row cap and byte budget as ``execute_query()`` apply;
+        batches are no larger than the row cap plus one, and fetching stops
+        once a batch crosses either limit.
+        """
+        row_cap = self.config.performance.max_query_results
+        byte_budget = self.config.performance.max_result_bytes
+        batch_size = min(batch_size or self.config.performance.arrow_batch_size, row_cap + 1)
+        tables = []
+        rows = nbytes = 0
+        reason = None
+        batches = self.stream_arrow(query, parameters, batch_size)
+        try:
+            async for table in batches:
+                tables.append(table)
+                rows += table.num_rows
+                nbytes += table.nbytes
+                if rows > row_cap:
+                    reason = "row_limit"
+                    break
+                if byte_budget and nbytes > byte_budget:
+                    reason = "byte_limit"
+                    break
+        finally:
+            await batches.aclose()
+        
+        result = concat_tables(tables)
+        if reason == "row_limit":
+            result = result.slice(0, row_cap)
+        elif reason == "byte_limit":
+            result = result.slice(0, max(1, byte_budget * rows // nbytes))
+        if reason:
+            self._note_truncation(query, result.num_rows, rows, reason)
+        logger.debug(f"Arrow query executed successfully, returned {result.num_rows} rows")
+        return result
+    
+    async def fetch_dataframe(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        batch_size: Optional[int] = None
+    ) -> Any:
+        """
+        Execute a SELECT query and return a pandas DataFrame
+        
+        Built on ``fetch_arrow()``; requires pandas in addition to pyarrow.
+        """
+        table = await self.fetch_arrow(query, parameters, batch_size)
+        return table.to_pandas()
+    
+    @staticmethod
+    def _supports_pipelining(connection: Any) -> bool:
+        """Check whether the driver can run statement pipelines on this connection"""
+        result_type = getattr(oracledb, "PipelineOpResult", None)
+        return (
+            hasattr(oracledb, "create_pipeline")
+            and hasattr(result_type, "columns")
+            and hasattr(connection, "run_pipeline")
+        )
+    
+    async def execute_pipeline(
+        self,
+        statements: List[tuple]
+    ) -> List[Any]:
+        """
+        Execute several independent SELECT queries in one network round trip
+        
+        Uses python-oracledb pipelining on a single pooled connection. With
+        Oracle Database 23ai the statements travel in one round trip; older
+        databases run them one after another on the same connection. Drivers
+        without pipelining support fall back to executing the statements
+        sequentially.
+        
+        Transient errors are retried when every statement is read-only.
+        
+        Args:
+            statements: ``(query, parameters)`` or ``(query, parameters,
+                row_format)`` tuples; row_format defaults to "dict"
+        
+        Returns:
+            One result per statement, in order, in the requested row format
+        """
+        specs = []
+        for statement in statements:
+            query, parameters, row_format = (tuple(statement) + (None, "dict"))[:3]
+            specs.append((query, parameters, row_format or "dict"))
+        pipeline_shape = query_shape("\n".join(query for query, _, _ in specs))
+        
+        read_only = all(is_read_only_statement(query) for query, _, _ in specs)
+        return await self._with_retry(lambda: self._run_pipeline(specs, pipeline_shape), read_only)
+    
+    async def _run_pipeline(self, specs: List[tuple], pipeline_shape: str) -> List[Any]:
+        """Run ``execute_pipeline`` once, without retries"""
+        async with self.get_connection(read_only=True) as conn:
+            for query, _, _ in specs:
+                self.statement_cache.record(conn, query)
+            
+            try:
+                if self._supports_pipelining(conn):
+                    self.pipeline_executions["pipelined"] += 1
+                    pipeline = oracledb.create_pipeline()
+                    for query, parameters, _ in specs:
+                        pipeline.add_fetchall(query, parameters or None)
+                    
+                    # One round trip covers execute and fetch for every statement
+                    with self.latency.time("execute", pipeline_shape):
+                        op_results = await conn.run_pipeline(pipeline)
+                    
+                    results = []
+                    with self.latency.time("convert", pipeline_shape):
+                        for (query, _, row_format), op_result in zip(specs, op_results):
+                            columns = column_names(tuple(col.name for col in op_result.columns))
+                            # Pipelined fetches arrive whole; the caps still bound what is returned
+                            rows = self._cap_rows(query, op_result.rows)
+                            results.append(convert_rows(columns, rows, row_format))
+                else:
+                    self.pipeline_executions["sequential"] += 1
+                    results = [
+                        await self._fetch_all_on(conn, query, parameters, row_format)
+                        for query, parameters, row_format in specs
+                    ]
+                
+                logger.debug(f"Pipeline executed successfully, ran {len(specs)} statements")
+                return results
+            
+            except oracledb.Error as e:
+                logger.error(f"Pipeline execution error: {e}")
+                for query, parameters, _ in specs:
+                    logger.error(f"Query: {query}")
+                    logger.error(f"Parameters: {parameters}")
+                raise
+    
+    async def _fetch_capped(
+        self,
+        cursor: Any,
+        query: str,
+        max_rows: Optional[int] = None
+    ) -> tuple:
+        """
+        Fetch all rows up to the row cap and approximate byte budget
+        
+        Never fetches more than one row past the row cap. The caller closes
+        the cursor, which discards any rows left on the server.
+        
+        Returns:
+            (rows, rows_scanned)
+        """
+        row_cap = max_rows or self.config.performance.max_query_results
+        byte_budget = self.config.performance.max_result_bytes
+        rows: List[tuple] = []
+        row_bytes = 0
+        
+        while True:
+            # call_timeout was set from the deadline at acquire time; each round trip gets what is left
+            self._renew_call_timeout(cursor.connection)
+            batch = await cursor.fetchmany(max(1, min(cursor.arraysize, row_cap + 1 - len(rows))))
+            if not batch:
+                return rows, len(rows)
+            if not row_bytes:
+                row_bytes = estimate_row_bytes(batch)
+            rows.extend(batch)
+            
+            if len(rows) > row_cap:
+                self._note_truncation(query, row_cap, len(rows), "row_limit")
+                return rows[:row_cap], len(rows)
+            if byte_budget and len(rows) * row_bytes > byte_budget:
+                keep = max(1, byte_budget // row_bytes)
+                self._note_truncation(query, keep, len(rows), "byte_limit")
+                return rows[:keep], len(rows)
+    
+    def _cap_rows(self, query: str, rows: List[tuple]) -> List[tuple]:
+        """Apply the row/byte caps to rows that were already fetched"""
+        row_cap = self.config.performance.max_query_results
+        byte_budget = self.config.performance.max_result_bytes
+        keep = len(rows)
+        reason = None
+        if keep > row_cap:
+            keep, reason = row_cap, "row_limit"
+        row_bytes = estimate_row_bytes(rows)
+        if byte_budget and row_bytes and keep * row_bytes > byte_budget:
+            keep, reason = max(1, byte_budget // row_bytes), "byte_limit"
+        if reason is None:
+            return rows
+        self._note_truncation(query, keep, len(rows), reason)
+        return rows[:keep]
+    
+    def _note_truncation(self, query: str, rows_returned: int, rows_scanned: int, reason: str) -> None:
+        """Count a capped result and report it to the current tool call"""
+        self.truncations[reason] += 1
+        logger.warning(
+            f"Query result truncated ({reason}): returned {rows_returned} of at least "
+            f"{rows_scanned} rows for shape {query_shape(query)}"
+        )
+        notes = _truncations.get()
+        if notes is not None:
+            notes.append({
+                "shape": query_shape(query),
+                "reason": reason,
+                "rows_returned": rows_returned,
+                "rows_scanned": rows_scanned
+            })
+    
+    async def _fetch_all_on(
+        self,
+        conn: Any,
+        query: str,
+        parameters: Optional[Dict[str, Any]],
+        row_format: str
+    ) -> Any:
+        """Run one query on an already acquired connection (pipeline fallback)"""
+        shape = query_shape(query)
+        plan = self.fetch_planner.plan(query, parameters)
+        cursor = conn.cursor()
+        try:
+            cursor.prefetchrows = plan.prefetch_rows
+            cursor.arraysize = plan.array_size
+            with self.latency.time("execute", shape):
+                if parameters:
+                    await cursor.execute(query, parameters)
+                else:
+                    await cursor.execute(query)
+            columns = description_columns(cursor.description)
+            with self.latency.time("fetch", shape):
+                rows, rows_scanned = await self._fetch_capped(cursor, query)
+            self.fetch_planner.record(query, plan, rows_scanned)
+            with self.latency.time("convert", shape):
+                return convert_rows(columns, rows, row_format)
+        finally:
+            cursor.close()
+    
+    async def fetch_by_keys(
+        self,
+        shape: str,
+        keys: List[Any],
+        parameters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch rows for many keys in one statement instead of one query per key
+        
+        ``shape`` is a query containing ``{keys}`` where the key set is joined
+        and selecting the matched key as ``lookup_key`` (see the
+        ``OipaQueryBuilder.*_by_keys`` methods). Keys are bound as a single
+        collection (OIPA_DB_KEY_LIST_TYPE). Lists longer than
+        DB_KEYS_GTT_THRESHOLD are loaded into the global temporary table
+        OIPA_DB_KEYS_GTT when one is configured; otherwise they are split
+        into collections of at most ``MAX_KEY_COLLECTION`` keys.
+        
+        Args:
+            shape: Query shape with the ``{keys}`` placeholder
+            keys: Key values (compared as strings; duplicates are ignored)
+            parameters: Additional bind parameters of the shape
+        
+        Returns:
+            Rows (dicts without ``lookup_key``) per input key, in input order;
+            keys with no match map to an empty list
+        """
+        if KEYS_PLACEHOLDER not in shape:
+            raise ValueError(f"Query shape must contain the {KEYS_PLACEHOLDER} placeholder")
+        
+        unique_keys = list(dict.fromkeys(str(key) for key in keys))
+        results: Dict[str, List[Dict[str, Any]]] = {key: [] for key in unique_keys}
+        if not unique_keys:
+            return results
+        
+        db_config = self.config.database
+        if db_config.keys_gtt and len(unique_keys) > db_config.keys_gtt_threshold:
+            self.key_lookups["temp_table"] += 1
+            # Keys only go into the session's own temporary table, so a retry is safe
+            rows = await self._with_retry(
+                lambda: self._fetch_keys_via_temp_table(shape, unique_keys, parameters)
+            )
+        else:
+            self.key_lookups["collection"] += 1
+            rows = []
+            for start in range(0, len(unique_keys), self.MAX_KEY_COLLECTION):
+                chunk = unique_keys[start:start + self.MAX_KEY_COLLECTION]
+                rows.extend(await self._with_retry(
+                    lambda: self._fetch_keys_via_collection(shape, chunk, parameters)
+                ))
+        
+        for row in rows:
+            results.setdefault(str(row.pop("lookup_key")), []).append(row)
+        
+        logger.debug(f"Key lookup fetched {len(rows)} rows for {len(unique_keys)} keys")
+        return results
+    
+    async def _fetch_keys_via_collection(
+        self,
+        shape: str,
+        keys: List[str],
+        parameters: Optional[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Bind the keys as one collection and join against TABLE(:lookup_keys)"""
+        query = shape.replace(KEYS_PLACEHOLDER, "(SELECT COLUMN_VALUE AS key_value FROM TABLE(:lookup_keys))")
+        
+        async with self.get_connection(read_only=True) as conn:
+            self.statement_cache.record(conn, query)
+            key_list_type = await self._key_list_type(conn)
+            bind = dict(parameters or {}, lookup_keys=key_list_type.newobject(keys))
+            return await self._fetch_all_on(conn, query, bind, "dict")
+    
+    async def _fetch_keys_via_temp_table(
+        self,
+        shape: str,
+        keys: List[str],
+        parameters: Optional[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Load the keys into the global temporary table and join against it"""
+        table = self.config.database.keys_gtt
+        if not _QUALIFIED_NAME.match(table):
+            raise ValueError(f"Invalid OIPA_DB_KEYS_GTT: {table!r}")
+        query = shape.replace(KEYS_PLACEHOLDER, f"(SELECT key_value FROM {table})")
+        
+        # Inserts need the primary, even for a read-only lookup
+        async with self.get_connection() as conn:
+            self.statement_cache.record(conn, query)
+            cursor = conn.cursor()
+            try:
+                with self.latency.time("execute", query_shape(query)):
+                    await cursor.executemany(f"INSERT INTO {table} (key_value) VALUES (:1)", [(key,) for key in keys])
+            finally:
+                cursor.close()
+            
+            try:
+                return await self._fetch_all_on(conn, query, parameters, "dict")
+            finally:
+                # Empties the ON COMMIT DELETE ROWS table before the session is reused
+                await conn.rollback()
+    
+    async def _key_list_type(self, conn: Any) -> Any:
+        """Look up the key collection type once per physical session"""
+        key = SessionInitializer._session_key(conn)
+        key_list_type = self._key_list_types.get(key)
+        if key_list_type is None:
+            type_name = self.config.database.key_list_type
+            if not _QUALIFIED_NAME.match(type_name):
+                raise ValueError(f"Invalid OIPA_DB_KEY_LIST_TYPE: {type_name!r}")
+            key_list_type = self._key_list_types[key] = await conn.gettype(type_name)
+            if len(self._key_list_types) > max(16, self.config.database.pool_max_size * 4):
+                self._key_list_types.popitem(last=False)
+        return key_list_type
+    
     async def execute_single_query(
         self, 
         query: str, 
@@ -266,27 +2189,222 @@ class OipaDatabase:
     async def execute_many(
         self,
         query: str,
-        parameters_list: List[Dict[str, Any]]
-    ) -> None:
+        parameters_list: List[Dict[str, Any]],
+        chunk_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        batch_errors: bool = True,
+        row_counts: bool = False,
+        start_offset: int = 0,
+        skip_ranges: Optional[List[Tuple[int, int]]] = None
+    ) -> BulkDmlResult:
         """
-        Execute a query multiple times with different parameters
-        Useful for bulk operations
+        Execute a DML statement for many parameter sets (bulk load)
+        
+        Input is split into chunks of ``chunk_size`` rows. Each chunk runs as
+        one ``executemany`` and commits on its own, so a large load does not
+        hold one huge transaction and can be restarted from
+        ``resume_offset``. With ``batch_errors`` rows that fail (constraint
+        violations, bad values) are reported in ``errors`` while the rest of
+        the chunk is still applied. With ``concurrency`` > 1 chunks run in
+        parallel on that many pooled connections; after a failure no new
+        chunk is started and the ones in flight are awaited.
+        
+        Args:
+            query: INSERT/UPDATE/DELETE/MERGE statement
+            parameters_list: One parameter set per row
+            chunk_size: Rows per executemany (defaults to BULK_CHUNK_SIZE)
+            concurrency: Chunks in flight (defaults to BULK_CONCURRENCY)
+            batch_errors: Report bad rows instead of failing their chunk
+            row_counts: Collect rows affected per input row
+            start_offset: Skip rows already loaded by a previous run
+            skip_ranges: ``committed_ranges`` of a previous run; these rows
+                are not sent again
+        
+        Returns:
+            BulkDmlResult with totals, row errors and the resume offset
+        
+        Raises:
+            BulkDmlError: A chunk failed as a whole (e.g. lost connection);
+                ``error.result`` holds what was committed
         """
+        chunk_size = max(1, chunk_size or self.config.performance.bulk_chunk_size)
+        concurrency = concurrency or self.config.performance.bulk_concurrency
+        concurrency = max(1, min(concurrency, self.config.database.pool_max_size))
+        
+        total_rows = len(parameters_list)
+        skip_ranges = sorted(
+            (max(start, start_offset), min(end, total_rows))
+            for start, end in skip_ranges or ()
+            if end > start_offset and start < total_rows
+        )
+        # Row ranges already committed, by start; chunks never overlap them
+        committed_ends: Dict[int, int] = dict(skip_ranges)
+        chunks = []
+        offset = start_offset
+        while offset < total_rows:
+            if offset in committed_ends:
+                offset = committed_ends[offset]
+                continue
+            end = min([offset + chunk_size, total_rows] + [start for start, _ in skip_ranges if start > offset])
+            chunks.append((offset, end))
+            offset = end
+        
+        result = BulkDmlResult(
+            rows=sum(end - offset for offset, end in chunks),
+            chunks=len(chunks),
+            row_counts=[None] * max(0, total_rows - start_offset) if row_counts else None,
+            resume_offset=start_offset
+        )
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def run_chunk(offset: int, end: int) -> None:
+            async with semaphore:
+                # Stop handing out work once a chunk has failed; the rest is resumable
+                if result.failed_chunks:
+                    return
+                rows = parameters_list[offset:end]
+                try:
+                    errors, counts, affected = await self._execute_chunk(query, rows, batch_errors, row_counts)
+                except Exception as e:
+                    # Deadline, acquire and driver errors alike: record the chunk so
+                    # the others finish and the result stays resumable
+                    result.failed_chunks.append({"offset": offset, "rows": len(rows), "error": str(e) or type(e).__name__})
+                    return
+                
+                result.committed_chunks += 1
+                result.rows_affected += affected
+                committed_ends[offset] = end
+                for error in errors:
+                    result.errors.append({
+                        "row": offset + error.offset,
+                        "code": getattr(error, "full_code", None),
+                        "message": error.message
+                    })
+                if counts is not None:
+                    base = offset - start_offset
+                    result.row_counts[base:base + len(counts)] = counts
+        
+        started = time.monotonic()
+        await asyncio.gather(*(run_chunk(offset, end) for offset, end in chunks), return_exceptions=True)
+        
+        # Resume from the end of the contiguous committed prefix; anything
+        # committed past it must be skipped on resume
+        while result.resume_offset in committed_ends:
+            result.resume_offset = committed_ends.pop(result.resume_offset)
+        result.committed_ranges = sorted(committed_ends.items())
+        result.errors.sort(key=lambda error: error["row"])
+        
+        logger.debug(
+            f"Bulk DML: {result.committed_chunks}/{result.chunks} chunks, {result.rows_affected} rows "
+            f"affected, {len(result.errors)} row errors in {(time.monotonic() - started) * 1000:.0f}ms"
+        )
+        if result.failed_chunks:
+            failure = result.failed_chunks[0]
+            logger.error(f"Bulk DML chunk at row {failure['offset']} failed: {failure['error']}")
+            skipped = f" skipping committed rows {result.committed_ranges}" if result.committed_ranges else ""
+            raise BulkDmlError(
+                f"Bulk DML failed at row {failure['offset']}; resume from row {result.resume_offset}{skipped}",
+                result
+            )
+        return result
+    
+    async def _execute_chunk(
+        self,
+        query: str,
+        rows: List[Dict[str, Any]],
+        batch_errors: bool,
+        row_counts: bool
+    ) -> tuple:
+        """Run and commit one bulk DML chunk; returns (batch errors, row counts, rows affected)"""
         async with self.get_connection() as conn:
+            self.statement_cache.record(conn, query)
             cursor = conn.cursor()
             
             try:
-                await cursor.executemany(query, parameters_list)
-                await conn.commit()
-                logger.debug(f"Executed batch query {len(parameters_list)} times")
+                with self.latency.time("execute", query_shape(query)):
+                    await cursor.executemany(
+                        query, rows, batcherrors=batch_errors, arraydmlrowcounts=row_counts
+                    )
+                    errors = cursor.getbatcherrors() if batch_errors else []
+                    counts = cursor.getarraydmlrowcounts() if row_counts else None
+                    await conn.commit()
+                return errors, counts, cursor.rowcount or 0
                 
             except oracledb.Error as e:
-                await conn.rollback()
                 logger.error(f"Batch query execution error: {e}")
-                raise
+                # A dead connection fails the rollback too; report the DML error
+                try:
+                    await conn.rollback()
+                except Exception as rollback_error:
+                    logger.warning(f"Rollback after failed bulk DML chunk failed: {rollback_error}")
+                raise e
             finally:
                 cursor.close()
     
+    async def _with_retry(self, operation: Callable[[], Awaitable[Any]], retry: bool = True) -> Any:
+        """
+        Run ``operation``, retrying transient errors with exponential backoff
+        
+        Each attempt acquires a fresh connection (dead ones are dropped by
+        ``get_connection``). Retries stop after DB_RETRY_ATTEMPTS or when
+        the next backoff would overrun the current query deadline.
+        """
+        max_retries = self.config.database.retry_attempts
+        attempt = 0
+        while True:
+            try:
+                result = await operation()
+            except oracledb.Error as e:
+                if not retry or not is_retryable_error(e):
+                    raise
+                delay = self._retry_delay(attempt)
+                remaining = remaining_time()
+                if attempt >= max_retries or (remaining is not None and delay >= remaining):
+                    if max_retries:
+                        self.retries["exhausted"] += 1
+                    raise
+                attempt += 1
+                code = error_code(e) or "unknown"
+                self.retries["attempted"] += 1
+                self.retries["by_code"][code] = self.retries["by_code"].get(code, 0) + 1
+                logger.warning(
+                    f"Transient database error {code}, retry {attempt}/{max_retries} "
+                    f"in {delay * 1000:.0f}ms: {e}"
+                )
+                await asyncio.sleep(delay)
+                continue
+            if attempt:
+                self.retries["succeeded"] += 1
+            return result
+    
+    def _retry_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter, in seconds"""
+        db_config = self.config.database
+        ceiling = min(db_config.retry_max_backoff_ms, db_config.retry_backoff_ms * (2 ** attempt))
+        return random.uniform(0, ceiling) / 1000
+    
+    def _record_outcome(self, error: Optional[Exception] = None, on_replica: bool = False) -> None:
+        """Feed the result of a database round trip into the matching circuit breaker"""
+        if on_replica:
+            breaker = self.replica.circuit_breaker
+        else:
+            breaker = self.circuit_breaker
+            self.health_monitor.touch()
+        if error is not None and is_connection_error(error):
+            breaker.record_failure()
+        else:
+            # SQL errors still prove the database is reachable
+            breaker.record_success()
+    
+    async def is_available(self) -> bool:
+        """
+        Cheap in-memory availability check for the hot path
+        
+        Does not touch the network; relies on the circuit breaker, which is
+        driven by real query outcomes and the background health monitor.
+        """
+        return self.circuit_breaker.allow_request()
+    
     async def test_connection(self) -> bool:
         """Test database connectivity with enhanced diagnostics"""
         try:
@@ -306,24 +2424,851 @@ class OipaDatabase:
             logger.error(f"Database connection test failed: {e}")
             return False
     
-    async def get_pool_status(self) -> Dict[str, Any]:
-        """Get current connection pool status for monitoring"""
-        if not self._pool:
-            return {"status": "not_initialized"}
-        
-        try:
-            return {
-                "status": "active",
-                "opened": self._pool.opened,
-                "busy": self._pool.busy,
-                "max_size": self._pool.max,
-                "min_size": self._pool.min,
-                "increment": self._pool.increment,
-                "timeout": self._pool.timeout
-            }
-        except Exception as e:
-            logger.error(f"Failed to get pool status: {e}")
-            return {"status": "error", "error": str(e)}
+    async def refresh_drcp_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Read pooled-server reuse for our connection class from V$CPOOL_CC_STATS
+        
+        A hit means a request was served by a pooled server that already had
+        a session for this class, i.e. no new session had to be created.
+        Returns None when DRCP is off or the view is not readable.
+        """
+        db_config = self.config.database
+        if not db_config.drcp_enabled:
+            return None
+        
+        cclass_name = f"{db_config.username}.{db_config.drcp_connection_class}".upper()
+        try:
+            row = await self.execute_single_query(DRCP_STATS_QUERY, {"cclass_name": cclass_name})
+        except oracledb.Error as e:
+            logger.warning(f"Could not read DRCP statistics (SELECT on V$CPOOL_CC_STATS needed): {e}")
+            return None
+        
+        if row is None:
+            self.drcp_stats = {"connection_class": cclass_name, "num_requests": 0}
+        else:
+            requests = row["num_requests"] or 0
+            self.drcp_stats = {
+                "connection_class": cclass_name,
+                "num_requests": requests,
+                "num_hits": row["num_hits"],
+                "num_misses": row["num_misses"],
+                "num_waits": row["num_waits"],
+                "reuse_ratio": round(row["num_hits"] / requests, 3) if requests else None
+            }
+        return self.drcp_stats
+    
+    async def get_pool_status(self) -> Dict[str, Any]:
+        """Get current connection pool status for monitoring"""
+        if not self._pool:
+            return {"status": "not_initialized"}
+        
+        try:
+            status = {"status": "active"}
+            status.update(self._pool_counters())
+            status["circuit_breaker"] = self.circuit_breaker.get_status()
+            status["health_monitor"] = self.health_monitor.get_status()
+            status["session_init"] = self.session_initializer.get_status()
+            status["dataframe_fetches"] = dict(self.dataframe_fetches)
+            status["statement_cache"] = self.statement_cache.get_status()
+            status["pipeline_executions"] = dict(self.pipeline_executions)
+            status["timeouts"] = self.timeouts
+            status["autoscaler"] = self.autoscaler.get_status()
+            status["latency"] = self.latency.get_status()
+            status["replica"] = self.replica.get_status()
+            status["drcp"] = self._drcp_status()
+            status["key_lookups"] = dict(self.key_lookups)
+            status["fetch_planner"] = self.fetch_planner.get_status()
+            status["truncations"] = dict(self.truncations)
+            status["search"] = search_classifier.get_status()
+            status["search"]["index"] = policy_search_index.get_status()
+            status["codes"] = code_dictionary.get_status()
+            status["status_counts"] = policy_status_counts.get_status()
+            status["summary_views"] = summary_views.get_status()
+            status["retries"] = dict(self.retries, by_code=dict(self.retries["by_code"]))
+            return status
+        except Exception as e:
+            logger.error(f"Failed to get pool status: {e}")
+            return {"status": "error", "error": str(e)}
+    
+    def get_latency_report(
+        self,
+        phase: Optional[str] = None,
+        tool: Optional[str] = None,
+        shape: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Latency percentiles per (phase, tool, query shape), slowest p99 first
+        
+        See ``connectors.metrics`` for the phases. Query shapes match the
+        keys reported under ``statement_cache`` in ``get_pool_status()``.
+        """
+        return self.latency.snapshot(phase=phase, tool=tool, shape=shape)
+    
+    def dump_latency(self, path: Optional[str] = None) -> Optional[str]:
+        """Write the latency histograms to ``path`` (defaults to LATENCY_DUMP_FILE)"""
+        path = path or self.config.performance.latency_dump_file
+        if not path:
+            return None
+        try:
+            count = self.latency.dump(path)
+            logger.info(f"Wrote {count} latency series to {path}")
+            return path
+        except OSError as e:
+            logger.error(f"Failed to write latency histograms to {path}: {e}")
+            return None
+    
+    def _drcp_status(self) -> Dict[str, Any]:
+        """DRCP settings plus the last server-side reuse statistics"""
+        db_config = self.config.database
+        if not db_config.drcp_enabled:
+            return {"enabled": False}
+        return {
+            "enabled": True,
+            "connection_class": db_config.drcp_connection_class,
+            "purity": db_config.drcp_purity,
+            "server_stats": self.drcp_stats
+        }
+    
+    def _pool_counters(self) -> Dict[str, Any]:
+        """Read the raw pool counters"""
+        if not self._pool:
+            return {}
+        return {
+            "opened": self._pool.opened,
+            "busy": self._pool.busy,
+            "max_size": self._pool.max,
+            "min_size": self._pool.min,
+            "increment": self._pool.increment,
+            "timeout": self._pool.timeout
+        }
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards in ``value`` (for ``ESCAPE '\\'``)"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+MATCH_MODES = ("exact", "prefix", "contains")
+
+# Free-text search SQL: one OR'ed predicate over the joined tables, or one
+# UNION ALL branch per column (see OipaQueryBuilder.union_search)
+SEARCH_STRATEGIES = ("or", "union")
+
+# Columns searched case-insensitively by OipaQueryBuilder; prefix searches
+# can only use an index when each has an UPPER(col) function-based index
+SEARCH_INDEX_COLUMNS = {
+    "AsPolicy": ("PolicyNumber",),
+    "AsClient": ("FirstName", "LastName", "CompanyName", "TaxID", "Email")
+}
+
+# Function-based indexes leading with an expression on the search tables
+SEARCH_INDEX_QUERY = """
+    SELECT table_name, column_expression
+    FROM all_ind_expressions
+    WHERE table_owner = NVL(UPPER(:owner), SYS_CONTEXT('USERENV', 'CURRENT_SCHEMA'))
+    AND table_name IN ('ASPOLICY', 'ASCLIENT')
+    AND column_position = 1
+"""
+
+_UPPER_EXPRESSION = re.compile(r'UPPER\(\s*"?(\w+)"?\s*\)')
+
+
+def missing_search_indexes(expressions: List[tuple]) -> List[str]:
+    """
+    DDL for the ``UPPER(col)`` indexes prefix searches still need
+    
+    Args:
+        expressions: ``(table_name, column_expression)`` rows from ``SEARCH_INDEX_QUERY``
+    """
+    indexed = set()
+    for table_name, expression in expressions:
+        match = _UPPER_EXPRESSION.fullmatch(str(expression).strip().upper())
+        if match:
+            indexed.add((table_name.upper(), match.group(1)))
+    
+    return [
+        f"CREATE INDEX {table.upper()}_UPPER_{column.upper()}_IX ON {table} (UPPER({column}))"
+        for table, columns in SEARCH_INDEX_COLUMNS.items()
+        for column in columns
+        if (table.upper(), column.upper()) not in indexed
+    ]
+
+
+# Data dictionary entry for a configured summary object; an mview also has a
+# TABLE row of the same name, so both rows carry its refresh information
+SUMMARY_OBJECT_QUERY = """
+    SELECT o.object_type, m.staleness,
+        (SYSDATE - m.last_refresh_date) * 86400 as age_seconds
+    FROM all_objects o
+    LEFT JOIN all_mviews m ON m.owner = o.owner AND m.mview_name = o.object_name
+    WHERE o.owner = NVL(UPPER(:owner), SYS_CONTEXT('USERENV', 'CURRENT_SCHEMA'))
+    AND o.object_name = UPPER(:name)
+    AND o.object_type IN ('MATERIALIZED VIEW', 'TABLE', 'VIEW')
+"""
+
+
+def encode_cursor(kind: str, values: List[Any]) -> str:
+    """Opaque continuation cursor holding the sort key of the last row seen"""
+    payload = [
+        {"dt": value.isoformat()} if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps([kind, payload], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, kind: str) -> List[Any]:
+    """
+    Sort key values from an ``encode_cursor()`` token
+    
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another search
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_kind, payload = json.loads(raw)
+        values = [
+            datetime.fromisoformat(value["dt"]) if isinstance(value, dict) else value
+            for value in payload
+        ]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
+    if cursor_kind != kind:
+        raise ValueError(f"Cursor is for a {cursor_kind} search, not {kind}")
+    return values
+
+
+class SearchRoute(NamedTuple):
+    """How a search term will be looked up"""
+    route: str
+    value: str
+
+
+class SearchClassifier:
+    """
+    Classify search terms so recognisable keys avoid substring scans
+    
+    Terms are matched in order against the configured patterns; the first
+    full match picks the route:
+    
+    - "policy_number": ``p.PolicyNumber = :term``
+    - "guid": ``p.PolicyGUID`` or ``c.ClientGUID`` equality
+    - "tax_id": ``c.TaxID = :term``
+    - "policy_number_prefix": ``p.PolicyNumber LIKE 'term%'``
+    - "text": the five-column ``UPPER(...) LIKE '%term%'`` search
+    
+    Keys are compared upper-cased, the way OIPA stores them, so the lookups
+    can use plain column indexes.
+    
+    Free text is matched as ``exact``, ``prefix`` or ``contains``. Unless
+    SEARCH_MATCH_MODE says otherwise, ``prefix`` is the default once
+    ``OipaDatabase.detect_search_indexes()`` has found the ``UPPER(col)``
+    indexes that make it index-friendly.
+    """
+    
+    TEXT = "text"
+    
+    def __init__(self, patterns: Dict[str, str], match_mode: str = "auto", query_strategy: str = "or"):
+        if query_strategy not in SEARCH_STRATEGIES:
+            raise ValueError(f"Unknown search query strategy: {query_strategy}")
+        self.patterns = [(route, re.compile(pattern)) for route, pattern in patterns.items() if pattern]
+        self.match_mode = match_mode
+        self.query_strategy = query_strategy
+        self.missing_indexes: Optional[List[str]] = None
+        self.routes: Dict[str, int] = {}
+    
+    @classmethod
+    def from_config(cls, performance_config: Any) -> "SearchClassifier":
+        return cls({
+            "policy_number": performance_config.search_policy_number_pattern,
+            "guid": performance_config.search_guid_pattern,
+            "tax_id": performance_config.search_tax_id_pattern,
+            "policy_number_prefix": performance_config.search_policy_prefix_pattern
+        }, performance_config.search_match_mode, performance_config.search_query_strategy)
+    
+    def default_match_mode(self) -> str:
+        """Match mode for free-text searches that do not ask for one"""
+        if self.match_mode in MATCH_MODES:
+            return self.match_mode
+        return "prefix" if self.missing_indexes == [] else "contains"
+    
+    def classify(self, term: str) -> SearchRoute:
+        """Route for ``term``"""
+        key = term.strip().upper()
+        route = SearchRoute(self.TEXT, term)
+        for name, pattern in self.patterns:
+            if pattern.fullmatch(key):
+                route = SearchRoute(name, key)
+                break
+        self.routes[route.route] = self.routes.get(route.route, 0) + 1
+        return route
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get searches per route for monitoring"""
+        return {
+            "routes": dict(self.routes),
+            "default_match_mode": self.default_match_mode(),
+            "query_strategy": self.query_strategy,
+            "missing_indexes": self.missing_indexes
+        }
+
+
+class PolicySearchIndex:
+    """
+    In-process trigram index over policy numbers and primary-insured client
+    names and tax IDs, for substring searches without an Oracle full scan
+    
+    A background task loads every policy (AsPolicy/AsRole/AsClient) once,
+    then every ``interval`` seconds re-reads the policies whose policy,
+    primary-insured role or client row has a newer UpdatedGmt. Deleted
+    policies and removed primary-insured roles leave no UpdatedGmt behind,
+    so every ``reconcile_interval`` seconds all policies are re-read: the
+    missing ones are removed and the ones whose text changed are replaced,
+    evicting the keys of clients no longer on the policy. Until the first
+    load completes, and
+    for terms shorter than three characters or matching more than
+    ``max_candidates`` policies, ``candidates()`` returns None and callers
+    fall back to the database search.
+    """
+    
+    # Re-read changes this far behind the high-water mark so rows committed
+    # late with an earlier UpdatedGmt are not missed
+    REFRESH_OVERLAP = timedelta(seconds=60)
+    
+    def __init__(self, db: "OipaDatabase", interval: float, max_candidates: int, reconcile_interval: float = 3600.0):
+        self.db = db
+        self.interval = interval
+        self.max_candidates = max_candidates
+        self.reconcile_interval = reconcile_interval
+        self.reconciled_at: Optional[float] = None
+        self.removed = 0
+        self.reindexed = 0
+        self.index = TrigramIndex()
+        self.ready = False
+        self.high_water: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+        self.last_refresh_at: Optional[float] = None
+        self.last_refresh = {"rows": 0, "policies": 0, "duration_ms": 0.0}
+        self.refresh_failures = 0
+        self.hits = 0
+        self.fallbacks = {"not_ready": 0, "short_term": 0, "too_many": 0}
+    
+    def candidates(self, term: str) -> Optional[List[str]]:
+        """
+        GUIDs of policies matching ``term`` as a substring, newest first
+        
+        Returns:
+            Up to ``max_candidates`` GUIDs, or None when the index cannot
+            answer and the database should be searched instead
+        """
+        if not self.ready:
+            if self._task is not None:
+                self.fallbacks["not_ready"] += 1
+            return None
+        guids = self.index.search(term.strip(), limit=self.max_candidates + 1)
+        if guids is None:
+            self.fallbacks["short_term"] += 1
+            return None
+        if len(guids) > self.max_candidates:
+            self.fallbacks["too_many"] += 1
+            return None
+        self.hits += 1
+        return guids
+    
+    def start(self) -> None:
+        """Start the load/refresh task on the running event loop"""
+        if self._task and not self._task.done():
+            return
+        self._task = _spawn_background(self._run())
+        logger.debug(f"Policy search index started (refresh interval={self.interval}s)")
+    
+    async def stop(self) -> None:
+        """Stop the load/refresh task"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+                if self.reconciled_at is None:
+                    # The initial load is complete by definition
+                    self.reconciled_at = time.monotonic()
+                elif self.reconcile_interval > 0 and time.monotonic() - self.reconciled_at >= self.reconcile_interval:
+                    await self.reconcile()
+            except Exception as e:
+                self.refresh_failures += 1
+                logger.error(f"Policy search index refresh failed: {e}")
+            if self.interval <= 0 and self.ready:
+                return
+            await asyncio.sleep(max(self.interval, 1.0))
+    
+    async def reconcile(self) -> int:
+        """
+        Re-read every policy, dropping deleted policies and stale client keys
+        
+        Returns:
+            Number of policies removed from the index
+        """
+        documents, _ = await self._read_documents(None)
+        
+        removed = 0
+        for guid in self.index.keys():
+            if guid not in documents and self.index.remove(guid):
+                removed += 1
+        reindexed = 0
+        for guid, (updated, fields) in documents.items():
+            if self.index.add(guid, fields, updated.timestamp() if updated else 0.0):
+                reindexed += 1
+        self.removed += removed
+        self.reindexed += reindexed
+        self.reconciled_at = time.monotonic()
+        if removed or reindexed:
+            logger.info(
+                f"Policy search index removed {removed} deleted policies and "
+                f"re-indexed {reindexed} policies that had missed changes"
+            )
+        return removed
+    
+    async def refresh(self) -> int:
+        """
+        Load all policies (first call) or the ones changed since the last refresh
+        
+        Returns:
+            Number of policies (re)indexed
+        """
+        since = self.high_water - self.REFRESH_OVERLAP if self.high_water else None
+        started = time.monotonic()
+        documents, rows = await self._read_documents(since)
+        
+        for guid, (updated, fields) in documents.items():
+            self.index.add(guid, fields, updated.timestamp() if updated else 0.0)
+        
+        self.ready = True
+        self.last_refresh_at = time.monotonic()
+        self.last_refresh = {
+            "rows": rows,
+            "policies": len(documents),
+            "duration_ms": round((self.last_refresh_at - started) * 1000, 1)
+        }
+        if since is None:
+            logger.info(
+                f"Policy search index loaded {len(documents)} policies in "
+                f"{self.last_refresh['duration_ms']:.0f}ms"
+            )
+        return len(documents)
+    
+    async def _read_documents(self, since: Optional[datetime]) -> Tuple[Dict[str, Any], int]:
+        """Read the indexed text of policies changed after ``since`` (all when None), by GUID"""
+        query, parameters = OipaQueryBuilder.policy_search_documents(since)
+        
+        # Group client rows by policy; a policy can have several primary insureds
+        documents: Dict[str, Any] = {}
+        rows = 0
+        with replica_reads():
+            async for batch in self.db.stream_batches(query, parameters, row_format="tuple"):
+                for guid, updated, *fields, changed in batch:
+                    rows += 1
+                    document = documents.get(guid)
+                    if document is None:
+                        document = documents[guid] = [updated, []]
+                    document[1].extend(fields)
+                    if changed and (self.high_water is None or changed > self.high_water):
+                        self.high_water = changed
+        return documents, rows
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get index size, memory footprint and refresh lag for monitoring"""
+        status = {
+            "ready": self.ready,
+            "refresh_lag_seconds": round(time.monotonic() - self.last_refresh_at, 1) if self.last_refresh_at else None,
+            "high_water": self.high_water.isoformat() if self.high_water else None,
+            "last_refresh": dict(self.last_refresh),
+            "refresh_failures": self.refresh_failures,
+            "reconcile_age_seconds": round(time.monotonic() - self.reconciled_at, 1) if self.reconciled_at else None,
+            "removed": self.removed,
+            "reindexed": self.reindexed,
+            "hits": self.hits,
+            "fallbacks": dict(self.fallbacks)
+        }
+        status.update(self.index.get_status())
+        return status
+
+
+class PolicyStatusCounts:
+    """
+    Policy counts by status maintained in-process
+    
+    Seeded with one scan of AsPolicy (GUID and status only), then every
+    ``interval`` seconds re-reads the policies whose UpdatedGmt is past the
+    high-water mark and moves each changed policy between status buckets.
+    Deleted policies and rows committed late enough to miss the overlap
+    are only picked up by the full reconciliation every
+    ``reconcile_interval`` seconds, which rebuilds the counts from scratch
+    and records how far the incremental counts had drifted.
+    
+    Counters plus a watermark are not enough on their own: a changed row
+    only carries its new StatusCode, and AsPolicy keeps no previous value,
+    so the bucket to decrement has to come from the last status seen for
+    that GUID. That map (one entry per policy, status strings shared) is
+    the memory cost of the feature, which is why it is opt-in
+    (STATUS_COUNTS_ENABLED).
+    """
+    
+    # Re-read changes this far behind the high-water mark so rows committed
+    # late with an earlier UpdatedGmt are not missed
+    REFRESH_OVERLAP = timedelta(seconds=60)
+    
+    def __init__(self, db: "OipaDatabase", interval: float, reconcile_interval: float):
+        self.db = db
+        self.interval = interval
+        self.reconcile_interval = reconcile_interval
+        # Status code per policy GUID, needed to decrement the old bucket on a change
+        self.statuses: Dict[str, Optional[str]] = {}
+        self.counts: Dict[Optional[str], int] = {}
+        self.ready = False
+        self.high_water: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+        self.refreshed_at: Optional[float] = None
+        self.reconciled_at: Optional[float] = None
+        self.last_refresh = {"rows": 0, "changed": 0, "duration_ms": 0.0}
+        self.last_drift = 0
+        self.refresh_failures = 0
+        self.hits = 0
+    
+    def snapshot(self) -> Optional[Tuple[Dict[Optional[str], int], float]]:
+        """
+        Current counts by status code and their age in seconds
+        
+        Returns:
+            ``(counts, age_seconds)``, or None before the first load
+        """
+        if not self.ready:
+            return None
+        self.hits += 1
+        return dict(self.counts), round(time.monotonic() - self.refreshed_at, 1)
+    
+    def start(self) -> None:
+        """Start the load/refresh task on the running event loop"""
+        if self._task and not self._task.done():
+            return
+        self._task = _spawn_background(self._run())
+        logger.debug(
+            f"Policy status counts started (refresh interval={self.interval}s, "
+            f"reconcile interval={self.reconcile_interval}s)"
+        )
+    
+    async def stop(self) -> None:
+        """Stop the load/refresh task"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _run(self) -> None:
+        while True:
+            try:
+                reconcile = (
+                    self.reconciled_at is None
+                    or time.monotonic() - self.reconciled_at >= self.reconcile_interval
+                )
+                await self.refresh(full=reconcile)
+            except Exception as e:
+                self.refresh_failures += 1
+                logger.error(f"Policy status counts refresh failed: {e}")
+            await asyncio.sleep(max(self.interval, 1.0))
+    
+    async def refresh(self, full: bool = False) -> int:
+        """
+        Rebuild the counts (first call or ``full``) or apply the policies changed since the last refresh
+        
+        Returns:
+            Number of policies whose status was (re)counted
+        """
+        since = None
+        if self.ready and not full and self.high_water:
+            since = self.high_water - self.REFRESH_OVERLAP
+        query, parameters = OipaQueryBuilder.policy_status_rows(since)
+        started = time.monotonic()
+        
+        statuses = {} if since is None else self.statuses
+        counts = {} if since is None else self.counts
+        # Share one string per status code across all policies
+        codes: Dict[Optional[str], Optional[str]] = {}
+        high_water = None if since is None else self.high_water
+        rows = changed = 0
+        with replica_reads():
+            async for batch in self.db.stream_batches(query, parameters, row_format="tuple"):
+                for guid, status_code, updated in batch:
+                    rows += 1
+                    if updated and (high_water is None or updated > high_water):
+                        high_water = updated
+                    status_code = codes.setdefault(status_code, status_code)
+                    if guid in statuses:
+                        old = statuses[guid]
+                        if old == status_code:
+                            continue
+                        counts[old] -= 1
+                        if not counts[old]:
+                            del counts[old]
+                    counts[status_code] = counts.get(status_code, 0) + 1
+                    statuses[guid] = status_code
+                    changed += 1
+        
+        if since is None:
+            if self.ready:
+                self.last_drift = sum(
+                    abs(counts.get(code, 0) - self.counts.get(code, 0))
+                    for code in counts.keys() | self.counts.keys()
+                )
+                if self.last_drift:
+                    logger.info(f"Policy status counts reconciled with drift {self.last_drift}")
+            self.statuses = statuses
+            self.counts = counts
+            self.reconciled_at = time.monotonic()
+        self.high_water = high_water
+        self.ready = True
+        self.refreshed_at = time.monotonic()
+        self.last_refresh = {
+            "rows": rows,
+            "changed": changed,
+            "duration_ms": round((self.refreshed_at - started) * 1000, 1)
+        }
+        return changed
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get snapshot age, size and reconciliation drift for monitoring"""
+        now = time.monotonic()
+        return {
+            "ready": self.ready,
+            "policies": len(self.statuses),
+            "statuses": len(self.counts),
+            "age_seconds": round(now - self.refreshed_at, 1) if self.refreshed_at else None,
+            "reconcile_age_seconds": round(now - self.reconciled_at, 1) if self.reconciled_at else None,
+            "high_water": self.high_water.isoformat() if self.high_water else None,
+            "last_refresh": dict(self.last_refresh),
+            "last_drift": self.last_drift,
+            "refresh_failures": self.refresh_failures,
+            "hits": self.hits
+        }
+
+
+class CodeDictionary:
+    """
+    AsCode lookups for the code names the server decodes
+    
+    Loaded when the pool is initialized, then reloaded every ``interval``
+    seconds by a background task or on demand with ``refresh()``. Each
+    load builds a new immutable ``CodeTables`` (layered over the built-in
+    fallback descriptions) and swaps it in, so a lookup is a single dict
+    access and never sees a half-loaded table. A failed load keeps the
+    previous snapshot.
+    """
+    
+    def __init__(self, db: "OipaDatabase", code_names: tuple = CODE_NAMES, interval: float = 3600.0):
+        self.db = db
+        self.code_names = code_names
+        self.interval = interval
+        self.tables = CodeTables.fallback()
+        self.loaded = False
+        self.loads = 0
+        self.load_failures = 0
+        self._task: Optional[asyncio.Task] = None
+    
+    def short(self, code_name: str, code_value: Optional[str]) -> Optional[str]:
+        """ShortDescription for a code, or None if unknown"""
+        return self.tables.short(code_name, code_value)
+    
+    def long(self, code_name: str, code_value: Optional[str]) -> Optional[str]:
+        """LongDescription for a code, or None if unknown"""
+        return self.tables.long(code_name, code_value)
+    
+    async def refresh(self) -> bool:
+        """Reload all code names from AsCode; returns whether the load succeeded"""
+        binds = {f"code_name_{i}": name for i, name in enumerate(self.code_names)}
+        query = f"""
+            SELECT CodeName, CodeValue, ShortDescription, LongDescription
+            FROM AsCode
+            WHERE CodeName IN ({", ".join(f":{bind}" for bind in binds)})
+        """
+        rows = []
+        try:
+            async for batch in self.db.stream_batches(query, binds, row_format="tuple"):
+                rows.extend(batch)
+        except Exception as e:
+            self.load_failures += 1
+            logger.warning(f"Could not load AsCode, keeping {'loaded' if self.loaded else 'built-in'} descriptions: {e}")
+            return False
+        
+        self.tables = CodeTables([*fallback_rows(), *rows])
+        self.loaded = True
+        self.loads += 1
+        logger.debug(f"Loaded {len(rows)} AsCode rows for {', '.join(self.code_names)}")
+        return True
+    
+    def start(self) -> None:
+        """Start the periodic reload task on the running event loop"""
+        if self.interval <= 0 or (self._task and not self._task.done()):
+            return
+        self._task = _spawn_background(self._run())
+    
+    async def stop(self) -> None:
+        """Stop the periodic reload task"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.refresh()
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get snapshot size and age for monitoring"""
+        return {
+            "loaded": self.loaded,
+            "code_names": list(self.code_names),
+            "entries": len(self.tables),
+            "age_seconds": round(time.time() - self.tables.loaded_at, 1) if self.loaded else None,
+            "loads": self.loads,
+            "load_failures": self.load_failures
+        }
+
+
+class SummaryViews:
+    """
+    Routing of dashboard aggregates to a DBA-maintained summary object
+    
+    ``name`` is a materialized view (or summary table) of policy counts
+    with columns StatusCode, PlanGUID, IssueStateCode and PolicyCount.
+    ``detect()`` looks it up in the data dictionary when the pool is
+    initialized and again at most every ``recheck_interval`` seconds, so a
+    view dropped or invalidated after detection stops being used. Aggregates
+    use it only while it exists, is usable and was refreshed within
+    ``max_staleness`` seconds; otherwise they run on the base tables. A
+    query on it that fails anyway (e.g. a revoked grant) is reported with
+    ``mark_failed()`` and routes to the base tables until the next recheck.
+    ``max_staleness`` 0 skips freshness checks, which is required for a
+    plain table (it has no refresh time).
+    """
+    
+    _IDENTIFIER = re.compile(r"^[A-Za-z][A-Za-z0-9_$#]*$")
+    
+    # ALL_MVIEWS.STALENESS values that mean the mview cannot be queried correctly
+    UNUSABLE = ("UNUSABLE", "NEEDS_COMPILE", "COMPILATION_ERROR")
+    
+    def __init__(self, db: "OipaDatabase", name: Optional[str], max_staleness: float, recheck_interval: float = 60.0):
+        if name and not self._IDENTIFIER.match(name):
+            raise ValueError(f"Invalid SUMMARY_POLICY_COUNTS_VIEW: {name!r}")
+        self.db = db
+        self.name = name.upper() if name else None
+        self.max_staleness = max_staleness
+        self.recheck_interval = recheck_interval
+        self.object_type: Optional[str] = None
+        self.staleness: Optional[str] = None
+        self.age_seconds: Optional[float] = None
+        self.checked_at: Optional[float] = None
+        self.routed = 0
+        self.fallbacks = {"not_configured": 0, "missing": 0, "unusable": 0, "stale": 0, "error": 0}
+    
+    async def detect(self) -> bool:
+        """Read the summary object's type and last refresh from the data dictionary; returns whether it exists"""
+        if not self.name:
+            return False
+        try:
+            rows = await self.db.execute_query(
+                SUMMARY_OBJECT_QUERY,
+                {"owner": self.db.config.database.default_schema, "name": self.name},
+                row_format="tuple"
+            )
+        except Exception as e:
+            # Keep what was known; retried after recheck_interval
+            logger.warning(f"Could not check summary object {self.name}: {e}")
+            self.checked_at = time.monotonic()
+            return self.object_type is not None
+        
+        self.checked_at = time.monotonic()
+        types = {row[0] for row in rows}
+        self.object_type = "MATERIALIZED VIEW" if "MATERIALIZED VIEW" in types else next(iter(types), None)
+        self.staleness = rows[0][1] if rows else None
+        self.age_seconds = float(rows[0][2]) if rows and rows[0][2] is not None else None
+        if self.object_type:
+            age = f"{self.age_seconds:.0f}s" if self.age_seconds is not None else "unknown"
+            logger.info(f"Summary object {self.name}: {self.object_type.lower()}, refresh age {age}")
+        else:
+            logger.info(f"Summary object {self.name} not found; dashboard aggregates use base tables")
+        return self.object_type is not None
+    
+    def current_age(self) -> Optional[float]:
+        """Seconds since the summary object was last refreshed, as of now"""
+        if self.age_seconds is None:
+            return None
+        return self.age_seconds + time.monotonic() - self.checked_at
+    
+    async def source(self) -> Optional[Tuple[str, Optional[float]]]:
+        """
+        Summary object to answer an aggregate from
+        
+        Returns:
+            ``(name, refresh_age_seconds)``, or None to use the base tables
+        """
+        if not self.name:
+            self.fallbacks["not_configured"] += 1
+            return None
+        if self.checked_at is None or time.monotonic() - self.checked_at >= self.recheck_interval:
+            await self.detect()
+        
+        if not self.object_type:
+            self.fallbacks["missing"] += 1
+            return None
+        if self.staleness in self.UNUSABLE:
+            self.fallbacks["unusable"] += 1
+            return None
+        if not self._usable():
+            self.fallbacks["stale"] += 1
+            return None
+        self.routed += 1
+        age = self.current_age()
+        return self.name, round(age, 1) if age is not None else None
+    
+    def mark_failed(self) -> None:
+        """Route to the base tables until the next recheck after a query on the summary object failed"""
+        self.object_type = None
+        self.checked_at = time.monotonic()
+        self.fallbacks["error"] += 1
+    
+    def _usable(self) -> bool:
+        if not self.object_type or self.staleness in self.UNUSABLE:
+            return False
+        if self.max_staleness <= 0:
+            return True
+        age = self.current_age()
+        return age is not None and age <= self.max_staleness
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get summary object state and routing counters for monitoring"""
+        age = self.current_age()
+        return {
+            "name": self.name,
+            "object_type": self.object_type,
+            "staleness": self.staleness,
+            "age_seconds": round(age, 1) if age is not None else None,
+            "max_staleness": self.max_staleness,
+            "routed": self.routed,
+            "fallbacks": dict(self.fallbacks)
+        }
 
 
 class OipaQueryBuilder:
@@ -348,79 +3293,403 @@ class OipaQueryBuilder:
         LEFT JOIN AsClient c ON r.ClientGUID = c.ClientGUID
     """
     
+    POLICY_DETAIL_COLUMNS = """
+                p.PolicyGUID as policy_guid,
+                p.PolicyNumber as policy_number,
+                p.PolicyName as policy_name,
+                p.StatusCode as status_code,
+                p.PlanDate as plan_date,
+                p.IssueStateCode as issue_state_code,
+                p.CreationDate as creation_date,
+                p.UpdatedGmt as updated_date,
+                -- Client information (primary insured)
+                c.ClientGUID as client_guid,
+                c.FirstName as client_first_name,
+                c.LastName as client_last_name,
+                c.CompanyName as company_name,
+                c.TaxID as tax_id,
+                c.DateOfBirth as date_of_birth,
+                c.Sex as gender,
+                -- Plan information
+                pl.PlanGUID as plan_guid,
+                pl.PlanName as plan_name
+    """
+    
+    # Status, state and role codes are decoded with code_dictionary, not AsCode joins
+    POLICY_DETAIL_TABLES = POLICY_PLAN_TABLES
+    
+    ROLE_COLUMNS = """
+                r.RoleGUID as role_guid,
+                r.RoleCode as role_code,
+                r.RolePercent as role_percent,
+                r.RoleAmount as role_amount,
+                r.StatusCode as role_status_code,
+                c.ClientGUID as client_guid,
+                c.FirstName as first_name,
+                c.LastName as last_name,
+                c.CompanyName as company_name,
+                c.TaxID as tax_id,
+                c.TypeCode as client_type_code,
+                c.DateOfBirth as date_of_birth,
+                c.Sex as gender,
+                c.Email as email
+    """
+    
+    ROLE_JOINS = """
+        LEFT JOIN AsClient c ON r.ClientGUID = c.ClientGUID
+    """
+    
+    CLIENT_COLUMNS = """
+                c.ClientGUID as client_guid,
+                c.FirstName as first_name,
+                c.LastName as last_name,
+                c.CompanyName as company_name,
+                c.TaxID as tax_id,
+                c.TypeCode as type_code,
+                c.DateOfBirth as date_of_birth,
+                c.Email as email,
+                c.StatusCode as status_code
+    """
+    
+    # Predicates per search route; policy numbers, GUIDs and tax IDs are
+    # matched on the bare (indexed) columns, free text with text_search()
+    SEARCH_CONDITIONS = {
+        "policy_number": "p.PolicyNumber = :search_term",
+        "guid": "(p.PolicyGUID = :search_term OR c.ClientGUID = :search_term)",
+        "tax_id": "c.TaxID = :search_term",
+        "policy_number_prefix": "p.PolicyNumber LIKE :search_term ESCAPE '\\'"
+    }
+    
+    POLICY_SEARCH_SELECT = """
+                p.PolicyGUID as policy_guid,
+                p.PolicyNumber as policy_number,
+                p.PolicyName as policy_name,
+                p.StatusCode as status_code,
+                p.PlanDate as plan_date,
+                p.UpdatedGmt as updated_date,
+                c.ClientGUID as client_guid,
+                c.FirstName as client_first_name,
+                c.LastName as client_last_name,
+                c.CompanyName as company_name,
+                c.TaxID as tax_id
+    """
+    
+    STATUS_FILTER_CODES = {
+        "active": "01",
+        "cancelled": "99",
+        "pending": "08",
+        "suspended": "02"
+    }
+    
+    # Source of the policy GUID for each searchable column in union_search()
+    SEARCH_BRANCH_SOURCES = {
+        "p": ("p.PolicyGUID", "AsPolicy p"),
+        "c": ("r.PolicyGUID", "AsClient c JOIN AsRole r ON r.ClientGUID = c.ClientGUID AND r.RoleCode = '01'")
+    }
+    
+    # Keyset orders: (column, descending, result column). The trailing GUIDs
+    # make the order total, so a cursor resumes exactly after the last row
+    POLICY_SEARCH_ORDER = (
+        ("p.UpdatedGmt", True, "updated_date"),
+        ("p.PolicyGUID", True, "policy_guid"),
+        ("c.ClientGUID", True, "client_guid")
+    )
+    CLIENT_SEARCH_ORDER = (
+        ("c.LastName", False, "last_name"),
+        ("c.FirstName", False, "first_name"),
+        ("c.CompanyName", False, "company_name"),
+        ("c.ClientGUID", False, "client_guid")
+    )
+    
+    POLICY_SEARCH_COLUMNS = ("p.PolicyNumber", "c.FirstName", "c.LastName", "c.CompanyName", "c.TaxID")
+    CLIENT_SEARCH_COLUMNS = ("c.FirstName", "c.LastName", "c.CompanyName", "c.TaxID", "c.Email")
+    
+    @staticmethod
+    def text_search(
+        columns: tuple,
+        search_term: str,
+        match_mode: Optional[str] = None
+    ) -> tuple[str, str]:
+        """
+        Build a case-insensitive search over ``columns``
+        
+        ``prefix`` and ``exact`` compare ``UPPER(col)`` against an upper-cased
+        bind, so ``UPPER(col)`` function-based indexes can serve them;
+        ``contains`` needs a leading wildcard and always scans.
+        
+        Returns:
+            Tuple of (condition, search_term bind value)
+        """
+        match_mode = match_mode or search_classifier.default_match_mode()
+        if match_mode == "exact":
+            template, value = "UPPER({}) = :search_term", search_term.upper()
+        elif match_mode == "prefix":
+            template, value = "UPPER({}) LIKE :search_term || '%' ESCAPE '\\'", escape_like(search_term.upper())
+        elif match_mode == "contains":
+            template, value = "UPPER({}) LIKE UPPER(:search_term)", f"%{search_term}%"
+        else:
+            raise ValueError(f"Unknown match mode: {match_mode}")
+        return f"({' OR '.join(template.format(column) for column in columns)})", value
+    
+    @staticmethod
+    def order_by(order: tuple) -> str:
+        """ORDER BY list for a keyset order"""
+        return ", ".join(f"{column} DESC" if descending else column for column, descending, _ in order)
+    
+    @staticmethod
+    def seek_condition(order: tuple, values: List[Any]) -> tuple[str, Dict[str, Any]]:
+        """
+        Build a predicate selecting the rows after ``values`` in ``order``
+        
+        Expands to ``k1 after v1 OR (k1 = v1 AND k2 after v2) OR ...`` with a
+        leading range on the first key so the index on it can drive the
+        scan; each page then reads only its own rows however deep it is.
+        NULLs follow Oracle's defaults (last ascending, first descending),
+        so the text depends on which cursor values are NULL.
+        
+        Returns:
+            Tuple of (condition, parameters)
+        """
+        if len(values) != len(order):
+            raise ValueError("Cursor does not match the search order")
+        
+        parameters = {}
+        equal = []
+        branches = []
+        for position, ((column, descending, _), value) in enumerate(zip(order, values)):
+            name = f"after_{position}"
+            if value is None:
+                # NULLs sort first descending and last ascending
+                after = f"{column} IS NOT NULL" if descending else None
+                same = f"{column} IS NULL"
+            else:
+                parameters[name] = value
+                after = f"{column} {'<' if descending else '>'} :{name}"
+                if not descending:
+                    after = f"({after} OR {column} IS NULL)"
+                same = f"{column} = :{name}"
+            if after:
+                branches.append(" AND ".join(equal + [after]))
+            equal.append(same)
+        
+        condition = " OR ".join(f"({branch})" for branch in branches) or "1 = 0"
+        first_column, descending, _ = order[0]
+        if values[0] is not None:
+            leading = f"{first_column} <= :after_0" if descending else f"({first_column} >= :after_0 OR {first_column} IS NULL)"
+            condition = f"{leading} AND ({condition})"
+        return condition, parameters
+    
+    @staticmethod
+    def next_cursor(kind: str, order: tuple, row: Dict[str, Any]) -> str:
+        """Cursor continuing after ``row`` (a result of a search ordered by ``order``)"""
+        return encode_cursor(kind, [row.get(key) for _, _, key in order])
+    
+    @staticmethod
+    def union_search(
+        columns: tuple,
+        search_term: str,
+        match_mode: Optional[str] = None
+    ) -> tuple[str, str]:
+        """
+        Build a policy GUID filter with one ``UNION ALL`` branch per column
+        
+        Each branch touches a single table and column, so the optimizer can
+        use that column's (function-based) index instead of evaluating an OR
+        across the outer-joined tables. The ``IN`` semi-join removes
+        duplicate GUIDs. Unlike the OR form, a policy matched through one
+        client returns rows for all of its primary insureds.
+        
+        Returns:
+            Tuple of (condition, search_term bind value)
+        """
+        branches = []
+        value = None
+        for column in columns:
+            predicate, value = OipaQueryBuilder.text_search((column,), search_term, match_mode)
+            guid_column, source = OipaQueryBuilder.SEARCH_BRANCH_SOURCES[column.split(".", 1)[0]]
+            branches.append(f"SELECT {guid_column} FROM {source} WHERE {predicate}")
+        union = "\n                UNION ALL\n                ".join(branches)
+        return f"""p.PolicyGUID IN (
+                {union}
+            )""", value
+    
     @staticmethod
     def search_policies(
         search_term: Optional[str] = None,
         status_filter: Optional[str] = None,
-        limit: int = 50
+        limit: int = 50,
+        route: Optional[SearchRoute] = None,
+        match_mode: Optional[str] = None,
+        strategy: Optional[str] = None,
+        after: Optional[str] = None
     ) -> tuple[str, Dict[str, Any]]:
         """
         Build optimized query to search policies by various criteria
         
+        Args:
+            search_term: Policy number, GUID, tax ID or free text
+            status_filter: "active", "cancelled", "pending", "suspended" or "all"
+            limit: Maximum rows to return
+            route: Pre-computed ``search_classifier.classify(search_term)``
+            match_mode: "exact", "prefix" or "contains" for free text
+                (defaults to ``search_classifier.default_match_mode()``)
+            strategy: "or" or "union" SQL for free text (defaults to
+                SEARCH_QUERY_STRATEGY, see ``union_search()``)
+            after: Cursor from ``next_cursor("policy", POLICY_SEARCH_ORDER, row)``
+                for the last row of the previous page
+        
         Returns:
             Tuple of (query_string, parameters)
         """
         base_query = f"""
-            SELECT 
-                p.PolicyGUID as policy_guid,
-                p.PolicyNumber as policy_number,
-                p.PolicyName as policy_name,
-                p.StatusCode as status_code,
-                status_code_tbl.ShortDescription as status_name,
-                p.PlanDate as plan_date,
-                p.UpdatedGmt as updated_date,
-                c.ClientGUID as client_guid,
-                c.FirstName as client_first_name,
-                c.LastName as client_last_name,
-                c.CompanyName as company_name,
-                c.TaxID as tax_id
+            SELECT {OipaQueryBuilder.POLICY_SEARCH_SELECT}
             FROM {OipaQueryBuilder.POLICY_TABLES}
-            -- Join with AsCode table for status description
-            LEFT JOIN AsCode status_code_tbl ON status_code_tbl.CodeValue = p.StatusCode 
-                AND status_code_tbl.CodeName = 'AsCodeStatus'
         """
         
         conditions = []
         parameters = {}
         
-        # Add search term conditions with case-insensitive search
+        # Recognised keys use indexed lookups; free text falls back to a
+        # case-insensitive substring search
         if search_term:
-            search_conditions = [
-                "UPPER(p.PolicyNumber) LIKE UPPER(:search_term)",
-                "UPPER(c.FirstName) LIKE UPPER(:search_term)",
-                "UPPER(c.LastName) LIKE UPPER(:search_term)", 
-                "UPPER(c.CompanyName) LIKE UPPER(:search_term)",
-                "UPPER(c.TaxID) LIKE UPPER(:search_term)"
-            ]
-            conditions.append(f"({' OR '.join(search_conditions)})")
-            parameters['search_term'] = f"%{search_term}%"
+            route = route or search_classifier.classify(search_term)
+            if route.route == SearchClassifier.TEXT:
+                strategy = strategy or search_classifier.query_strategy
+                if strategy not in SEARCH_STRATEGIES:
+                    raise ValueError(f"Unknown search query strategy: {strategy}")
+                build = OipaQueryBuilder.union_search if strategy == "union" else OipaQueryBuilder.text_search
+                condition, parameters['search_term'] = build(
+                    OipaQueryBuilder.POLICY_SEARCH_COLUMNS, route.value, match_mode
+                )
+                conditions.append(condition)
+            elif route.route == "policy_number_prefix":
+                conditions.append(OipaQueryBuilder.SEARCH_CONDITIONS[route.route])
+                parameters['search_term'] = escape_like(route.value) + "%"
+            else:
+                conditions.append(OipaQueryBuilder.SEARCH_CONDITIONS[route.route])
+                parameters['search_term'] = route.value
         
         # Add status filter
-        if status_filter and status_filter != "all":
-            status_map = {
-                "active": "01",
-                "cancelled": "99", 
-                "pending": "08",
-                "suspended": "02"
-            }
-            if status_filter in status_map:
-                conditions.append("p.StatusCode = :status_code")
-                parameters['status_code'] = status_map[status_filter]
+        if status_filter in OipaQueryBuilder.STATUS_FILTER_CODES:
+            conditions.append("p.StatusCode = :status_code")
+            parameters['status_code'] = OipaQueryBuilder.STATUS_FILTER_CODES[status_filter]
+        
+        # Continue after the previous page's last row (keyset pagination)
+        if after:
+            condition, seek_parameters = OipaQueryBuilder.seek_condition(
+                OipaQueryBuilder.POLICY_SEARCH_ORDER, decode_cursor(after, "policy")
+            )
+            conditions.append(f"({condition})")
+            parameters.update(seek_parameters)
         
         # Build WHERE clause
         where_clause = ""
         if conditions:
             where_clause = "WHERE " + " AND ".join(conditions)
         
-        # Add ordering and limit with Oracle 12c+ syntax
+        # Add ordering and limit with Oracle 12c+ syntax; the limit is bound so
+        # the SQL text (and its cached statement) is the same for every limit
         query = f"""
             {base_query}
             {where_clause}
-            ORDER BY p.UpdatedGmt DESC
-            FETCH FIRST {limit} ROWS ONLY
+            ORDER BY {OipaQueryBuilder.order_by(OipaQueryBuilder.POLICY_SEARCH_ORDER)}
+            FETCH FIRST :row_limit ROWS ONLY
+        """
+        parameters['row_limit'] = limit
+        
+        return query, parameters
+    
+    @staticmethod
+    def search_policies_by_keys(
+        search_term: str,
+        status_filter: Optional[str] = None
+    ) -> tuple[str, Dict[str, Any]]:
+        """
+        Build a ``fetch_by_keys()`` shape for substring-search candidates by policy GUID
+        
+        Used with GUIDs from ``policy_search_index``; the substring condition
+        is re-checked so index entries that are out of date never match.
+        
+        Returns:
+            Tuple of (query_shape, parameters)
         """
+        condition, search_value = OipaQueryBuilder.text_search(
+            OipaQueryBuilder.POLICY_SEARCH_COLUMNS, search_term, "contains"
+        )
+        parameters = {'search_term': search_value}
+        conditions = [condition]
+        if status_filter in OipaQueryBuilder.STATUS_FILTER_CODES:
+            conditions.append("p.StatusCode = :status_code")
+            parameters['status_code'] = OipaQueryBuilder.STATUS_FILTER_CODES[status_filter]
         
+        query = f"""
+            SELECT k.key_value as lookup_key, {OipaQueryBuilder.POLICY_SEARCH_SELECT}
+            FROM {OipaQueryBuilder.POLICY_TABLES}
+            JOIN {KEYS_PLACEHOLDER} k ON k.key_value = p.PolicyGUID
+            WHERE {" AND ".join(conditions)}
+        """
         return query, parameters
+    
+    @staticmethod
+    def policy_status_rows(since: Optional[datetime] = None) -> tuple[str, Dict[str, Any]]:
+        """
+        Build query for the statuses counted by ``policy_status_counts``
+        
+        Args:
+            since: Only policies with a newer UpdatedGmt (all policies when None)
+        
+        Returns:
+            Tuple of (query_string, parameters)
+        """
+        query = """
+            SELECT p.PolicyGUID, p.StatusCode, p.UpdatedGmt
+            FROM AsPolicy p
+        """
+        if since is None:
+            return query, {}
+        query += """
+            WHERE p.UpdatedGmt > :since
+        """
+        return query, {"since": since}
+    
+    @staticmethod
+    def policy_search_documents(since: Optional[datetime] = None) -> tuple[str, Dict[str, Any]]:
+        """
+        Build query for the text indexed by ``policy_search_index``
+        
+        Args:
+            since: Only policies whose row, primary-insured role or client
+                changed after this UpdatedGmt (all policies when None)
+        
+        Returns:
+            Tuple of (query_string, parameters)
+        """
+        query = f"""
+            SELECT p.PolicyGUID, p.UpdatedGmt, p.PolicyNumber,
+                c.FirstName, c.LastName, c.CompanyName, c.TaxID,
+                GREATEST(
+                    p.UpdatedGmt, NVL(r.UpdatedGmt, p.UpdatedGmt), NVL(c.UpdatedGmt, p.UpdatedGmt)
+                ) as changed_gmt
+            FROM {OipaQueryBuilder.POLICY_TABLES}
+        """
+        if since is None:
+            return query, {}
+        
+        # Every client row of a changed policy is needed to rebuild its text;
+        # a reassigned primary insured shows up as a newer AsRole row
+        query += """
+            WHERE p.PolicyGUID IN (
+                SELECT PolicyGUID FROM AsPolicy WHERE UpdatedGmt > :since
+                UNION
+                SELECT PolicyGUID FROM AsRole WHERE RoleCode = '01' AND UpdatedGmt > :since
+                UNION
+                SELECT r2.PolicyGUID FROM AsRole r2
+                JOIN AsClient c2 ON c2.ClientGUID = r2.ClientGUID
+                WHERE r2.RoleCode = '01' AND c2.UpdatedGmt > :since
+            )
+        """
+        return query, {"since": since}
+    
     @staticmethod
     def get_policy_details(
         policy_guid: Optional[str] = None,
@@ -434,37 +3703,8 @@ class OipaQueryBuilder:
             raise ValueError("Either policy_guid or policy_number must be provided")
         
         query = f"""
-            SELECT 
-                p.PolicyGUID as policy_guid,
-                p.PolicyNumber as policy_number,
-                p.PolicyName as policy_name,
-                p.StatusCode as status_code,
-                status_code_tbl.ShortDescription as status_name,
-                status_code_tbl.LongDescription as status_description,
-                p.PlanDate as plan_date,
-                p.IssueStateCode as issue_state_code,
-                state_code_tbl.ShortDescription as issue_state_name,
-                state_code_tbl.LongDescription as issue_state_description,
-                p.CreationDate as creation_date,
-                p.UpdatedGmt as updated_date,
-                -- Client information (primary insured)
-                c.ClientGUID as client_guid,
-                c.FirstName as client_first_name,
-                c.LastName as client_last_name,
-                c.CompanyName as company_name,
-                c.TaxID as tax_id,
-                c.DateOfBirth as date_of_birth,
-                c.Sex as gender,
-                -- Plan information
-                pl.PlanGUID as plan_guid,
-                pl.PlanName as plan_name
-            FROM {OipaQueryBuilder.POLICY_PLAN_TABLES}
-            -- Join with AsCode table for status description
-            LEFT JOIN AsCode status_code_tbl ON status_code_tbl.CodeValue = p.StatusCode 
-                AND status_code_tbl.CodeName = 'AsCodeStatus'
-            -- Join with AsCode table for state description  
-            LEFT JOIN AsCode state_code_tbl ON state_code_tbl.CodeValue = p.IssueStateCode
-                AND state_code_tbl.CodeName = 'AsCodeState'
+            SELECT {OipaQueryBuilder.POLICY_DETAIL_COLUMNS}
+            FROM {OipaQueryBuilder.POLICY_DETAIL_TABLES}
         """
         
         parameters = {}
@@ -477,6 +3717,79 @@ class OipaQueryBuilder:
             parameters['policy_number'] = policy_number
         
         return query, parameters
+    
+    @staticmethod
+    def get_policy_details_by_keys(key_column: str = "policy_number") -> str:
+        """
+        Build a ``fetch_by_keys()`` shape for policy details by number or GUID
+        """
+        column = OipaQueryBuilder._policy_key_column(key_column, "p")
+        return f"""
+            SELECT k.key_value as lookup_key, {OipaQueryBuilder.POLICY_DETAIL_COLUMNS}
+            FROM {OipaQueryBuilder.POLICY_DETAIL_TABLES}
+            JOIN {KEYS_PLACEHOLDER} k ON k.key_value = {column}
+        """
+    
+    @staticmethod
+    def get_policy_roles(
+        policy_guid: Optional[str] = None,
+        policy_number: Optional[str] = None
+    ) -> tuple[str, Dict[str, Any]]:
+        """
+        Build query to get all roles for a policy with client and role type details
+        
+        Accepts the policy number as well as the GUID so the roles can be
+        fetched in the same pipeline as the policy details.
+        """
+        if not policy_guid and not policy_number:
+            raise ValueError("Either policy_guid or policy_number must be provided")
+        
+        query = f"""
+            SELECT {OipaQueryBuilder.ROLE_COLUMNS}
+            FROM AsRole r
+            {OipaQueryBuilder.ROLE_JOINS}
+        """
+        
+        parameters = {}
+        
+        if policy_guid:
+            query += " WHERE r.PolicyGUID = :policy_guid"
+            parameters['policy_guid'] = policy_guid
+        else:
+            query += " WHERE r.PolicyGUID IN (SELECT PolicyGUID FROM AsPolicy WHERE PolicyNumber = :policy_number)"
+            parameters['policy_number'] = policy_number
+        
+        query += " ORDER BY r.RoleCode"
+        
+        return query, parameters
+    
+    @staticmethod
+    def get_policy_roles_by_keys(key_column: str = "policy_guid") -> str:
+        """
+        Build a ``fetch_by_keys()`` shape for the roles of many policies
+        """
+        if key_column == "policy_guid":
+            key_join = f"JOIN {KEYS_PLACEHOLDER} k ON k.key_value = r.PolicyGUID"
+        else:
+            column = OipaQueryBuilder._policy_key_column(key_column, "p")
+            key_join = f"""JOIN AsPolicy p ON p.PolicyGUID = r.PolicyGUID
+            JOIN {KEYS_PLACEHOLDER} k ON k.key_value = {column}"""
+        return f"""
+            SELECT k.key_value as lookup_key, {OipaQueryBuilder.ROLE_COLUMNS}
+            FROM AsRole r
+            {OipaQueryBuilder.ROLE_JOINS}
+            {key_join}
+            ORDER BY k.key_value, r.RoleCode
+        """
+    
+    @staticmethod
+    def _policy_key_column(key_column: str, alias: str) -> str:
+        """Map a lookup key name to the AsPolicy column it matches"""
+        columns = {"policy_guid": "PolicyGUID", "policy_number": "PolicyNumber"}
+        if key_column not in columns:
+            raise ValueError(f"Unsupported policy key column: {key_column!r}")
+        return f"{alias}.{columns[key_column]}"
+    
     @staticmethod
     def get_client_portfolio(client_guid: str) -> tuple[str, Dict[str, Any]]:
         """
@@ -504,20 +3817,35 @@ class OipaQueryBuilder:
         return query, parameters
     
     @staticmethod
-    def count_policies_by_status() -> tuple[str, Dict[str, Any]]:
+    def count_policies_by_status(summary_view: Optional[str] = None) -> tuple[str, Dict[str, Any]]:
         """
-        Build optimized query to count policies by status including status names
+        Build optimized query to count policies by status
+        
+        Status names come from ``code_dictionary``.
+        
+        Args:
+            summary_view: Summary object from ``summary_views.source()`` to
+                sum instead of scanning AsPolicy
+        """
+        if summary_view:
+            query = f"""
+            SELECT 
+                s.StatusCode as status_code,
+                SUM(s.PolicyCount) as policy_count,
+                ROUND(SUM(s.PolicyCount) * 100.0 / SUM(SUM(s.PolicyCount)) OVER(), 2) as percentage
+            FROM {summary_view} s
+            GROUP BY s.StatusCode
+            ORDER BY policy_count DESC
         """
+            return query, {}
+        
         query = """
             SELECT 
                 p.StatusCode as status_code,
-                status_code_tbl.ShortDescription as status_name,
                 COUNT(*) as policy_count,
                 ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER(), 2) as percentage
             FROM AsPolicy p
-            LEFT JOIN AsCode status_code_tbl ON status_code_tbl.CodeValue = p.StatusCode 
-                AND status_code_tbl.CodeName = 'AsCodeStatus'
-            GROUP BY p.StatusCode, status_code_tbl.ShortDescription
+            GROUP BY p.StatusCode
             ORDER BY policy_count DESC
         """
         
@@ -527,22 +3855,19 @@ class OipaQueryBuilder:
     def search_clients(
         search_term: Optional[str] = None,
         client_type: Optional[str] = None,
-        limit: int = 50
+        limit: int = 50,
+        match_mode: Optional[str] = None,
+        after: Optional[str] = None
     ) -> tuple[str, Dict[str, Any]]:
         """
         Build query to search clients
+        
+        ``match_mode`` is "exact", "prefix" or "contains" (see ``text_search()``).
+        ``after`` is a ``next_cursor("client", CLIENT_SEARCH_ORDER, row)``
+        cursor for the last row of the previous page.
         """
-        base_query = """
-            SELECT 
-                c.ClientGUID as client_guid,
-                c.FirstName as first_name,
-                c.LastName as last_name,
-                c.CompanyName as company_name,
-                c.TaxID as tax_id,
-                c.TypeCode as type_code,
-                c.DateOfBirth as date_of_birth,
-                c.Email as email,
-                c.StatusCode as status_code
+        base_query = f"""
+            SELECT {OipaQueryBuilder.CLIENT_COLUMNS}
             FROM AsClient c
         """
         
@@ -550,20 +3875,22 @@ class OipaQueryBuilder:
         parameters = {}
         
         if search_term:
-            search_conditions = [
-                "UPPER(c.FirstName) LIKE UPPER(:search_term)",
-                "UPPER(c.LastName) LIKE UPPER(:search_term)",
-                "UPPER(c.CompanyName) LIKE UPPER(:search_term)",
-                "UPPER(c.TaxID) LIKE UPPER(:search_term)",
-                "UPPER(c.Email) LIKE UPPER(:search_term)"
-            ]
-            conditions.append(f"({' OR '.join(search_conditions)})")
-            parameters['search_term'] = f"%{search_term}%"
+            condition, parameters['search_term'] = OipaQueryBuilder.text_search(
+                OipaQueryBuilder.CLIENT_SEARCH_COLUMNS, search_term, match_mode
+            )
+            conditions.append(condition)
         
         if client_type:
             conditions.append("c.TypeCode = :client_type")
             parameters['client_type'] = client_type
         
+        if after:
+            condition, seek_parameters = OipaQueryBuilder.seek_condition(
+                OipaQueryBuilder.CLIENT_SEARCH_ORDER, decode_cursor(after, "client")
+            )
+            conditions.append(f"({condition})")
+            parameters.update(seek_parameters)
+        
         where_clause = ""
         if conditions:
             where_clause = "WHERE " + " AND ".join(conditions)
@@ -571,12 +3898,66 @@ class OipaQueryBuilder:
         query = f"""
             {base_query}
             {where_clause}
-            ORDER BY c.LastName, c.FirstName, c.CompanyName
-            FETCH FIRST {limit} ROWS ONLY
+            ORDER BY {OipaQueryBuilder.order_by(OipaQueryBuilder.CLIENT_SEARCH_ORDER)}
+            FETCH FIRST :row_limit ROWS ONLY
         """
+        parameters['row_limit'] = limit
         
         return query, parameters
+    
+    @staticmethod
+    def get_clients_by_keys() -> str:
+        """
+        Build a ``fetch_by_keys()`` shape for clients by GUID
+        """
+        return f"""
+            SELECT k.key_value as lookup_key, {OipaQueryBuilder.CLIENT_COLUMNS}
+            FROM AsClient c
+            JOIN {KEYS_PLACEHOLDER} k ON k.key_value = c.ClientGUID
+        """
 
 
 # Global database instance
 oipa_db = OipaDatabase(Config())
+
+# Global search-term classifier used by OipaQueryBuilder.search_policies
+search_classifier = SearchClassifier.from_config(oipa_db.config.performance)
+
+# Global trigram index for substring searches (loaded when SEARCH_INDEX_ENABLED=true)
+policy_search_index = PolicySearchIndex(
+    oipa_db,
+    interval=oipa_db.config.performance.search_index_refresh_interval,
+    max_candidates=oipa_db.config.performance.search_index_max_candidates,
+    reconcile_interval=oipa_db.config.performance.search_index_reconcile_interval
+)
+
+# Global AsCode dictionary used to decode status, state and role codes
+code_dictionary = CodeDictionary(oipa_db, interval=oipa_db.config.performance.code_refresh_interval)
+
+# Global in-process policy counts by status (maintained when STATUS_COUNTS_ENABLED=true)
+policy_status_counts = PolicyStatusCounts(
+    oipa_db,
+    interval=oipa_db.config.performance.status_counts_refresh_interval,
+    reconcile_interval=oipa_db.config.performance.status_counts_reconcile_interval
+)
+
+# Global summary-object routing for dashboard aggregates (SUMMARY_POLICY_COUNTS_VIEW)
+summary_views = SummaryViews(
+    oipa_db,
+    name=oipa_db.config.performance.summary_policy_counts_view,
+    max_staleness=oipa_db.config.performance.summary_max_staleness
+)
+
+# Start the global components with the global pool; detection and the code
+# dictionary load run first so searches and decoded tool output are ready
+# when the background refreshers begin
+if search_classifier.match_mode not in MATCH_MODES:
+    oipa_db.register_component(oipa_db.detect_search_indexes)
+oipa_db.register_component(code_dictionary.refresh)
+oipa_db.register_component(code_dictionary.start, code_dictionary.stop)
+if summary_views.name:
+    oipa_db.register_component(summary_views.detect)
+if oipa_db.config.performance.status_counts_enabled:
+    oipa_db.register_component(policy_status_counts.start, policy_status_counts.stop)
+if oipa_db.config.performance.search_index_enabled:
+    oipa_db.register_component(policy_search_index.start, policy_search_index.stop)
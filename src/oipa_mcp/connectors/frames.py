@@ -0,0 +1,74 @@
+"""
+Columnar (Arrow) results for OIPA analytics queries
+
+Analytics and dashboard queries aggregate over large result sets, where
+building a Python object per row dominates the cost. These helpers turn
+query results into ``pyarrow.Table`` batches that can be aggregated with
+``pyarrow.compute`` or handed to pandas without per-row objects.
+
+python-oracledb 3.0+ fetches straight into Arrow-compatible data frames
+(``fetch_df_batches``). Older drivers fall back to ``fetchmany`` batches
+converted column-wise, which still avoids per-row dicts.
+
+pyarrow is imported lazily so the rest of the connector works without it.
+"""
+
+from typing import Any, Dict, List, Sequence
+
+from .rows import column_names
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - depends on the environment
+    pa = None
+
+
+def arrow_available() -> bool:
+    """Whether pyarrow is installed (the ``analytics`` extra)"""
+    return pa is not None
+
+
+def require_arrow() -> Any:
+    """Return the pyarrow module or raise a helpful ImportError"""
+    if pa is None:
+        raise ImportError("pyarrow is required for Arrow/DataFrame fetches: pip install pyarrow")
+    return pa
+
+
+def driver_supports_dataframes(connection: Any) -> bool:
+    """Check whether the driver connection can fetch directly into data frames"""
+    return hasattr(connection, "fetch_df_batches")
+
+
+def oracle_frame_to_arrow(frame: Any) -> Any:
+    """
+    Convert a python-oracledb DataFrame into a ``pyarrow.Table``
+
+    Column names are lower-cased to match the dict row path.
+    """
+    arrow = require_arrow()
+    if hasattr(frame, "__arrow_c_stream__"):
+        table = arrow.table(frame)
+    else:
+        # python-oracledb 3.0 only exposes per-column Arrow arrays
+        table = arrow.Table.from_arrays(
+            [arrow.array(column) for column in frame.column_arrays()],
+            names=frame.column_names()
+        )
+    return table.rename_columns(list(column_names(tuple(table.column_names))))
+
+
+def columns_to_arrow(columns: Sequence[str], batch: Dict[str, List[Any]]) -> Any:
+    """Convert a column batch (see ``rows.convert_rows``) into a ``pyarrow.Table``"""
+    arrow = require_arrow()
+    return arrow.table({column: batch[column] for column in columns})
+
+
+def concat_tables(tables: List[Any], columns: Sequence[str] = ()) -> Any:
+    """Concatenate Arrow batches, returning an empty table when there are none"""
+    arrow = require_arrow()
+    if not tables:
+        return arrow.table({column: [] for column in columns})
+    if len(tables) == 1:
+        return tables[0]
+    return arrow.concat_tables(tables, promote_options="permissive")
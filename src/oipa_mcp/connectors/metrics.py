@@ -0,0 +1,253 @@
+"""
+Hot-path latency histograms for OIPA tool calls
+
+Every database call and tool execution is broken into phases and timed:
+
+- "acquire": waiting for a pooled connection
+- "execute": ``cursor.execute`` / pipeline round trip
+- "fetch":   ``fetchall`` / each ``fetchmany`` batch
+- "convert": turning driver rows into the requested row shape
+- "format":  ``BaseTool._format_response``
+- "tool":    the whole ``BaseTool.execute`` call
+
+Samples land in fixed log-scale buckets (HDR-style, about 6% relative
+error from 10us to 100s), so recording is a couple of arithmetic operations
+and a list increment with no per-sample allocation. Series are labeled by
+phase, tool name and query shape (see ``database.query_shape``).
+"""
+
+import json
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..config import config
+
+PHASES = ("acquire", "execute", "fetch", "convert", "format", "tool")
+
+# Label used when a sample is not tied to a tool or a statement
+UNLABELED = "-"
+
+_current_tool: ContextVar[str] = ContextVar("oipa_current_tool", default=UNLABELED)
+
+
+class LatencyHistogram:
+    """Fixed log-bucket latency histogram"""
+
+    MIN_SECONDS = 1e-5
+    BUCKETS_PER_DECADE = 40
+    DECADES = 7
+    # Bucket 0 holds samples <= MIN_SECONDS, the last one everything >= 100s
+    BUCKET_COUNT = BUCKETS_PER_DECADE * DECADES + 2
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    @classmethod
+    def bucket_index(cls, seconds: float) -> int:
+        if seconds <= cls.MIN_SECONDS:
+            return 0
+        index = int(math.log10(seconds / cls.MIN_SECONDS) * cls.BUCKETS_PER_DECADE) + 1
+        return min(index, cls.BUCKET_COUNT - 1)
+
+    @classmethod
+    def bucket_upper_bound(cls, index: int) -> float:
+        return cls.MIN_SECONDS * 10 ** (index / cls.BUCKETS_PER_DECADE)
+
+    def record(self, seconds: float) -> None:
+        self.counts[self.bucket_index(seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add another histogram's samples to this one"""
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, quantile: float) -> float:
+        """Latency in seconds at ``quantile`` (0-1), accurate to one bucket"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(quantile * self.count))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(max(self.bucket_upper_bound(index), self.min), self.max)
+        return self.max
+
+    def get_status(self) -> Dict[str, Any]:
+        """Summary statistics in milliseconds"""
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3),
+            "min_ms": round(self.min * 1000, 3),
+            "p50_ms": round(self.percentile(0.50) * 1000, 3),
+            "p90_ms": round(self.percentile(0.90) * 1000, 3),
+            "p99_ms": round(self.percentile(0.99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3)
+        }
+
+    def bucket_counts(self) -> Dict[str, int]:
+        """Non-empty buckets keyed by their upper bound in milliseconds"""
+        return {
+            f"{self.bucket_upper_bound(index) * 1000:.6g}": count
+            for index, count in enumerate(self.counts) if count
+        }
+
+
+class LatencyRecorder:
+    """
+    Registry of latency histograms keyed by (phase, tool, query shape)
+
+    The tool label comes from the ``tool()`` context, so database code only
+    has to pass the query shape. Once ``max_series`` label combinations
+    exist, new query shapes are folded into an "other" series per phase and
+    tool so memory stays bounded.
+    """
+
+    OVERFLOW_SHAPE = "other"
+
+    def __init__(self, enabled: bool = True, max_series: int = 2000):
+        self.enabled = enabled
+        self.max_series = max_series
+        self.started_at = time.time()
+        self._series: Dict[Tuple[str, str, str], LatencyHistogram] = {}
+
+    def record(self, phase: str, seconds: float, shape: str = UNLABELED, tool: Optional[str] = None) -> None:
+        """Record one sample for ``phase``"""
+        if not self.enabled:
+            return
+        key = (phase, tool or _current_tool.get(), shape)
+        histogram = self._series.get(key)
+        if histogram is None:
+            if len(self._series) >= self.max_series:
+                key = (phase, key[1], self.OVERFLOW_SHAPE)
+                histogram = self._series.get(key)
+            if histogram is None:
+                histogram = self._series[key] = LatencyHistogram()
+        histogram.record(seconds)
+
+    @contextmanager
+    def time(self, phase: str, shape: str = UNLABELED) -> Iterator[None]:
+        """Time the enclosed block as one ``phase`` sample"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - started, shape)
+
+    @contextmanager
+    def tool(self, name: str) -> Iterator[None]:
+        """Label samples in the enclosed block with ``name`` and time it as a "tool" sample"""
+        token = _current_tool.set(name)
+        try:
+            with self.time("tool"):
+                yield
+        finally:
+            _current_tool.reset(token)
+
+    def _select(
+        self,
+        phase: Optional[str] = None,
+        tool: Optional[str] = None,
+        shape: Optional[str] = None
+    ) -> List[Tuple[Tuple[str, str, str], LatencyHistogram]]:
+        return [
+            (key, histogram) for key, histogram in self._series.items()
+            if (phase is None or key[0] == phase)
+            and (tool is None or key[1] == tool)
+            and (shape is None or key[2] == shape)
+        ]
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-phase statistics across all tools and query shapes"""
+        merged: Dict[str, LatencyHistogram] = {}
+        for (phase, _, _), histogram in self._series.items():
+            merged.setdefault(phase, LatencyHistogram()).merge(histogram)
+        return {
+            phase: merged[phase].get_status()
+            for phase in sorted(merged, key=lambda p: PHASES.index(p) if p in PHASES else len(PHASES))
+        }
+
+    def snapshot(
+        self,
+        phase: Optional[str] = None,
+        tool: Optional[str] = None,
+        shape: Optional[str] = None,
+        include_buckets: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Statistics for every matching series, slowest p99 first
+
+        Args:
+            phase: Only include this phase
+            tool: Only include this tool name
+            shape: Only include this query shape
+            include_buckets: Add the raw bucket counts (for offline merging)
+        """
+        series = []
+        for (series_phase, series_tool, series_shape), histogram in self._select(phase, tool, shape):
+            entry = {"phase": series_phase, "tool": series_tool, "shape": series_shape}
+            entry.update(histogram.get_status())
+            if include_buckets:
+                entry["buckets_ms"] = histogram.bucket_counts()
+            series.append(entry)
+        series.sort(key=lambda entry: entry.get("p99_ms", 0), reverse=True)
+        return series
+
+    def dump(self, path: str) -> int:
+        """
+        Write all series, including bucket counts, to ``path`` as JSON
+
+        Returns:
+            Number of series written
+        """
+        series = self.snapshot(include_buckets=True)
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump({
+                "started_at": self.started_at,
+                "dumped_at": time.time(),
+                "summary": self.summary(),
+                "series": series
+            }, handle, indent=2)
+        return len(series)
+
+    def reset(self) -> None:
+        """Drop all recorded samples"""
+        self._series.clear()
+        self.started_at = time.time()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get recorder counters and per-phase statistics for monitoring"""
+        return {
+            "enabled": self.enabled,
+            "series": len(self._series),
+            "phases": self.summary()
+        }
+
+
+# Global recorder shared by the database connector and the tools
+latency_metrics = LatencyRecorder(enabled=config.features.enable_monitoring)
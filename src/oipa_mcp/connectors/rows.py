@@ -0,0 +1,155 @@
+"""
+Row shapes for OIPA query results
+
+The default dict-per-row shape is convenient but allocates a fresh dict for
+every row. Wide joins (policy details, roles) can use lighter shapes:
+
+- "dict":    list of dictionaries (default, backward compatible)
+- "tuple":   list of raw driver tuples, columns available separately
+- "record":  list of generated ``__slots__`` record objects, one class per
+             query shape, supporting both attribute and ``record["col"]`` access
+- "columns": dict of column name -> list of values (column-oriented batch)
+"""
+
+import keyword
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+ROW_FORMATS = ("dict", "tuple", "record", "columns")
+
+
+@lru_cache(maxsize=256)
+def column_names(raw_names: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Lower-case cursor column names, cached per query shape"""
+    return tuple(name.lower() for name in raw_names)
+
+
+def description_columns(description: Sequence[Sequence[Any]]) -> Tuple[str, ...]:
+    """Get lower-case column names from a cursor description"""
+    return column_names(tuple(col[0] for col in description))
+
+
+class RecordBase:
+    """
+    Base class for generated row records
+
+    Generated subclasses define ``__slots__`` for the query's columns, so a
+    record costs one small object per row instead of a dict. Mapping-style
+    access (``record["policy_number"]``, ``record.get(...)``) is kept so
+    existing formatting code works unchanged.
+    """
+
+    __slots__ = ()
+    _columns: Tuple[str, ...] = ()
+    _slot_for: Dict[str, str] = {}
+
+    def __getitem__(self, column: str) -> Any:
+        try:
+            return getattr(self, self._slot_for[column])
+        except KeyError:
+            raise KeyError(column) from None
+
+    def __contains__(self, column: object) -> bool:
+        return column in self._slot_for
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, RecordBase):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def get(self, column: str, default: Any = None) -> Any:
+        slot = self._slot_for.get(column)
+        return getattr(self, slot) if slot is not None else default
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._columns
+
+    def values(self) -> List[Any]:
+        return [getattr(self, slot) for slot in self._slot_for.values()]
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return list(zip(self._columns, self.values()))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+
+_RESERVED = frozenset(dir(RecordBase))
+
+
+def _slot_name(column: str, index: int) -> str:
+    """Turn a column name into a usable attribute name"""
+    name = column if column.isidentifier() else f"col_{index}"
+    if keyword.iskeyword(name) or name in _RESERVED or name.startswith("_"):
+        name = f"{name}_"
+    return name
+
+
+@lru_cache(maxsize=256)
+def record_class(columns: Tuple[str, ...]) -> type:
+    """
+    Get the ``__slots__`` record class for a query shape
+
+    Classes are generated once per distinct column tuple and cached, so
+    repeated calls of the same query reuse the same class.
+    """
+    slots = []
+    for index, column in enumerate(columns):
+        slot = _slot_name(column, index)
+        while slot in slots:
+            slot = f"{slot}_"
+        slots.append(slot)
+
+    # Generate a positional __init__ (like namedtuple) to avoid a setattr loop per row
+    args = ", ".join(slots)
+    body = "\n".join(f"    self.{slot} = {slot}" for slot in slots) or "    pass"
+    namespace: Dict[str, Any] = {}
+    exec(f"def __init__(self, {args}):\n{body}", namespace)
+
+    return type(
+        "OipaRecord",
+        (RecordBase,),
+        {
+            "__slots__": tuple(slots),
+            "__init__": namespace["__init__"],
+            "_columns": columns,
+            "_slot_for": dict(zip(columns, slots))
+        }
+    )
+
+
+def convert_rows(columns: Tuple[str, ...], rows: List[Tuple[Any, ...]], row_format: str = "dict") -> Any:
+    """
+    Convert fetched driver tuples into the requested row format
+
+    Args:
+        columns: Lower-case column names
+        rows: Rows as returned by fetchall()/fetchmany()
+        row_format: One of ROW_FORMATS
+
+    Returns:
+        A list of rows, or a dict of column lists for "columns"
+    """
+    if row_format == "dict":
+        return [dict(zip(columns, row)) for row in rows]
+    if row_format == "tuple":
+        return rows
+    if row_format == "record":
+        cls = record_class(columns)
+        return [cls(*row) for row in rows]
+    if row_format == "columns":
+        if not rows:
+            return {column: [] for column in columns}
+        return {column: list(values) for column, values in zip(columns, zip(*rows))}
+    raise ValueError(f"Unknown row format: {row_format!r} (expected one of {', '.join(ROW_FORMATS)})")
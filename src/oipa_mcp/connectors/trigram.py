@@ -0,0 +1,172 @@
+"""
+In-memory trigram index for substring search
+
+Documents are short lists of text fields (policy number, client names, tax
+ID) keyed by an external id (the policy GUID). Every distinct three-character
+substring of an upper-cased field maps to a posting list of integer document
+ids held in an ``array('I')``, so the index costs 4 bytes per (trigram,
+document) pair instead of a Python object per entry.
+
+A substring query intersects the postings of its trigrams, smallest first,
+and verifies the survivors against the stored text. Updated documents get a
+new id and the old one is tombstoned; postings are compacted once dead ids
+outnumber live ones.
+"""
+
+import sys
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence
+
+# Separates fields in the stored text so a match cannot span two fields
+FIELD_SEPARATOR = "\n"
+
+
+def trigrams(text: str) -> set:
+    """Distinct trigrams of ``text`` (already upper-cased)"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """Trigram inverted index with integer postings and ordering by a timestamp"""
+
+    def __init__(self):
+        self._postings: Dict[str, array] = {}
+        self._keys: List[Optional[str]] = []
+        self._texts: List[Optional[str]] = []
+        # Sort key per document (e.g. UpdatedGmt as epoch seconds), newest first in results
+        self._stamps = array("d")
+        self._ids: Dict[str, int] = {}
+        self.dead = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def keys(self) -> List[str]:
+        """Keys of all live documents"""
+        return list(self._ids)
+
+    def add(self, key: str, fields: Iterable[Optional[str]], stamp: float = 0.0) -> bool:
+        """Add or replace the document for ``key``; returns whether its text changed"""
+        values = [str(value).upper() for value in fields if value]
+        old_id = self._ids.get(key)
+        if old_id is not None:
+            if self._texts[old_id] == FIELD_SEPARATOR.join(values):
+                self._stamps[old_id] = stamp
+                return False
+            self._remove_id(old_id)
+
+        doc_id = len(self._texts)
+        self._keys.append(key)
+        self._texts.append(FIELD_SEPARATOR.join(values))
+        self._stamps.append(stamp)
+        self._ids[key] = doc_id
+
+        grams = set()
+        for value in values:
+            grams |= trigrams(value)
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                posting = self._postings[gram] = array("I")
+            posting.append(doc_id)
+
+        if self.dead > len(self._ids):
+            self.compact()
+        return True
+
+    def remove(self, key: str) -> bool:
+        """Drop the document for ``key``; returns whether it existed"""
+        doc_id = self._ids.get(key)
+        if doc_id is None:
+            return False
+        self._remove_id(doc_id)
+        return True
+
+    def _remove_id(self, doc_id: int) -> None:
+        del self._ids[self._keys[doc_id]]
+        self._keys[doc_id] = None
+        self._texts[doc_id] = None
+        self.dead += 1
+
+    def search(self, term: str, limit: Optional[int] = None) -> Optional[List[str]]:
+        """
+        Keys of documents with a field containing ``term``, newest first
+
+        Returns:
+            Matching keys (at most ``limit``), or None when ``term`` is
+            shorter than three characters and cannot use the index
+        """
+        term = term.upper()
+        grams = trigrams(term)
+        if not grams:
+            return None
+
+        postings: List[Sequence[int]] = []
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if not posting:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return []
+
+        texts = self._texts
+        matches = [doc_id for doc_id in candidates if texts[doc_id] is not None and term in texts[doc_id]]
+        matches.sort(key=self._stamps.__getitem__, reverse=True)
+        if limit is not None:
+            matches = matches[:limit]
+        return [self._keys[doc_id] for doc_id in matches]
+
+    def compact(self) -> None:
+        """Rebuild postings without tombstoned documents"""
+        live = [
+            (key, text, stamp)
+            for key, text, stamp in zip(self._keys, self._texts, self._stamps)
+            if key is not None
+        ]
+        self.clear()
+        for key, text, stamp in live:
+            self.add(key, text.split(FIELD_SEPARATOR), stamp)
+
+    def clear(self) -> None:
+        self._postings = {}
+        self._keys = []
+        self._texts = []
+        self._stamps = array("d")
+        self._ids = {}
+        self.dead = 0
+
+    def memory_bytes(self) -> Dict[str, int]:
+        """Approximate memory use by structure"""
+        postings = sum(posting.buffer_info()[1] * posting.itemsize for posting in self._postings.values())
+        # Dict entry plus trigram string and array header per posting list
+        postings_overhead = sys.getsizeof(self._postings) + len(self._postings) * (
+            sys.getsizeof("abc") + sys.getsizeof(array("I"))
+        )
+        documents = (
+            sys.getsizeof(self._keys) + sys.getsizeof(self._texts) + sys.getsizeof(self._ids)
+            + self._stamps.buffer_info()[1] * self._stamps.itemsize
+            + sum(sys.getsizeof(text) for text in self._texts if text is not None)
+            + sum(sys.getsizeof(key) for key in self._ids)
+        )
+        return {
+            "postings": postings,
+            "postings_overhead": postings_overhead,
+            "documents": documents,
+            "total": postings + postings_overhead + documents
+        }
+
+    def get_status(self) -> Dict[str, int]:
+        """Get index size counters for monitoring"""
+        return {
+            "documents": len(self._ids),
+            "tombstones": self.dead,
+            "trigrams": len(self._postings),
+            "postings": sum(len(posting) for posting in self._postings.values()),
+            "memory_bytes": self.memory_bytes()["total"]
+        }
@@ -15,7 +15,7 @@ from mcp.server.stdio import stdio_server
 from mcp.types import Tool as MCPTool
 
 from .config import config
-from .connectors import oipa_db
+from .connectors import oipa_db, query_deadline
 from .tools import AVAILABLE_TOOLS
 
 
@@ -26,6 +26,9 @@ class OipaMCPServer:
     Manages the MCP server lifecycle, tool registration, and request handling.
     """
     
+    # Extra seconds a tool call may run past its query deadline before it is cancelled
+    CALL_TIMEOUT_GRACE = 5
+    
     def __init__(self):
         self.server = Server(config.mcp_server.name)
         self.tools = AVAILABLE_TOOLS
@@ -108,8 +111,20 @@ class OipaMCPServer:
                     logger.error(error_msg)
                     return [{"type": "text", "text": f"Error: {error_msg}"}]
                 
-                # Execute the tool
-                result = await tool.execute(arguments)
+                # Execute the tool; database calls share the tool's deadline and
+                # the whole call is cancelled (sending a break to the server) if
+                # it overruns it
+                timeout = tool.get_timeout()
+                with query_deadline(timeout):
+                    try:
+                        result = await asyncio.wait_for(
+                            tool.execute(arguments),
+                            timeout=timeout + self.CALL_TIMEOUT_GRACE
+                        )
+                    except asyncio.TimeoutError:
+                        error_msg = f"Tool '{name}' timed out after {timeout:g}s"
+                        logger.error(error_msg)
+                        return [{"type": "text", "text": f"Error: {error_msg}"}]
                 
                 # Format response for MCP
                 if isinstance(result, dict) and result.get("success") is False:
@@ -9,7 +9,11 @@ from typing import Any, Dict, List, Optional, Union
 from pydantic import BaseModel, ValidationError
 from loguru import logger
 
-from ..connectors import oipa_db
+from ..connectors import (
+    QueryTimeoutError, collect_truncations, latency_metrics, oipa_db, query_deadline,
+    replica_reads, truncation_notes
+)
+from ..connectors.frames import arrow_available
 from ..config import config
 
 
@@ -41,6 +45,13 @@ class BaseTool(ABC):
     database access, and response formatting.
     """
     
+    # Seconds allowed for the tool's database work; None uses QUERY_TIMEOUT.
+    # TOOL_TIMEOUTS entries take precedence over both.
+    timeout: Optional[float] = None
+    
+    # Whether read-only queries may run on the replica pool (OIPA_DB_REPLICA_DSN)
+    use_replica: bool = False
+    
     def __init__(self):
         self.db = oipa_db
         self.config = config
@@ -68,26 +79,40 @@ class BaseTool(ABC):
         Execute the tool with given arguments
         
         This method handles validation, execution, and error handling.
+        All database calls made by the tool share one deadline and their
+        latency samples are labeled with the tool name.
         """
-        try:
-            # Validate input
-            validated_args = await self._validate_input(arguments)
-            
-            # Execute tool logic
-            result = await self._execute_impl(validated_args)
-            
-            # Format response
-            return await self._format_response(result)
-            
-        except ValidationError as e:
-            logger.error(f"Validation error in {self.name}: {e}")
-            raise ValidationToolError(f"Input validation failed: {e}")
-        except DatabaseToolError as e:
-            logger.error(f"Database error in {self.name}: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error in {self.name}: {e}")
-            raise ToolError(f"Tool execution failed: {e}")
+        with latency_metrics.tool(self.name), replica_reads(self.use_replica), collect_truncations():
+            try:
+                # Validate input
+                validated_args = await self._validate_input(arguments)
+                
+                # Execute tool logic
+                with query_deadline(self.get_timeout()):
+                    result = await self._execute_impl(validated_args)
+                
+                # Format response
+                with latency_metrics.time("format"):
+                    return await self._format_response(result)
+                
+            except ValidationError as e:
+                logger.error(f"Validation error in {self.name}: {e}")
+                raise ValidationToolError(f"Input validation failed: {e}")
+            except DatabaseToolError as e:
+                logger.error(f"Database error in {self.name}: {e}")
+                raise
+            except Exception as e:
+                logger.error(f"Unexpected error in {self.name}: {e}")
+                raise ToolError(f"Tool execution failed: {e}")
+    
+    def get_timeout(self) -> float:
+        """Deadline in seconds for this tool's database work"""
+        override = self.config.performance.tool_timeouts.get(self.name.upper())
+        if override:
+            return float(override)
+        if self.timeout is not None:
+            return self.timeout
+        return float(self.config.performance.query_timeout)
     
     async def _validate_input(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -122,10 +147,15 @@ class BaseTool(ABC):
             return {"result": result}
     
     async def _ensure_db_connection(self) -> None:
-        """Ensure database connection is available"""
+        """Ensure database connection is available (full round-trip probe)"""
         if not await self.db.test_connection():
             raise DatabaseToolError("Database connection not available")
     
+    async def _check_db_available(self) -> None:
+        """Fail fast when the circuit breaker reports the database as down"""
+        if not await self.db.is_available():
+            raise DatabaseToolError("Database connection not available (circuit breaker open)")
+    
     def _build_error_response(self, error: str, details: Optional[str] = None) -> Dict[str, Any]:
         """Build standardized error response"""
         response = {
@@ -142,13 +172,24 @@ class BaseTool(ABC):
         message: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
-        """Build standardized success response"""
+        """
+        Build standardized success response
+        
+        Results cut short by the row/byte caps during this call are flagged
+        with ``truncated`` and ``rows_scanned`` in the metadata.
+        """
         response = {
             "success": True,
             "data": data
         }
         if message:
             response["message"] = message
+        truncations = truncation_notes()
+        if truncations:
+            metadata = dict(metadata or {})
+            metadata["truncated"] = True
+            metadata["rows_scanned"] = sum(note["rows_scanned"] for note in truncations)
+            metadata["truncations"] = truncations
         if metadata:
             response["metadata"] = metadata
         return response
@@ -161,11 +202,14 @@ class QueryTool(BaseTool):
     Provides common patterns for query-based tools.
     """
     
+    use_replica = True
+    
     async def _execute_query_tool(
         self, 
         query: str, 
         parameters: Optional[Dict[str, Any]] = None,
-        single_result: bool = False
+        single_result: bool = False,
+        row_format: str = "dict"
     ) -> Union[List[Dict[str, Any]], Dict[str, Any], None]:
         """
         Execute a database query with error handling
@@ -174,23 +218,78 @@ class QueryTool(BaseTool):
             query: SQL query string
             parameters: Query parameters
             single_result: If True, return single result instead of list
+            row_format: Row shape for list results ("dict", "tuple",
+                "record" or "columns")
             
         Returns:
             Query results
         """
-        await self._ensure_db_connection()
+        await self._check_db_available()
         
         try:
             if single_result:
                 result = await self.db.execute_single_query(query, parameters)
             else:
-                result = await self.db.execute_query(query, parameters)
+                result = await self.db.execute_query(query, parameters, row_format=row_format)
             
             return result
             
+        except QueryTimeoutError as e:
+            logger.error(f"Query execution failed: {e}")
+            raise DatabaseToolError(f"Database query timed out after {self.get_timeout():g}s")
         except Exception as e:
             logger.error(f"Query execution failed: {e}")
             raise DatabaseToolError(f"Database query failed: {e}")
+    
+    async def _execute_pipeline_tool(self, statements: List[tuple]) -> List[Any]:
+        """
+        Execute several independent queries in one round trip with error handling
+        
+        Args:
+            statements: ``(query, parameters)`` or ``(query, parameters,
+                row_format)`` tuples
+        
+        Returns:
+            One result list per statement, in order
+        """
+        await self._check_db_available()
+        
+        try:
+            return await self.db.execute_pipeline(statements)
+        except QueryTimeoutError as e:
+            logger.error(f"Pipeline execution failed: {e}")
+            raise DatabaseToolError(f"Database query timed out after {self.get_timeout():g}s")
+        except Exception as e:
+            logger.error(f"Pipeline execution failed: {e}")
+            raise DatabaseToolError(f"Database query failed: {e}")
+    
+    async def _fetch_by_keys_tool(
+        self,
+        shape: str,
+        keys: List[Any],
+        parameters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Look up many keys in one statement with error handling
+        
+        Args:
+            shape: ``OipaQueryBuilder.*_by_keys`` query shape
+            keys: Key values to look up
+            parameters: Additional bind parameters
+        
+        Returns:
+            Rows per input key (empty list when a key has no match)
+        """
+        await self._check_db_available()
+        
+        try:
+            return await self.db.fetch_by_keys(shape, keys, parameters)
+        except QueryTimeoutError as e:
+            logger.error(f"Key lookup failed: {e}")
+            raise DatabaseToolError(f"Database query timed out after {self.get_timeout():g}s")
+        except Exception as e:
+            logger.error(f"Key lookup failed: {e}")
+            raise DatabaseToolError(f"Database query failed: {e}")
 
 
 class TransactionTool(BaseTool):
@@ -200,6 +299,9 @@ class TransactionTool(BaseTool):
     Provides common patterns for transaction-based tools.
     """
     
+    # Transactions must read what they write
+    use_replica = False
+    
     async def _build_transaction_xml(
         self, 
         transaction_name: str,
@@ -233,6 +335,71 @@ class AnalyticsTool(BaseTool):
     Provides common patterns for analytics and reporting tools.
     """
     
+    use_replica = True
+    
+    async def _fetch_arrow_tool(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """
+        Execute an analytics query and return a ``pyarrow.Table``
+        
+        Results are fetched column-wise so aggregations can run with
+        ``pyarrow.compute`` instead of looping over per-row dicts.
+        
+        Args:
+            query: SQL query string
+            parameters: Query parameters
+        
+        Returns:
+            Query results as a ``pyarrow.Table`` with lower-case column names
+        """
+        await self._check_db_available()
+        
+        try:
+            return await self.db.fetch_arrow(query, parameters)
+        except QueryTimeoutError as e:
+            logger.error(f"Analytics query failed: {e}")
+            raise DatabaseToolError(f"Database query timed out after {self.get_timeout():g}s")
+        except Exception as e:
+            logger.error(f"Analytics query failed: {e}")
+            raise DatabaseToolError(f"Database query failed: {e}")
+    
+    async def _fetch_columns_tool(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, List[Any]]:
+        """
+        Execute an analytics query and return its columns as value lists
+        
+        Fetches through Arrow when pyarrow is installed (the ``analytics``
+        extra) and falls back to ``execute_query(row_format="columns")``
+        otherwise, so tools built on it work on a default install.
+        
+        Args:
+            query: SQL query string
+            parameters: Query parameters
+        
+        Returns:
+            Column name (lower-case) -> list of values
+        """
+        if arrow_available():
+            table = await self._fetch_arrow_tool(query, parameters)
+            return table.to_pydict()
+        
+        await self._check_db_available()
+        
+        try:
+            return await self.db.execute_query(query, parameters, row_format="columns")
+        except QueryTimeoutError as e:
+            logger.error(f"Analytics query failed: {e}")
+            raise DatabaseToolError(f"Database query timed out after {self.get_timeout():g}s")
+        except Exception as e:
+            logger.error(f"Analytics query failed: {e}")
+            raise DatabaseToolError(f"Database query failed: {e}")
+    
     def _calculate_percentage(self, part: int, total: int) -> float:
         """Calculate percentage with division by zero protection"""
         if total == 0:
@@ -5,11 +5,21 @@ Provides tools for searching, retrieving, and managing insurance policies.
 Based on OIPA AsPolicy table structure and common business operations.
 """
 
+from contextvars import ContextVar
 from typing import Any, Dict, List, Optional
 from loguru import logger
 
-from .base import QueryTool
-from ..connectors import OipaQueryBuilder
+from .base import QueryTool, AnalyticsTool, DatabaseToolError
+from ..connectors import (
+    OipaQueryBuilder, code_dictionary, policy_search_index, policy_status_counts, search_classifier,
+    summary_views
+)
+from ..connectors.codes import ROLE, STATE, STATUS
+
+
+# Route taken and continuation cursor of the current oipa_search_policies
+# call, added to its response; a fresh dict is set for each execute()
+_search_meta: ContextVar[Optional[Dict[str, Any]]] = ContextVar("oipa_search_meta", default=None)
 
 
 class SearchPoliciesQuality(QueryTool):
@@ -57,39 +67,88 @@ class SearchPoliciesQuality(QueryTool):
                     "default": "all",
                     "description": "Filter by policy status"
                 },
+                "match_mode": {
+                    "type": "string",
+                    "enum": ["exact", "prefix", "contains"],
+                    "description": "How names match: whole value, starts with, or anywhere (slowest). "
+                                   "Defaults to prefix when the search indexes exist, else contains"
+                },
                 "limit": {
                     "type": "integer",
                     "minimum": 1,
                     "maximum": 100,
                     "default": 20,
                     "description": "Maximum number of results to return"
+                },
+                "cursor": {
+                    "type": "string",
+                    "description": "next_cursor from a previous response, to get the following page"
                 }
             },
             "required": ["search_term"]
         }
     
+    async def execute(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the search with its own route/cursor record, discarded afterwards"""
+        token = _search_meta.set({})
+        try:
+            return await super().execute(arguments)
+        finally:
+            _search_meta.reset(token)
+    
     async def _execute_impl(self, arguments: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Execute policy search with intelligent ranking"""
         search_term = arguments["search_term"]
         status = arguments.get("status", "all")
         limit = arguments.get("limit", 20)
+        match_mode = arguments.get("match_mode")
+        cursor = arguments.get("cursor")
         
-        logger.info(f"Searching policies: term='{search_term}', status='{status}', limit={limit}")
+        # Policy numbers, GUIDs and tax IDs become indexed lookups
+        route = search_classifier.classify(search_term)
+        meta = _search_meta.get()
+        if meta is None:
+            # Called outside execute(); nothing reports the metadata
+            meta = {}
+        meta["search_route"] = route.route
         
-        # Build and execute query
-        query, parameters = OipaQueryBuilder.search_policies(
-            search_term=search_term,
-            status_filter=status,
-            limit=limit
+        logger.info(
+            f"Searching policies: term='{search_term}', route='{route.route}', "
+            f"status='{status}', limit={limit}"
         )
         
-        results = await self._execute_query_tool(query, parameters)
+        # First pages of substring searches are resolved by the in-memory
+        # trigram index when it is loaded and the term is selective enough
+        results = None
+        substring = (match_mode or search_classifier.default_match_mode()) == "contains"
+        if route.route == search_classifier.TEXT and substring and not cursor:
+            results = await self._search_via_index(route.value, status, limit)
+            if results is not None:
+                meta["search_route"] = "text_index"
+        
+        if results is None:
+            # Build and execute query
+            query, parameters = OipaQueryBuilder.search_policies(
+                search_term=search_term,
+                status_filter=status,
+                limit=limit,
+                route=route,
+                match_mode=match_mode,
+                after=cursor
+            )
+            
+            results = await self._execute_query_tool(query, parameters)
+        
+        # A full page may have more after it; the cursor seeks past its last row
+        if results and len(results) >= limit:
+            meta["next_cursor"] = OipaQueryBuilder.next_cursor(
+                "policy", OipaQueryBuilder.POLICY_SEARCH_ORDER, results[-1]
+            )
         
         # Enhance results with additional formatting
         enhanced_results = []
         for policy in results:
-            # Use database-provided status name if available, otherwise format the code
-            status_display = policy.get("status_name") or self._format_status(policy["status_code"])
+            status_display = self._format_status(policy["status_code"])
             
             enhanced_policy = {
                 "policy_guid": policy["policy_guid"],
@@ -109,16 +168,38 @@ class SearchPoliciesQuality(QueryTool):
         
         return enhanced_results
     
+    async def _search_via_index(self, search_term: str, status: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fetch the policies the trigram index matched for ``search_term``
+        
+        Returns:
+            Matching rows, newest first, or None when the index cannot answer
+        """
+        guids = policy_search_index.candidates(search_term)
+        if guids is None:
+            return None
+        if not guids:
+            return []
+        
+        shape, parameters = OipaQueryBuilder.search_policies_by_keys(search_term, status)
+        rows_by_guid = await self._fetch_by_keys_tool(shape, guids, parameters)
+        rows = [row for guid in guids for row in rows_by_guid.get(guid, [])]
+        # Same order as the SQL search (DESC, NULLs first) so its cursor can continue from here
+        rows.sort(key=lambda row: tuple(
+            (row.get(key) is None, row.get(key) or "")
+            for _, _, key in OipaQueryBuilder.POLICY_SEARCH_ORDER
+        ), reverse=True)
+        return rows[:limit]
+    
+    async def _format_response(self, result: Any) -> Dict[str, Any]:
+        """Add the search route and continuation cursor to the standard list response"""
+        response = await super()._format_response(result)
+        response.update(_search_meta.get() or {})
+        return response
+    
     def _format_status(self, status_code: str) -> str:
         """Convert status code to human-readable format"""
-        status_map = {
-            "01": "Active",
-            "08": "Pending", 
-            "99": "Cancelled",
-            "13": "Suspended",
-            "14": "Lapsed"
-        }
-        return status_map.get(status_code, f"Unknown ({status_code})")
+        return code_dictionary.short(STATUS, status_code) or f"Unknown ({status_code})"
     
     def _format_client_name(self, policy: Dict[str, Any]) -> str:
         """Format client name from policy data"""
@@ -201,21 +282,33 @@ class GetPolicyDetailsTotal(QueryTool):
         
         logger.info(f"Getting policy details: guid={policy_guid}, number={policy_number}")
         
-        # Get basic policy information
-        query, parameters = OipaQueryBuilder.get_policy_details(
+        # Policy details and roles are independent queries, so both go out in one round trip
+        details_query, details_parameters = OipaQueryBuilder.get_policy_details(
+            policy_guid=policy_guid,
+            policy_number=policy_number
+        )
+        roles_query, roles_parameters = OipaQueryBuilder.get_policy_roles(
             policy_guid=policy_guid,
             policy_number=policy_number
         )
         
-        policy_data = await self._execute_query_tool(query, parameters, single_result=True)
+        # Slotted records avoid a dict per row for the wide roles join
+        policy_rows, roles_data = await self._execute_pipeline_tool([
+            (details_query, details_parameters),
+            (roles_query, roles_parameters, "record")
+        ])
+        
+        policy_data = policy_rows[0] if policy_rows else None
         
         if not policy_data:
             return self._build_error_response("Policy not found")
         
         # Format basic policy information
-        # Use database-provided names if available, otherwise format the codes
-        status_display = policy_data.get("status_name") or self._format_status(policy_data["status_code"])
-        state_display = policy_data.get("issue_state_name") or policy_data.get("issue_state_code", "Unknown")
+        # Codes are decoded from the in-memory AsCode dictionary
+        status_code = policy_data["status_code"]
+        state_code = policy_data.get("issue_state_code")
+        status_display = self._format_status(status_code)
+        state_display = code_dictionary.short(STATE, state_code) or state_code or "Unknown"
         
         # Format basic policy information
         result = {
@@ -225,11 +318,11 @@ class GetPolicyDetailsTotal(QueryTool):
                 "name": policy_data["policy_name"],
                 "status": status_display,
                 "status_code": policy_data["status_code"],
-                "status_description": policy_data.get("status_description"),
+                "status_description": code_dictionary.long(STATUS, status_code),
                 "plan_date": policy_data["plan_date"].strftime("%Y-%m-%d") if policy_data["plan_date"] else None,
                 "issue_state": state_display,
-                "issue_state_code": policy_data.get("issue_state_code"),
-                "issue_state_description": policy_data.get("issue_state_description"),
+                "issue_state_code": state_code,
+                "issue_state_description": code_dictionary.long(STATE, state_code),
                 "creation_date": policy_data["creation_date"].strftime("%Y-%m-%d") if policy_data["creation_date"] else None,
                 "updated_date": policy_data["updated_date"].strftime("%Y-%m-%d %H:%M:%S") if policy_data["updated_date"] else None
             },
@@ -254,7 +347,7 @@ class GetPolicyDetailsTotal(QueryTool):
             result["segments"] = await self._get_policy_segments(policy_data["policy_guid"])
         
         # Always include roles with detailed information
-        result["roles"] = await self._get_policy_roles(policy_data["policy_guid"])
+        result["roles"] = self._format_policy_roles(roles_data)
         
         return self._build_success_response(result)
     
@@ -264,47 +357,18 @@ class GetPolicyDetailsTotal(QueryTool):
         # This would require AsSegment table queries
         return []
     
-    async def _get_policy_roles(self, policy_guid: str) -> List[Dict[str, Any]]:
-        """Get all roles for a policy with detailed client and role information"""
-        query = """
-            SELECT 
-                r.RoleGUID as role_guid,
-                r.RoleCode as role_code,
-                r.RolePercent as role_percent,
-                r.RoleAmount as role_amount,
-                r.StatusCode as role_status_code,
-                role_code_tbl.ShortDescription as role_type_name,
-                role_code_tbl.LongDescription as role_type_description,
-                c.ClientGUID as client_guid,
-                c.FirstName as first_name,
-                c.LastName as last_name,
-                c.CompanyName as company_name,
-                c.TaxID as tax_id,
-                c.TypeCode as client_type_code,
-                c.DateOfBirth as date_of_birth,
-                c.Sex as gender,
-                c.Email as email
-            FROM AsRole r
-            LEFT JOIN AsClient c ON r.ClientGUID = c.ClientGUID
-            LEFT JOIN AsCode role_code_tbl ON role_code_tbl.CodeValue = r.RoleCode 
-                AND role_code_tbl.CodeName = 'AsCodeRole'
-            WHERE r.PolicyGUID = :policy_guid
-            ORDER BY r.RoleCode
-        """
-        
-        roles_data = await self._execute_query_tool(query, {"policy_guid": policy_guid})
-        
+    def _format_policy_roles(self, roles_data: List[Any]) -> List[Dict[str, Any]]:
+        """Format role rows with detailed client and role information"""
         # Format roles with enhanced information
         formatted_roles = []
         for role in roles_data:
-            # Use database-provided role type name if available, otherwise use fallback mapping
-            role_type_display = role.get("role_type_name") or self._format_role_type(role["role_code"])
+            role_type_display = self._format_role_type(role["role_code"])
             
             formatted_role = {
                 "role_guid": role["role_guid"],
                 "role_code": role["role_code"],
                 "role_type": role_type_display,
-                "role_type_description": role.get("role_type_description"),
+                "role_type_description": code_dictionary.long(ROLE, role["role_code"]),
                 "role_status_code": role["role_status_code"],
                 "percent": float(role["role_percent"]) if role["role_percent"] else None,
                 "amount": float(role["role_amount"]) if role["role_amount"] else None,
@@ -327,60 +391,11 @@ class GetPolicyDetailsTotal(QueryTool):
     
     def _format_status(self, status_code: str) -> str:
         """Convert status code to human-readable format"""
-        status_map = {
-            "01": "Active",
-            "08": "Pending",
-            "99": "Cancelled", 
-            "13": "Suspended",
-            "14": "Lapsed"
-        }
-        return status_map.get(status_code, f"Unknown ({status_code})")
+        return code_dictionary.short(STATUS, status_code) or f"Unknown ({status_code})"
     
     def _format_role_type(self, role_code: str) -> str:
         """Convert role code to human-readable format based on OIPA AsCodeRole table"""
-        role_map = {
-            "01": "Primary Insured",
-            "02": "Secondary Insured", 
-            "03": "Tertiary Insured",
-            "04": "Payor",
-            "05": "Insured",
-            "06": "Co-Insured",
-            "07": "Joint Insured",
-            "08": "Contingent Owner",
-            "09": "Successor Owner",
-            "10": "Trustee",
-            "11": "Producer",
-            "12": "Agent",
-            "13": "Policy Owner",
-            "14": "Producer Payee",
-            "15": "Broker",
-            "16": "Case Manager",
-            "17": "Servicing Agent",
-            "18": "Billing Contact",
-            "19": "Alternative Payor",
-            "20": "Contingent Payor",
-            "21": "Premium Payor",
-            "22": "Other",
-            "23": "Power of Attorney",
-            "24": "Guardian",
-            "25": "Conservator",
-            "26": "Primary Beneficiary",
-            "27": "Annuitant",
-            "28": "Joint Annuitant",
-            "29": "Contingent Annuitant",
-            "30": "Successor Annuitant",
-            "31": "Beneficiary Payee",
-            "32": "Contingent Beneficiary",
-            "33": "Tertiary Beneficiary",
-            "34": "Beneficiary",
-            "35": "Estate Beneficiary",
-            "36": "Trust Beneficiary",
-            "37": "Corporation",
-            "38": "Partnership",
-            "39": "Charity",
-            "40": "Other Entity"
-        }
-        return role_map.get(role_code, f"Role {role_code}")
+        return code_dictionary.short(ROLE, role_code) or f"Role {role_code}"
     
     def _format_client_name(self, client_data: Dict[str, Any]) -> str:
         """Format client name from client data"""
@@ -396,7 +411,7 @@ class GetPolicyDetailsTotal(QueryTool):
             return "Unknown Client"
 
 
-class PolicyCountsByStatusSmall(QueryTool):
+class PolicyCountsByStatusSmall(AnalyticsTool):
     """
     Get policy counts grouped by status
     
@@ -414,38 +429,71 @@ class PolicyCountsByStatusSmall(QueryTool):
         
         Provides a quick overview of policy distribution across different statuses
         (active, cancelled, pending, etc.). Useful for dashboard reporting.
+        Counts come from an in-memory snapshot refreshed in the background, or
+        from the DBA's summary view when configured and fresh; the source and
+        its age are reported. Set fresh=true to count the base tables.
         """
     
     @property
     def input_schema(self) -> Dict[str, Any]:
         return {
             "type": "object",
-            "properties": {},
+            "properties": {
+                "fresh": {
+                    "type": "boolean",
+                    "default": False,
+                    "description": "Count the base tables instead of using the in-memory snapshot or summary view"
+                }
+            },
             "additionalProperties": False
         }
     
     async def _execute_impl(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Get policy counts by status"""
-        logger.info("Getting policy counts by status")
+        fresh = arguments.get("fresh", False)
+        logger.info(f"Getting policy counts by status (fresh={fresh})")
         
-        query, parameters = OipaQueryBuilder.count_policies_by_status()
-        results = await self._execute_query_tool(query, parameters)
+        snapshot = None if fresh else policy_status_counts.snapshot()
+        if snapshot is not None:
+            counts, age_seconds = snapshot
+            status_counts = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+            total_policies = sum(counts.values())
+            metadata = {"source": "snapshot", "snapshot_age_seconds": age_seconds}
+        else:
+            # fresh=true means exact counts, which only the base tables give
+            summary = None if fresh else await summary_views.source()
+            columns = None
+            if summary:
+                query, parameters = OipaQueryBuilder.count_policies_by_status(summary[0])
+                try:
+                    columns = await self._fetch_columns_tool(query, parameters)
+                except DatabaseToolError as e:
+                    # Dropped, invalidated or no longer granted since it was detected
+                    logger.warning(f"Summary view {summary[0]} failed, counting base tables: {e}")
+                    summary_views.mark_failed()
+                    summary = None
+            if columns is None:
+                query, parameters = OipaQueryBuilder.count_policies_by_status()
+                columns = await self._fetch_columns_tool(query, parameters)
+            
+            # One row per status, so the lists are short whichever path fetched them
+            total_policies = int(sum(columns.get("policy_count", [])))
+            status_counts = zip(columns.get("status_code", []), columns.get("policy_count", []))
+            if summary:
+                metadata = {"source": "summary_view", "summary_view": summary[0], "snapshot_age_seconds": summary[1]}
+            else:
+                metadata = {"source": "base_tables", "snapshot_age_seconds": 0.0}
         
         # Format results with human-readable status names
         formatted_counts = {}
-        total_policies = 0
         
-        for row in results:
-            status_code = row["status_code"]
-            count = row["policy_count"]
-            # Use database-provided status name if available, otherwise format the code
-            status_name = row.get("status_name") or self._format_status(status_code)
+        for status_code, count in status_counts:
+            status_name = self._format_status(status_code)
             
             formatted_counts[status_name] = {
-                "count": count,
+                "count": int(count),
                 "status_code": status_code
             }
-            total_policies += count
         
         # Calculate percentages
         for status_data in formatted_counts.values():
@@ -458,21 +506,8 @@ class PolicyCountsByStatusSmall(QueryTool):
             "total_policies": total_policies,
             "status_breakdown": formatted_counts,
             "summary": f"Total {total_policies} policies across {len(formatted_counts)} statuses"
-        })
+        }, metadata=metadata)
     
     def _format_status(self, status_code: str) -> str:
         """Convert status code to human-readable format"""
-        status_map = {
-            "01": "Active",
-            "08": "Pending",
-            "99": "Cancelled",
-            "13": "Suspended", 
-            "14": "Lapsed"
-        }
-        return status_map.get(status_code, f"Status {status_code}")
-    
-    def _calculate_percentage(self, part: int, total: int) -> float:
-        """Calculate percentage with division by zero protection"""
-        if total == 0:
-            return 0.0
-        return round((part / total) * 100, 2)
+        return code_dictionary.short(STATUS, status_code) or f"Status {status_code}"
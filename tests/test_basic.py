@@ -122,6 +122,68 @@ class TestPolicyTools:
         # Verify empty results
         assert len(result) == 0
     
+    @pytest.mark.asyncio
+    async def test_search_reports_route(self, search_tool):
+        """Responses say whether the search used an indexed lookup"""
+        search_tool.db.execute_query.return_value = []
+        
+        response = await search_tool.execute({"search_term": "CJF950204TL0"})
+        
+        assert response["search_route"] == "tax_id"
+        query, parameters = search_tool.db.execute_query.call_args[0][:2]
+        assert "c.TaxID = :search_term" in query
+        assert parameters["search_term"] == "CJF950204TL0"
+    
+    @pytest.mark.asyncio
+    async def test_substring_search_uses_trigram_index(self, search_tool, sample_policy_data):
+        """Loaded trigram index resolves candidates; only their GUIDs are fetched"""
+        from oipa_mcp.connectors import policy_search_index
+        
+        guid = sample_policy_data[0]["policy_guid"]
+        policy_search_index.index.add(guid, ["VG01-002-561-000001063", "María", "García"], 1.0)
+        policy_search_index.ready = True
+        search_tool.db.fetch_by_keys.return_value = {guid: sample_policy_data}
+        try:
+            response = await search_tool.execute({"search_term": "garcía", "match_mode": "contains"})
+        finally:
+            policy_search_index.index.clear()
+            policy_search_index.ready = False
+        
+        assert response["search_route"] == "text_index"
+        assert response["data"][0]["policy_number"] == "VG01-002-561-000001063"
+        shape, keys, parameters = search_tool.db.fetch_by_keys.call_args[0]
+        assert keys == [guid] and parameters["search_term"] == "%garcía%"
+        search_tool.db.execute_query.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_search_pages_with_cursor(self, search_tool, sample_policy_data):
+        """A full page returns a cursor that seeks past its last row"""
+        search_tool.db.execute_query.return_value = sample_policy_data
+        
+        first = await search_tool.execute({"search_term": "García", "limit": 1})
+        assert "next_cursor" in first
+        
+        search_tool.db.execute_query.return_value = []
+        second = await search_tool.execute({"search_term": "García", "limit": 1, "cursor": first["next_cursor"]})
+        
+        query, parameters = search_tool.db.execute_query.call_args[0][:2]
+        assert parameters["after_1"] == sample_policy_data[0]["policy_guid"]
+        assert "p.PolicyGUID < :after_1" in query
+        assert second["count"] == 0 and "next_cursor" not in second
+    
+    @pytest.mark.asyncio
+    async def test_search_metadata_does_not_outlive_the_call(self, search_tool, sample_policy_data):
+        """Route and cursor are reported by the call that produced them only"""
+        from oipa_mcp.tools.policy_tools import _search_meta
+        
+        search_tool.db.execute_query.return_value = sample_policy_data
+        await search_tool.execute({"search_term": "García", "limit": 1})
+        assert _search_meta.get() is None
+        
+        result = await search_tool._execute_impl({"search_term": "García", "limit": 1})
+        response = await search_tool._format_response(result)
+        assert "next_cursor" not in response and "search_route" not in response
+    
     def test_policy_details_tool(self):
         """Test policy details tool properties"""
         tool = GetPolicyDetailsTotal()
@@ -156,10 +218,14 @@ class TestToolIntegration:
     @pytest.mark.asyncio
     async def test_policy_counts_integration(self, mock_query_results):
         """Test policy counts with realistic data"""
+        pa = pytest.importorskip("pyarrow")
+        
         tool = PolicyCountsByStatusSmall()
         tool.db = AsyncMock()
         tool.db.test_connection.return_value = True
-        tool.db.execute_query.return_value = mock_query_results
+        tool.db.fetch_arrow.return_value = pa.Table.from_pylist(
+            [dict(row, status_name=None) for row in mock_query_results]
+        )
         
         # Execute tool
         result = await tool.execute({})
@@ -177,6 +243,134 @@ class TestToolIntegration:
         assert breakdown["Active"]["percentage"] == 88.24  # 15000/17000 * 100
 
 
+    @pytest.mark.asyncio
+    async def test_policy_counts_without_pyarrow(self, mock_query_results):
+        """Without pyarrow the counts are fetched as plain column lists"""
+        tool = PolicyCountsByStatusSmall()
+        tool.db = AsyncMock()
+        tool.db.execute_query.return_value = {
+            "status_code": [row["status_code"] for row in mock_query_results],
+            "policy_count": [row["policy_count"] for row in mock_query_results]
+        }
+        
+        with patch("oipa_mcp.tools.base.arrow_available", return_value=False):
+            result = await tool.execute({"fresh": True})
+        
+        assert result["data"]["total_policies"] == 17000
+        assert result["data"]["status_breakdown"]["Active"]["count"] == 15000
+        assert tool.db.execute_query.call_args.kwargs["row_format"] == "columns"
+        tool.db.fetch_arrow.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_policy_counts_from_snapshot(self):
+        """Counts come from the in-process snapshot unless fresh=true"""
+        tool = PolicyCountsByStatusSmall()
+        tool.db = AsyncMock()
+        
+        with patch("oipa_mcp.tools.policy_tools.policy_status_counts") as status_counts:
+            status_counts.snapshot.return_value = ({"01": 300, "99": 100}, 12.5)
+            result = await tool.execute({})
+            
+            assert result["data"]["total_policies"] == 400
+            assert result["data"]["status_breakdown"]["Active"]["percentage"] == 75.0
+            assert result["metadata"] == {"source": "snapshot", "snapshot_age_seconds": 12.5}
+            tool.db.fetch_arrow.assert_not_called()
+            
+            tool.db.fetch_arrow.side_effect = RuntimeError("exact count requested")
+            with pytest.raises(Exception, match="exact count requested"):
+                await tool.execute({"fresh": True})
+    
+    @pytest.mark.asyncio
+    async def test_policy_counts_from_summary_view(self):
+        """Without a snapshot, a fresh summary view is summed instead of AsPolicy"""
+        pa = pytest.importorskip("pyarrow")
+        
+        tool = PolicyCountsByStatusSmall()
+        tool.db = AsyncMock()
+        tool.db.fetch_arrow.return_value = pa.Table.from_pylist([
+            {"status_code": "01", "policy_count": 90},
+            {"status_code": "99", "policy_count": 10}
+        ])
+        
+        with patch("oipa_mcp.tools.policy_tools.summary_views") as summary_views:
+            summary_views.source = AsyncMock(return_value=("OIPA_POLICY_COUNTS_MV", 300.0))
+            result = await tool.execute({})
+        
+        assert "OIPA_POLICY_COUNTS_MV" in tool.db.fetch_arrow.call_args[0][0]
+        assert result["metadata"]["source"] == "summary_view"
+        assert result["metadata"]["snapshot_age_seconds"] == 300.0
+        assert result["data"]["status_breakdown"]["Active"]["count"] == 90
+    
+    @pytest.mark.asyncio
+    async def test_policy_counts_fall_back_when_summary_view_fails(self):
+        """A summary view that errors (dropped, invalidated, grant revoked) falls back to AsPolicy"""
+        tool = PolicyCountsByStatusSmall()
+        tool.db = AsyncMock()
+        tool.db.execute_query.side_effect = [
+            Exception("ORA-00942: table or view does not exist"),
+            {"status_code": ["01"], "policy_count": [40]}
+        ]
+        
+        with patch("oipa_mcp.tools.base.arrow_available", return_value=False), \
+             patch("oipa_mcp.tools.policy_tools.summary_views") as summary_views:
+            summary_views.source = AsyncMock(return_value=("OIPA_POLICY_COUNTS_MV", 300.0))
+            result = await tool.execute({})
+            summary_views.mark_failed.assert_called_once()
+        
+        first, second = (call[0][0] for call in tool.db.execute_query.call_args_list)
+        assert "OIPA_POLICY_COUNTS_MV" in first and "AsPolicy" in second
+        assert result["metadata"]["source"] == "base_tables"
+        assert result["data"]["total_policies"] == 40
+    
+    @pytest.mark.asyncio
+    async def test_policy_details_single_pipeline(self):
+        """Policy details and roles are fetched in one pipelined call"""
+        policy_row = {
+            "policy_guid": "G1", "policy_number": "P1", "policy_name": "Life",
+            "status_code": "01", "status_name": None, "plan_date": None,
+            "issue_state_code": "CA", "creation_date": None,
+            "updated_date": datetime(2025, 1, 15, 10, 30),
+            "client_guid": "C1", "client_first_name": "María", "client_last_name": "García",
+            "company_name": None, "tax_id": "GARM800101", "date_of_birth": None,
+            "gender": "F", "plan_guid": "PL1", "plan_name": "Term Life"
+        }
+        role_row = {
+            "role_guid": "R1", "role_code": "01", "role_percent": 100, "role_amount": None,
+            "role_status_code": "01", "role_type_name": None, "client_guid": "C1",
+            "first_name": "María", "last_name": "García", "company_name": None,
+            "tax_id": "GARM800101", "client_type_code": "01", "date_of_birth": None,
+            "gender": "F", "email": None
+        }
+        
+        tool = GetPolicyDetailsTotal()
+        tool.db = AsyncMock()
+        tool.db.execute_pipeline.return_value = [[policy_row], [role_row]]
+        
+        result = await tool.execute({"policy_number": "P1"})
+        
+        assert result["success"] is True
+        assert result["data"]["policy"]["status"] == "Active"
+        assert result["data"]["roles"][0]["role_type"] == "Primary Insured"
+        tool.db.execute_pipeline.assert_awaited_once()
+        tool.db.execute_query.assert_not_called()
+        tool.db.execute_single_query.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_tool_latency_labeled_by_tool_name(self):
+        """Tool execution and response formatting are timed per tool"""
+        from oipa_mcp.connectors.metrics import latency_metrics
+        
+        tool = SearchPoliciesQuality()
+        tool.db = AsyncMock()
+        tool.db.execute_query.return_value = []
+        latency_metrics.reset()
+        
+        await tool.execute({"search_term": "Garcia"})
+        
+        phases = {entry["phase"] for entry in latency_metrics.snapshot(tool=tool.name)}
+        assert {"tool", "format"} <= phases
+
+
 class TestErrorHandling:
     """Test error handling scenarios"""
     
@@ -192,6 +386,19 @@ class TestErrorHandling:
         with pytest.raises(DatabaseToolError):
             await tool._ensure_db_connection()
     
+    @pytest.mark.asyncio
+    async def test_query_fails_fast_when_circuit_open(self):
+        """Test that query tools skip the database when the breaker is open"""
+        tool = SearchPoliciesQuality()
+        tool.db = AsyncMock()
+        tool.db.is_available.return_value = False
+        
+        from oipa_mcp.tools.base import DatabaseToolError
+        with pytest.raises(DatabaseToolError):
+            await tool._execute_query_tool("SELECT 1 FROM DUAL")
+        tool.db.execute_query.assert_not_called()
+        tool.db.test_connection.assert_not_called()
+    
     @pytest.mark.asyncio
     async def test_invalid_input_handling(self):
         """Test handling of invalid tool inputs"""
@@ -6,6 +6,7 @@ Tests the new oracledb connector functionality and migration aspects.
 
 import pytest
 import asyncio
+import itertools
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from datetime import datetime
 
@@ -15,7 +16,9 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from oipa_mcp.config import Config, DatabaseConfig
-from oipa_mcp.connectors.database import OipaDatabase, OipaQueryBuilder
+from oipa_mcp.connectors.database import (
+    OipaDatabase, OipaQueryBuilder, CircuitBreaker, SessionInitializer, BulkDmlError
+)
 
 
 class TestOracleDBMigration:
@@ -86,6 +89,7 @@ class TestOracleDBMigration:
             assert call_args['dsn'] == 'testhost:1521/TEST'
             assert call_args['min'] == config.database.pool_min_size
             assert call_args['max'] == config.database.pool_max_size
+            assert call_args['wait_timeout'] == config.database.pool_timeout * 1000
             
             # Test pool status
             status = await db.get_pool_status()
@@ -210,6 +214,128 @@ class TestAsyncDatabaseOperations:
         mock_connection.commit.assert_called_once()
 
 
+    @staticmethod
+    def _streaming_pool(batches):
+        """Build pool/connection/cursor mocks whose cursor yields the given batches"""
+        mock_pool = AsyncMock()
+        mock_connection = AsyncMock()
+        mock_cursor = AsyncMock()
+        mock_cursor.close = Mock()
+        mock_cursor.description = [('POLICY_NUMBER', None)]
+        mock_cursor.fetchmany.side_effect = list(batches) + [[]]
+        mock_connection.cursor = Mock(return_value=mock_cursor)
+        mock_pool.acquire.return_value = mock_connection
+        return mock_pool, mock_connection, mock_cursor
+    
+    @pytest.mark.asyncio
+    async def test_stream_batches(self, mock_database):
+        """Test batched streaming with fetchmany"""
+        mock_pool, mock_connection, mock_cursor = self._streaming_pool([
+            [('P1',), ('P2',)],
+            [('P3',)]
+        ])
+        mock_database._pool = mock_pool
+        mock_database._initialized = True
+        
+        batches = [
+            batch async for batch in mock_database.stream_batches(
+                "SELECT PolicyNumber FROM AsPolicy", batch_size=2
+            )
+        ]
+        
+        assert batches == [
+            [{'policy_number': 'P1'}, {'policy_number': 'P2'}],
+            [{'policy_number': 'P3'}]
+        ]
+        assert mock_cursor.arraysize == 2
+        mock_cursor.fetchall.assert_not_called()
+        mock_cursor.close.assert_called_once()
+        mock_pool.release.assert_called_once_with(mock_connection)
+    
+    @pytest.mark.asyncio
+    async def test_stream_query_early_exit_releases_connection(self, mock_database):
+        """Test that stopping a stream early closes the cursor"""
+        mock_pool, mock_connection, mock_cursor = self._streaming_pool([
+            [('P1',), ('P2',)],
+            [('P3',), ('P4',)]
+        ])
+        mock_database._pool = mock_pool
+        mock_database._initialized = True
+        
+        stream = mock_database.stream_query("SELECT PolicyNumber FROM AsPolicy", batch_size=2)
+        first = await stream.__anext__()
+        await stream.aclose()
+        
+        assert first == {'policy_number': 'P1'}
+        assert mock_cursor.fetchmany.await_count == 1
+        mock_cursor.close.assert_called_once()
+        mock_pool.release.assert_called_once_with(mock_connection)
+
+
+class TestPipelineExecution:
+    """Test pipelined multi-statement execution"""
+    
+    @pytest.fixture
+    def mock_database(self):
+        db = OipaDatabase(Config())
+        db._initialized = True
+        return db
+    
+    @pytest.mark.asyncio
+    async def test_statements_share_one_pipeline(self, mock_database):
+        """All statements go to the driver in a single run_pipeline call"""
+        def op_result(names, rows):
+            columns = [Mock() for _ in names]
+            for column, name in zip(columns, names):
+                column.name = name  # Mock(name=...) would only set the repr name
+            return Mock(columns=columns, rows=rows)
+        
+        mock_pool = AsyncMock()
+        mock_connection = AsyncMock()
+        mock_connection.run_pipeline.return_value = [
+            op_result(['POLICY_GUID'], [('G1',)]),
+            op_result(['ROLE_CODE', 'CLIENT_GUID'], [('01', 'C1'), ('13', 'C2')])
+        ]
+        mock_pool.acquire.return_value = mock_connection
+        mock_database._pool = mock_pool
+        
+        details, roles = await mock_database.execute_pipeline([
+            ("SELECT PolicyGUID FROM AsPolicy WHERE PolicyNumber = :n", {"n": "P1"}),
+            ("SELECT RoleCode, ClientGUID FROM AsRole", None, "record")
+        ])
+        
+        assert details == [{'policy_guid': 'G1'}]
+        assert roles[1].client_guid == 'C2'
+        mock_connection.run_pipeline.assert_awaited_once()
+        mock_connection.cursor.assert_not_called()
+        assert mock_database.pipeline_executions == {"pipelined": 1, "sequential": 0}
+        mock_pool.release.assert_called_once_with(mock_connection)
+    
+    @pytest.mark.asyncio
+    async def test_sequential_fallback(self, mock_database):
+        """Drivers without pipelining run the statements on the same connection"""
+        mock_pool = AsyncMock()
+        mock_connection = AsyncMock()
+        del mock_connection.run_pipeline
+        mock_cursor = AsyncMock()
+        mock_cursor.close = Mock()
+        mock_cursor.description = [('STATUS_CODE', None)]
+        mock_cursor.fetchmany.side_effect = [[('01',)], [], [('99',)], []]
+        mock_connection.cursor = Mock(return_value=mock_cursor)
+        mock_pool.acquire.return_value = mock_connection
+        mock_database._pool = mock_pool
+        
+        results = await mock_database.execute_pipeline([
+            ("SELECT StatusCode FROM AsPolicy WHERE ROWNUM = 1", None),
+            ("SELECT StatusCode FROM AsPolicy WHERE StatusCode = :s", {"s": "99"})
+        ])
+        
+        assert results == [[{'status_code': '01'}], [{'status_code': '99'}]]
+        assert mock_cursor.close.call_count == 2
+        assert mock_database.pipeline_executions == {"pipelined": 0, "sequential": 1}
+        mock_pool.acquire.assert_called_once()
+
+
 class TestEnhancedQueryBuilder:
     """Test enhanced query builder functionality"""
     
@@ -223,12 +349,117 @@ class TestEnhancedQueryBuilder:
         
         # Verify query structure
         assert "UPPER(" in query  # Case-insensitive search
-        assert "FETCH FIRST 10 ROWS ONLY" in query  # Modern Oracle syntax
+        assert "FETCH FIRST :row_limit ROWS ONLY" in query  # Modern Oracle syntax, bound limit
         assert "ORDER BY p.UpdatedGmt DESC" in query  # Proper ordering
         
         # Verify parameters
         assert params['search_term'] == "%María García%"
         assert params['status_code'] == "01"  # Active status
+        assert params['row_limit'] == 10
+    
+    def test_search_terms_routed_to_indexed_lookups(self):
+        """Recognisable keys avoid the substring search"""
+        from oipa_mcp.connectors.database import SearchClassifier
+        
+        classifier = SearchClassifier.from_config(Config().performance)
+        cases = {
+            "VG01-002-561-000001063": ("policy_number", "VG01-002-561-000001063"),
+            " 6cca0b15-efac-471f-a698-27949ab9b9c4 ": ("guid", "6CCA0B15-EFAC-471F-A698-27949AB9B9C4"),
+            "cjf950204tl0": ("tax_id", "CJF950204TL0"),
+            "VG01-002": ("policy_number_prefix", "VG01-002"),
+            "María García": ("text", "María García"),
+        }
+        for term, expected in cases.items():
+            assert tuple(classifier.classify(term)) == expected
+        assert classifier.get_status()["routes"]["text"] == 1
+        
+        query, params = OipaQueryBuilder.search_policies(
+            "VG01-002-561-000001063", route=classifier.classify("VG01-002-561-000001063")
+        )
+        assert "p.PolicyNumber = :search_term" in query and "UPPER(" not in query
+        assert params["search_term"] == "VG01-002-561-000001063"
+        
+        query, params = OipaQueryBuilder.search_policies("VG01-002", route=classifier.classify("VG01-002"))
+        assert "p.PolicyNumber LIKE :search_term ESCAPE" in query
+        assert params["search_term"] == "VG01-002%"
+    
+    def test_match_modes(self):
+        """Prefix and exact searches compare UPPER(col) with an upper-cased bind"""
+        query, params = OipaQueryBuilder.search_clients(search_term="garc_a", match_mode="prefix")
+        assert "UPPER(c.LastName) LIKE :search_term || '%' ESCAPE" in query
+        assert params['search_term'] == "GARC\\_A"
+        
+        query, params = OipaQueryBuilder.search_policies(search_term="García", match_mode="exact")
+        assert "UPPER(c.LastName) = :search_term" in query
+        assert params['search_term'] == "GARCÍA"
+        
+        with pytest.raises(ValueError):
+            OipaQueryBuilder.search_clients(search_term="x", match_mode="fuzzy")
+    
+    @pytest.mark.asyncio
+    async def test_prefix_default_when_search_indexes_exist(self):
+        from oipa_mcp.connectors.database import SEARCH_INDEX_COLUMNS, missing_search_indexes, search_classifier
+        
+        partial = [("ASCLIENT", 'UPPER("LASTNAME")'), ("ASCLIENT", "SUBSTR(TAXID,1,4)")]
+        assert "CREATE INDEX ASCLIENT_UPPER_FIRSTNAME_IX ON AsClient (UPPER(FirstName))" in missing_search_indexes(partial)
+        assert not any("LastName" in ddl for ddl in missing_search_indexes(partial))
+        
+        complete = [
+            (table.upper(), f'UPPER("{column.upper()}")')
+            for table, columns in SEARCH_INDEX_COLUMNS.items() for column in columns
+        ]
+        db = OipaDatabase(Config())
+        db.execute_query = AsyncMock(return_value=complete)
+        try:
+            assert search_classifier.default_match_mode() == "contains"
+            assert await db.detect_search_indexes() == []
+            assert search_classifier.default_match_mode() == "prefix"
+            query, _ = OipaQueryBuilder.search_clients(search_term="Gar")
+            assert "LIKE :search_term || '%'" in query
+        finally:
+            search_classifier.missing_indexes = None
+    
+    def test_union_search_strategy(self):
+        """One indexed branch per column, de-duplicated by PolicyGUID, top-N by UpdatedGmt"""
+        query, params = OipaQueryBuilder.search_policies(
+            search_term="García", status_filter="active", limit=10, match_mode="prefix", strategy="union"
+        )
+        
+        assert "p.PolicyGUID IN (" in query
+        assert query.count("UNION ALL") == len(OipaQueryBuilder.POLICY_SEARCH_COLUMNS) - 1
+        assert "WHERE (UPPER(c.LastName) LIKE :search_term || '%'" in query
+        assert " OR " not in query
+        assert "ORDER BY p.UpdatedGmt DESC" in query and "FETCH FIRST :row_limit ROWS ONLY" in query
+        assert params == {"search_term": "GARCÍA", "status_code": "01", "row_limit": 10}
+        
+        or_query, _ = OipaQueryBuilder.search_policies(search_term="García", match_mode="prefix", strategy="or")
+        assert "UNION ALL" not in or_query
+        with pytest.raises(ValueError):
+            OipaQueryBuilder.search_policies(search_term="García", strategy="merge")
+    
+    def test_keyset_pagination(self):
+        """Cursors turn into seek predicates on the full sort key"""
+        row = {"updated_date": datetime(2024, 3, 1, 9, 30), "policy_guid": "G9", "client_guid": None}
+        cursor = OipaQueryBuilder.next_cursor("policy", OipaQueryBuilder.POLICY_SEARCH_ORDER, row)
+        
+        query, params = OipaQueryBuilder.search_policies(search_term="García", limit=20, after=cursor)
+        assert "p.UpdatedGmt <= :after_0" in query
+        assert "p.UpdatedGmt = :after_0 AND p.PolicyGUID < :after_1" in query
+        assert "ORDER BY p.UpdatedGmt DESC, p.PolicyGUID DESC, c.ClientGUID DESC" in query
+        assert "OFFSET" not in query
+        assert params["after_0"] == datetime(2024, 3, 1, 9, 30) and params["after_1"] == "G9"
+        assert "after_2" not in params
+        
+        client = {"last_name": "García", "first_name": "Ana", "company_name": None, "client_guid": "C1"}
+        cursor = OipaQueryBuilder.next_cursor("client", OipaQueryBuilder.CLIENT_SEARCH_ORDER, client)
+        query, params = OipaQueryBuilder.search_clients(search_term="Gar", after=cursor)
+        assert "(c.LastName > :after_0 OR c.LastName IS NULL)" in query
+        assert params["after_3"] == "C1"
+        
+        with pytest.raises(ValueError):
+            OipaQueryBuilder.search_policies(search_term="García", after=cursor)
+        with pytest.raises(ValueError):
+            OipaQueryBuilder.search_clients(search_term="Gar", after="not-a-cursor")
     
     def test_enhanced_policy_details_query(self):
         """Test enhanced policy details query"""
@@ -256,11 +487,22 @@ class TestEnhancedQueryBuilder:
         assert "AsClient c" in query
         assert "UPPER(c.FirstName) LIKE UPPER(:search_term)" in query
         assert "c.TypeCode = :client_type" in query
-        assert "FETCH FIRST 25 ROWS ONLY" in query
+        assert "FETCH FIRST :row_limit ROWS ONLY" in query
         
         # Verify parameters
         assert params['search_term'] == "%García%"
         assert params['client_type'] == "01"
+        assert params['row_limit'] == 25
+    
+    def test_limit_does_not_change_sql_text(self):
+        """Different limits reuse the same statement text"""
+        query_10, _ = OipaQueryBuilder.search_policies(search_term="x", limit=10)
+        query_50, _ = OipaQueryBuilder.search_policies(search_term="x", limit=50)
+        assert query_10 == query_50
+        
+        query_10, _ = OipaQueryBuilder.search_clients(search_term="x", limit=10)
+        query_50, _ = OipaQueryBuilder.search_clients(search_term="x", limit=50)
+        assert query_10 == query_50
     
     def test_enhanced_status_count_query(self):
         """Test enhanced status count with percentages"""
@@ -284,6 +526,36 @@ class TestEnhancedQueryBuilder:
         
         # Verify parameters
         assert params['client_guid'] == client_guid
+    
+    def test_policy_roles_query_by_number(self):
+        """Roles can be looked up by policy number for pipelining with the details query"""
+        query, params = OipaQueryBuilder.get_policy_roles(policy_number="VG01-002-561-000001063")
+        
+        assert "FROM AsRole r" in query
+        assert "SELECT PolicyGUID FROM AsPolicy WHERE PolicyNumber = :policy_number" in query
+        assert params == {'policy_number': "VG01-002-561-000001063"}
+        
+        with pytest.raises(ValueError):
+            OipaQueryBuilder.get_policy_roles()
+    
+    def test_by_keys_shapes(self):
+        """Bulk lookup shapes join the key set and expose the matched key"""
+        from oipa_mcp.connectors.database import KEYS_PLACEHOLDER
+        
+        shapes = [
+            OipaQueryBuilder.get_policy_details_by_keys("policy_number"),
+            OipaQueryBuilder.get_policy_details_by_keys("policy_guid"),
+            OipaQueryBuilder.get_policy_roles_by_keys("policy_number"),
+            OipaQueryBuilder.get_clients_by_keys()
+        ]
+        for shape in shapes:
+            assert KEYS_PLACEHOLDER in shape
+            assert "k.key_value as lookup_key" in shape
+        assert "k.key_value = p.PolicyNumber" in shapes[0]
+        assert "k.key_value = c.ClientGUID" in shapes[3]
+        
+        with pytest.raises(ValueError):
+            OipaQueryBuilder.get_policy_details_by_keys("tax_id")
 
 
 class TestPerformanceImprovements:
@@ -384,6 +656,59 @@ class TestErrorHandlingImprovements:
         assert db._pool is None
         assert db._initialized is False
     
+    @pytest.mark.asyncio
+    async def test_registered_components_start_and_stop(self):
+        """Components registered on a pool start after initialize and stop in reverse on close"""
+        db = OipaDatabase(Config())
+        assert db._startup_hooks == [] and db._shutdown_hooks == []
+        
+        calls = []
+        
+        async def load():
+            calls.append("load")
+        
+        def broken():
+            raise RuntimeError("not available")
+        
+        db.register_component(load)
+        db.register_component(broken)
+        db.register_component(lambda: calls.append("start a"), lambda: calls.append("stop a"))
+        db.register_component(lambda: calls.append("start b"), lambda: calls.append("stop b"))
+        
+        mock_pool = AsyncMock()
+        with patch.object(db, '_initialize_traditional', new=AsyncMock()), \
+             patch.object(db, 'warm_up', new=AsyncMock()), \
+             patch.object(db.health_monitor, 'start'), \
+             patch.object(db.autoscaler, 'start'):
+            await db.initialize()
+        assert calls == ["load", "start a", "start b"]
+        
+        db._pool = mock_pool
+        await db.close()
+        assert calls[3:] == ["stop b", "stop a"]
+        mock_pool.close.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_background_loops_do_not_inherit_caller_context(self):
+        """A lazy initialize() inside a tool call starts loops without that call's deadline or routing"""
+        from oipa_mcp.connectors.database import query_deadline, remaining_time, replica_reads, _replica_reads
+        
+        db = OipaDatabase(Config())
+        seen = []
+        
+        async def probe():
+            seen.append((remaining_time(), _replica_reads.get()))
+        
+        with patch.object(db, '_initialize_traditional', new=AsyncMock()), \
+             patch.object(db, 'warm_up', new=AsyncMock()), \
+             patch.object(db.health_monitor, '_run', new=probe), \
+             patch.object(db.autoscaler, '_run', new=probe):
+            with query_deadline(5), replica_reads():
+                await db.initialize()
+            await asyncio.gather(db.health_monitor._task, db.autoscaler._task)
+        
+        assert seen == [(None, False), (None, False)]
+    
     @pytest.mark.asyncio
     async def test_query_error_handling(self, mock_database):
         """Test query error handling and logging"""
@@ -411,6 +736,1441 @@ class TestErrorHandlingImprovements:
         mock_pool.release.assert_called_once_with(mock_connection)
 
 
+class TestPoolHealth:
+    """Test circuit breaker and pool health monitoring"""
+    
+    @staticmethod
+    def _oracle_error(full_code):
+        import oracledb
+        error_obj = Mock(full_code=full_code, is_session_dead=False)
+        return oracledb.DatabaseError(error_obj)
+    
+    def test_breaker_opens_after_threshold(self):
+        """Consecutive connectivity failures open the circuit"""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        assert breaker.allow_request()
+        
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+        assert breaker.get_status()["rejected_requests"] == 1
+    
+    def test_breaker_half_open_allows_single_trial(self):
+        """After the reset timeout only one trial request is let through"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request()
+        
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+    
+    def test_sql_errors_do_not_trip_breaker(self):
+        """Errors raised by a reachable database keep the circuit closed"""
+        db = OipaDatabase(Config())
+        db.circuit_breaker.failure_threshold = 1
+        
+        db._record_outcome(self._oracle_error("ORA-00942"))
+        assert db.circuit_breaker.state == CircuitBreaker.CLOSED
+        
+        db._record_outcome(self._oracle_error("DPY-4011"))
+        assert db.circuit_breaker.state == CircuitBreaker.OPEN
+    
+    @pytest.mark.asyncio
+    async def test_is_available_does_not_query(self):
+        """Hot-path availability check stays in memory"""
+        db = OipaDatabase(Config())
+        with patch.object(db, 'execute_scalar') as mock_execute:
+            assert await db.is_available() is True
+            mock_execute.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_monitor_probes_when_circuit_open(self):
+        """Monitor runs a probe to recover an open circuit"""
+        db = OipaDatabase(Config())
+        db.circuit_breaker.failure_threshold = 1
+        db.circuit_breaker.record_failure()
+        
+        with patch.object(db, 'test_connection', new=AsyncMock(return_value=True)) as mock_probe:
+            assert await db.health_monitor.check() is True
+            mock_probe.assert_awaited_once()
+
+
+class TestFetchPlanner:
+    """Test prefetch/arraysize planning per query shape"""
+    
+    def test_plans(self):
+        from oipa_mcp.connectors.database import FetchPlanner
+        
+        planner = FetchPlanner(default_array_size=1000)
+        
+        assert planner.plan("SELECT * FROM AsPolicy WHERE PolicyGUID = :g", expected_rows=1)[:2] == (2, 1)
+        
+        query, params = OipaQueryBuilder.search_policies("Garcia", limit=25)
+        plan = planner.plan(query, params)
+        assert (plan.prefetch_rows, plan.array_size, plan.reason) == (26, 25, "top_n")
+        assert planner.plan("SELECT x FROM t FETCH FIRST 10 ROWS ONLY").array_size == 10
+        
+        scan = planner.plan("SELECT * FROM AsPolicy")
+        assert scan.reason == "scan" and scan.array_size == 1000
+    
+    def test_history_and_round_trips(self):
+        from oipa_mcp.connectors.database import FetchPlan, FetchPlanner, query_shape
+        
+        planner = FetchPlanner(default_array_size=1000)
+        query = "SELECT * FROM AsRole WHERE PolicyGUID = :g"
+        
+        # Unknown shape: scan plan; 12 rows arrive with the execute
+        assert planner.record(query, planner.plan(query), 12) == 1
+        plan = planner.plan(query)
+        assert (plan.prefetch_rows, plan.array_size, plan.reason) == (13, 1000, "history")
+        # A result far larger than the recent ones still arrives in default-size batches
+        assert FetchPlanner.round_trips(plan, 3000) == 4
+        
+        # Exactly prefetch rows needs one more call to see the end of the result
+        assert FetchPlanner.round_trips(FetchPlan(2, 1, "single_row"), 1) == 1
+        assert FetchPlanner.round_trips(FetchPlan(2, 1, "single_row"), 2) == 2
+        assert FetchPlanner.round_trips(FetchPlan(1000, 1000, "scan"), 2500) == 3
+        
+        status = planner.get_status()["shapes"][query_shape(query)]
+        assert status["executions"] == 1 and status["avg_round_trips"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_single_row_lookup_cursor_settings(self):
+        db = OipaDatabase(Config())
+        db._initialized = True
+        mock_pool, _, mock_cursor = TestAsyncDatabaseOperations._streaming_pool([[('P1',)]])
+        db._pool = mock_pool
+        
+        row = await db.execute_single_query("SELECT PolicyNumber FROM AsPolicy WHERE PolicyGUID = :g", {"g": "G1"})
+        
+        assert row == {'policy_number': 'P1'}
+        assert (mock_cursor.prefetchrows, mock_cursor.arraysize) == (2, 1)
+        status = await db.get_pool_status()
+        assert list(status["fetch_planner"]["shapes"].values())[0]["avg_round_trips"] == 1
+
+
+class TestTransientRetry:
+    """Test retries of read-only statements after transient errors"""
+    
+    @pytest.fixture
+    def mock_database(self):
+        db = OipaDatabase(Config())
+        db._initialized = True
+        db.config.database.retry_attempts = 2
+        db.config.database.retry_backoff_ms = 1
+        db.config.database.retry_max_backoff_ms = 2
+        return db
+    
+    def test_classification(self):
+        from oipa_mcp.connectors.database import is_read_only_statement, is_retryable_error
+        
+        assert is_retryable_error(TestPoolHealth._oracle_error("ORA-03113"))
+        assert is_retryable_error(TestPoolHealth._oracle_error("DPY-4011"))
+        assert not is_retryable_error(TestPoolHealth._oracle_error("ORA-00942"))
+        assert not is_retryable_error(ValueError("not a database error"))
+        
+        assert is_read_only_statement("  SELECT 1 FROM DUAL")
+        assert is_read_only_statement("-- lookup\nWITH x AS (SELECT 1 FROM DUAL) SELECT * FROM x")
+        assert not is_read_only_statement("UPDATE AsPolicy SET StatusCode = '01'")
+    
+    @pytest.mark.asyncio
+    async def test_read_retried_on_fresh_connection(self, mock_database):
+        dead_connection = AsyncMock()
+        dead_connection.cursor = Mock(side_effect=TestPoolHealth._oracle_error("ORA-03113"))
+        good_connection = AsyncMock()
+        cursor = AsyncMock()
+        cursor.close = Mock()
+        cursor.description = [('X', None)]
+        cursor.fetchmany.side_effect = [[(1,)], []]
+        good_connection.cursor = Mock(return_value=cursor)
+        mock_database._pool = AsyncMock()
+        mock_database._pool.acquire.side_effect = [dead_connection, good_connection]
+        
+        result = await mock_database.execute_query("SELECT 1 AS x FROM DUAL")
+        
+        assert result == [{'x': 1}]
+        # The dead session is discarded, not returned to the pool
+        mock_database._pool.drop.assert_awaited_once_with(dead_connection)
+        mock_database._pool.release.assert_awaited_once_with(good_connection)
+        status = await mock_database.get_pool_status()
+        assert status["retries"]["attempted"] == 1
+        assert status["retries"]["succeeded"] == 1
+        assert status["retries"]["by_code"] == {"ORA-03113": 1}
+    
+    @pytest.mark.asyncio
+    async def test_retry_budget_and_writes(self, mock_database):
+        calls = []
+        
+        async def failing():
+            calls.append(1)
+            raise TestPoolHealth._oracle_error("ORA-03135")
+        
+        with pytest.raises(Exception):
+            await mock_database._with_retry(failing)
+        assert len(calls) == 3
+        assert mock_database.retries["exhausted"] == 1
+        
+        # Writes and non-transient errors are not retried
+        calls.clear()
+        with pytest.raises(Exception):
+            await mock_database._with_retry(failing, retry=False)
+        assert len(calls) == 1
+        
+        async def sql_error():
+            calls.append(1)
+            raise TestPoolHealth._oracle_error("ORA-00942")
+        
+        calls.clear()
+        with pytest.raises(Exception):
+            await mock_database._with_retry(sql_error)
+        assert len(calls) == 1
+
+
+class TestQueryDeadlines:
+    """Test per-call deadlines and server-side cancellation"""
+    
+    @pytest.fixture
+    def mock_database(self):
+        db = OipaDatabase(Config())
+        db._initialized = True
+        return db
+    
+    def test_nested_deadline_never_extends_outer(self):
+        from oipa_mcp.connectors.database import query_deadline, remaining_time
+        
+        assert remaining_time() is None
+        with query_deadline(5):
+            with query_deadline(60):
+                assert remaining_time() <= 5
+            with query_deadline(None):
+                assert remaining_time() <= 5
+        assert remaining_time() is None
+    
+    @pytest.mark.asyncio
+    async def test_call_timeout_set_from_deadline(self, mock_database):
+        from oipa_mcp.connectors.database import query_deadline
+        
+        mock_pool = AsyncMock()
+        mock_connection = AsyncMock()
+        mock_pool.acquire.return_value = mock_connection
+        mock_database._pool = mock_pool
+        
+        with query_deadline(10):
+            async with mock_database.get_connection() as conn:
+                assert 9000 < conn.call_timeout <= 10000
+        
+        # Reset before going back to the pool
+        assert mock_connection.call_timeout == 0
+        mock_pool.release.assert_called_once_with(mock_connection)
+    
+    @pytest.mark.asyncio
+    async def test_call_timeout_renewed_per_fetch(self, mock_database):
+        """Each fetchmany round trip only gets the time left before the deadline"""
+        from oipa_mcp.connectors.database import QueryTimeoutError, query_deadline
+        
+        mock_pool, mock_connection, mock_cursor = TestAsyncDatabaseOperations._streaming_pool([])
+        timeouts = []
+        
+        async def slow_fetch(size):
+            timeouts.append(mock_connection.call_timeout)
+            await asyncio.sleep(0.05)
+            return [('P1',)]
+        
+        mock_cursor.fetchmany.side_effect = slow_fetch
+        mock_database._pool = mock_pool
+        
+        with pytest.raises(QueryTimeoutError):
+            with query_deadline(0.12):
+                async for _ in mock_database.stream_batches("SELECT PolicyNumber FROM AsPolicy", batch_size=1):
+                    pass
+        
+        assert len(timeouts) == 3
+        assert 120 >= timeouts[0] > timeouts[1] > timeouts[2]
+        assert mock_database.timeouts == 1
+        mock_cursor.close.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_timed_out_call_is_reset_and_counted(self, mock_database):
+        from oipa_mcp.connectors.database import QueryTimeoutError, query_deadline
+        
+        mock_pool = AsyncMock()
+        mock_connection = AsyncMock()
+        mock_pool.acquire.return_value = mock_connection
+        mock_database._pool = mock_pool
+        
+        with pytest.raises(QueryTimeoutError):
+            with query_deadline(10):
+                async with mock_database.get_connection():
+                    raise TestPoolHealth._oracle_error("DPY-4024")
+        
+        mock_connection.rollback.assert_awaited_once()
+        mock_connection.ping.assert_awaited_once()
+        mock_pool.release.assert_called_once_with(mock_connection)
+        assert mock_database.timeouts == 1
+        # A timeout proves the database answered; the breaker stays closed
+        assert mock_database.circuit_breaker.state == CircuitBreaker.CLOSED
+    
+    @pytest.mark.asyncio
+    async def test_unrecoverable_connection_is_dropped(self, mock_database):
+        from oipa_mcp.connectors.database import QueryTimeoutError
+        
+        mock_pool = AsyncMock()
+        mock_connection = AsyncMock()
+        mock_connection.ping.side_effect = Exception("session gone")
+        mock_pool.acquire.return_value = mock_connection
+        mock_database._pool = mock_pool
+        
+        with pytest.raises(QueryTimeoutError):
+            async with mock_database.get_connection():
+                raise TestPoolHealth._oracle_error("DPY-4024")
+        
+        mock_pool.drop.assert_awaited_once_with(mock_connection)
+        mock_pool.release.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_expired_deadline_skips_acquire(self, mock_database):
+        from oipa_mcp.connectors.database import QueryTimeoutError, query_deadline
+        
+        mock_database._pool = AsyncMock()
+        with query_deadline(0.001):
+            await asyncio.sleep(0.01)
+            with pytest.raises(QueryTimeoutError):
+                async with mock_database.get_connection():
+                    pass
+        mock_database._pool.acquire.assert_not_called()
+    
+    def test_tool_timeout_overrides(self):
+        from oipa_mcp.tools.policy_tools import PolicyCountsByStatusSmall
+        
+        tool = PolicyCountsByStatusSmall()
+        tool.config = Config()
+        tool.config.performance.query_timeout = 30
+        assert tool.get_timeout() == 30
+        
+        tool.timeout = 90
+        assert tool.get_timeout() == 90
+        
+        tool.config.performance.tool_timeouts = {"OIPA_POLICY_COUNTS_BY_STATUS": "120"}
+        assert tool.get_timeout() == 120
+
+
+class TestPoolSizing:
+    """Test pool warm-up and acquire-wait driven autoscaling"""
+    
+    @staticmethod
+    def _database(opened=0, busy=0):
+        config = Config()
+        config.database.pool_min_size = 1
+        config.database.pool_max_size = 10
+        db = OipaDatabase(config)
+        db._pool = AsyncMock()
+        db._pool.opened = opened
+        db._pool.busy = busy
+        db._pool.max = 10
+        db._pool.min = 1
+        db._pool.increment = 1
+        db._pool.timeout = 30
+        del db._pool.reconfigure
+        db._initialized = True
+        return db
+    
+    @pytest.mark.asyncio
+    async def test_warm_up_opens_sessions_concurrently(self):
+        db = self._database(opened=1)
+        
+        assert await db.warm_up(4) == 3
+        assert db._pool.acquire.call_count == 3
+        assert db._pool.release.await_count == 3
+        
+        # Already warm: nothing to do
+        db._pool.opened = 4
+        assert await db.warm_up(4) == 0
+    
+    @pytest.mark.asyncio
+    async def test_autoscaler_grows_on_slow_acquires(self):
+        db = self._database(opened=2, busy=1)
+        scaler = db.autoscaler
+        scaler.wait_target = 0.05
+        
+        for _ in range(10):
+            scaler.record_acquire(0.2)
+        
+        with patch.object(db, 'warm_up', new=AsyncMock(return_value=1)) as mock_warm_up:
+            assert await scaler.check() == "grow"
+            mock_warm_up.assert_awaited_once_with(scaler.target_min)
+        assert scaler.target_min == 2
+        assert scaler.increment == 2
+    
+    @pytest.mark.asyncio
+    async def test_autoscaler_shrinks_within_bounds(self):
+        db = self._database(opened=5, busy=0)
+        scaler = db.autoscaler
+        scaler.target_min, scaler.increment = 2, 2
+        
+        with patch.object(db, 'warm_up', new=AsyncMock(return_value=0)):
+            assert await scaler.check() == "shrink"
+            assert (scaler.target_min, scaler.increment) == (1, 1)
+            # Already at the floor
+            assert await scaler.check() is None
+        assert scaler.get_status()["recent_decisions"][-1]["decision"] == "shrink"
+    
+    @pytest.mark.asyncio
+    async def test_autoscaler_uses_reconfigure_when_available(self):
+        db = self._database(opened=2, busy=2)
+        db._pool.reconfigure = Mock()
+        
+        assert await db.autoscaler.check() == "grow"
+        db._pool.reconfigure.assert_called_once_with(min=2, increment=2)
+
+
+class TestReplicaRouting:
+    """Test read-only replica routing and fallback to the primary"""
+    
+    @pytest.fixture
+    def mock_database(self):
+        db = OipaDatabase(Config())
+        db._initialized = True
+        db._pool = AsyncMock()
+        db.replica.pool = AsyncMock()
+        db.replica.max_lag = 30
+        db.replica.lag = 2.0
+        return db
+    
+    def test_parse_lag_seconds(self):
+        from datetime import timedelta
+        from oipa_mcp.connectors.database import parse_lag_seconds
+        
+        assert parse_lag_seconds("+00 00:00:05") == 5
+        assert parse_lag_seconds("+01 02:03:04.5") == 86400 + 7384.5
+        assert parse_lag_seconds(timedelta(seconds=12)) == 12
+        assert parse_lag_seconds(None) is None
+        assert parse_lag_seconds("n/a") is None
+    
+    @pytest.mark.asyncio
+    async def test_reads_use_replica_only_when_allowed(self, mock_database):
+        from oipa_mcp.connectors.database import replica_reads
+        
+        async with mock_database.get_connection(read_only=True):
+            pass
+        with replica_reads():
+            async with mock_database.get_connection():
+                pass
+            async with mock_database.get_connection(read_only=True):
+                pass
+        
+        assert mock_database._pool.acquire.call_count == 2
+        assert mock_database.replica.pool.acquire.call_count == 1
+        mock_database.replica.pool.release.assert_awaited_once()
+        assert mock_database.replica.routed == 1
+    
+    @pytest.mark.asyncio
+    async def test_lagging_replica_falls_back(self, mock_database):
+        from oipa_mcp.connectors.database import replica_reads
+        
+        mock_database.replica.lag = 120.0
+        with replica_reads():
+            async with mock_database.get_connection(read_only=True):
+                pass
+        
+        mock_database.replica.pool.acquire.assert_not_called()
+        mock_database._pool.acquire.assert_called_once()
+        assert mock_database.replica.fallbacks["lagging"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_replica_acquire_failure_falls_back(self, mock_database):
+        from oipa_mcp.connectors.database import replica_reads
+        
+        mock_database.replica.pool.acquire.side_effect = TestPoolHealth._oracle_error("DPY-6005")
+        with replica_reads():
+            async with mock_database.get_connection(read_only=True):
+                pass
+        
+        mock_database._pool.release.assert_awaited_once()
+        assert mock_database.replica.fallbacks["acquire_failed"] == 1
+        assert mock_database.replica.circuit_breaker.total_failures == 1
+        # The primary's breaker is not blamed for the replica
+        assert mock_database.circuit_breaker.total_failures == 0
+    
+    @pytest.mark.asyncio
+    async def test_replica_acquire_timeout_falls_back(self, mock_database):
+        from oipa_mcp.connectors.database import query_deadline, replica_reads
+        
+        async def never_acquired(*args, **kwargs):
+            await asyncio.sleep(10)
+        
+        mock_database.replica.pool.acquire.side_effect = never_acquired
+        with replica_reads(), query_deadline(0.2):
+            async with mock_database.get_connection(read_only=True):
+                pass
+        
+        mock_database._pool.release.assert_awaited_once()
+        assert mock_database.replica.fallbacks["acquire_failed"] == 1
+        assert mock_database.replica.circuit_breaker.total_failures == 1
+        assert mock_database.timeouts == 0
+    
+    def test_session_keys_distinguish_databases(self):
+        from oipa_mcp.connectors.database import SessionInitializer
+        
+        primary = Mock(dsn="primary:1521/OIPA", session_id=42, serial_num=7)
+        replica = Mock(dsn="standby:1521/OIPA", session_id=42, serial_num=7)
+        assert SessionInitializer._session_key(primary) != SessionInitializer._session_key(replica)
+    
+    @pytest.mark.asyncio
+    async def test_lag_check(self, mock_database):
+        mock_connection = AsyncMock()
+        mock_cursor = AsyncMock()
+        mock_cursor.close = Mock()
+        mock_cursor.fetchone.return_value = ("+00 00:00:07",)
+        mock_connection.cursor = Mock(return_value=mock_cursor)
+        mock_database.replica.pool.acquire.return_value = mock_connection
+        
+        assert await mock_database.replica.check() == 7
+        assert mock_connection.call_timeout == 0
+        mock_database.replica.pool.release.assert_awaited_once_with(mock_connection)
+        assert mock_database.replica.get_status()["lag_seconds"] == 7
+    
+    @pytest.mark.asyncio
+    async def test_failed_lag_check_resets_call_timeout(self, mock_database):
+        mock_connection = AsyncMock()
+        mock_cursor = AsyncMock()
+        mock_cursor.close = Mock()
+        mock_cursor.execute.side_effect = TestPoolHealth._oracle_error("ORA-00942")
+        mock_connection.cursor = Mock(return_value=mock_cursor)
+        mock_database.replica.pool.acquire.return_value = mock_connection
+        
+        assert await mock_database.replica.check() is None
+        assert mock_connection.call_timeout == 0
+        mock_database.replica.pool.release.assert_awaited_once_with(mock_connection)
+        
+        # A timed-out check drops the session instead of returning it to the pool
+        mock_cursor.execute.side_effect = TestPoolHealth._oracle_error("DPY-4024")
+        await mock_database.replica.check()
+        mock_database.replica.pool.drop.assert_awaited_once_with(mock_connection)
+        assert mock_database.replica.pool.release.await_count == 1
+    
+    def test_tool_routing_defaults(self):
+        from oipa_mcp.tools.base import TransactionTool
+        from oipa_mcp.tools.policy_tools import PolicyCountsByStatusSmall, SearchPoliciesQuality
+        
+        assert SearchPoliciesQuality.use_replica is True
+        assert PolicyCountsByStatusSmall.use_replica is True
+        assert TransactionTool.use_replica is False
+
+
+class TestDrcp:
+    """Test Database Resident Connection Pooling support"""
+    
+    @staticmethod
+    def _drcp_config(**overrides):
+        config = Config()
+        config.database.host = "testhost"
+        config.database.service_name = "TEST"
+        config.database.username = "oipa"
+        config.database.drcp_enabled = True
+        config.database.drcp_connection_class = "OIPAMCP"
+        config.database.drcp_purity = "self"
+        for name, value in overrides.items():
+            setattr(config.database, name, value)
+        return config
+    
+    def test_pooled_dsn_and_pool_params(self):
+        import oracledb
+        
+        config = self._drcp_config()
+        assert config.database.dsn == "testhost:1521/TEST:pooled"
+        
+        params = OipaDatabase(config)._drcp_params()
+        assert params == {"cclass": "OIPAMCP", "purity": oracledb.PURITY_SELF}
+        
+        # Wallet aliases cannot carry the :pooled suffix
+        wallet_params = OipaDatabase(self._drcp_config(connection_type="cloud_wallet"))._drcp_params()
+        assert wallet_params["server_type"] == "pooled"
+    
+    def test_invalid_purity_rejected(self):
+        db = OipaDatabase(self._drcp_config(drcp_purity="reuse"))
+        with pytest.raises(ValueError, match="OIPA_DB_DRCP_PURITY"):
+            db._drcp_params()
+    
+    def test_disabled_by_default(self):
+        db = OipaDatabase(Config())
+        assert db._drcp_params() == {}
+        assert not db.config.database.dsn.endswith(":pooled")
+    
+    @pytest.mark.asyncio
+    async def test_reuse_statistics(self):
+        db = OipaDatabase(self._drcp_config())
+        db.execute_single_query = AsyncMock(return_value={
+            "num_requests": 200, "num_hits": 190, "num_misses": 10, "num_waits": 0
+        })
+        
+        stats = await db.refresh_drcp_stats()
+        
+        assert stats["reuse_ratio"] == 0.95
+        db.execute_single_query.assert_awaited_once()
+        assert db.execute_single_query.call_args[0][1] == {"cclass_name": "OIPA.OIPAMCP"}
+        assert db._drcp_status()["server_stats"] is stats
+
+
+class TestSessionInitialization:
+    """Test once-per-session initialization via the pool session callback"""
+    
+    @pytest.fixture
+    def db_config(self):
+        return DatabaseConfig(
+            default_schema="OIPA",
+            session_nls={"NLS_DATE_FORMAT": "YYYY-MM-DD"},
+            session_module="oipa-mcp"
+        )
+    
+    def test_single_alter_session_statement(self, db_config):
+        """Schema and NLS settings are combined into one statement"""
+        initializer = SessionInitializer(db_config)
+        
+        assert initializer.alter_session_sql == (
+            "ALTER SESSION SET CURRENT_SCHEMA = OIPA NLS_DATE_FORMAT = 'YYYY-MM-DD'"
+        )
+        assert "SCHEMA=OIPA" in initializer.tag
+        assert "MODULE=oipa-mcp" in initializer.tag
+    
+    def test_invalid_schema_rejected(self):
+        """Schema names are validated before being interpolated"""
+        with pytest.raises(ValueError):
+            SessionInitializer(DatabaseConfig(default_schema="OIPA; DROP TABLE x"))
+    
+    @pytest.mark.asyncio
+    async def test_callback_runs_once_per_physical_connection(self, db_config):
+        """Repeated acquires of the same session do not re-run ALTER SESSION"""
+        initializer = SessionInitializer(db_config)
+        connection = Mock(session_id=101, serial_num=7)
+        cursor = AsyncMock()
+        connection.cursor = Mock(return_value=cursor)
+        cursor.close = Mock()
+        
+        for _ in range(3):
+            await initializer.ensure(connection)
+        
+        cursor.execute.assert_awaited_once_with(initializer.alter_session_sql)
+        assert connection.tag == initializer.tag
+        assert connection.module == "oipa-mcp"
+        status = initializer.get_status()
+        assert status["acquires"] == 3
+        assert status["callback_invocations"] == 1
+        
+        # A new physical session gets initialized
+        await initializer.ensure(Mock(session_id=102, serial_num=1, cursor=Mock(return_value=cursor)))
+        assert initializer.get_status()["callback_invocations"] == 2
+
+
+class TestStatementCache:
+    """Test statement cache hit/miss accounting"""
+    
+    def test_hits_and_misses_per_session(self):
+        from oipa_mcp.connectors.database import StatementCacheTracker, query_shape
+        
+        tracker = StatementCacheTracker(cache_size=2)
+        session_a = Mock(session_id=1, serial_num=1)
+        session_b = Mock(session_id=2, serial_num=1)
+        
+        assert tracker.record(session_a, "SELECT 1 FROM DUAL") is False
+        assert tracker.record(session_a, "SELECT 1 FROM DUAL") is True
+        # Each physical session has its own cache
+        assert tracker.record(session_b, "SELECT 1 FROM DUAL") is False
+        
+        # LRU eviction once the cache is full
+        tracker.record(session_a, "SELECT 2 FROM DUAL")
+        tracker.record(session_a, "SELECT 3 FROM DUAL")
+        assert tracker.record(session_a, "SELECT 1 FROM DUAL") is False
+        
+        status = tracker.get_status()
+        assert status["hits"] == 1
+        assert status["misses"] == 5
+        shape = status["shapes"][query_shape("SELECT 1 FROM DUAL")]
+        assert shape["hits"] == 1 and shape["misses"] == 3
+    
+    def test_query_shape_ignores_whitespace(self):
+        from oipa_mcp.connectors.database import query_shape
+        
+        assert query_shape("SELECT 1\n  FROM DUAL") == query_shape("SELECT 1 FROM DUAL")
+
+
+class TestRowFormats:
+    """Test selectable result row shapes"""
+    
+    COLUMNS = ('policy_guid', 'policy_number', 'class')
+    ROWS = [('G1', 'P1', 'A'), ('G2', 'P2', 'B')]
+    
+    def test_record_class_cached_per_shape(self):
+        """Record classes are generated once per column tuple"""
+        from oipa_mcp.connectors.rows import record_class
+        
+        assert record_class(self.COLUMNS) is record_class(self.COLUMNS)
+        assert not hasattr(record_class(self.COLUMNS)(1, 2, 3), '__dict__')
+    
+    def test_record_supports_mapping_access(self):
+        """Records work with existing dict-style formatting code"""
+        from oipa_mcp.connectors.rows import convert_rows
+        
+        records = convert_rows(self.COLUMNS, self.ROWS, "record")
+        
+        assert records[0]["policy_number"] == 'P1'
+        assert records[0].policy_guid == 'G1'
+        assert records[0]["class"] == 'A'  # keyword column names still work
+        assert records[1].get("missing", "x") == "x"
+        assert records[0] == {'policy_guid': 'G1', 'policy_number': 'P1', 'class': 'A'}
+    
+    def test_columnar_and_tuple_formats(self):
+        """Column batches and raw tuples"""
+        from oipa_mcp.connectors.rows import convert_rows
+        
+        assert convert_rows(self.COLUMNS, self.ROWS, "columns") == {
+            'policy_guid': ['G1', 'G2'],
+            'policy_number': ['P1', 'P2'],
+            'class': ['A', 'B']
+        }
+        assert convert_rows(self.COLUMNS, [], "columns")['policy_guid'] == []
+        assert convert_rows(self.COLUMNS, self.ROWS, "tuple") is self.ROWS
+        
+        with pytest.raises(ValueError):
+            convert_rows(self.COLUMNS, self.ROWS, "xml")
+
+
+class TestArrowFetch:
+    """Test the columnar Arrow/DataFrame fetch path"""
+    
+    @pytest.fixture
+    def mock_database(self):
+        db = OipaDatabase(Config())
+        db._initialized = True
+        return db
+    
+    @pytest.mark.asyncio
+    async def test_native_dataframe_batches(self, mock_database):
+        """Drivers with DataFrame support skip the cursor entirely"""
+        pa = pytest.importorskip("pyarrow")
+        
+        frames = [
+            pa.table({'STATUS_CODE': ['01', '08'], 'POLICY_COUNT': [15000, 1200]}),
+            pa.table({'STATUS_CODE': ['99'], 'POLICY_COUNT': [800]})
+        ]
+        
+        async def fetch_df_batches(statement, parameters, size):
+            for frame in frames:
+                yield frame
+        
+        mock_pool = AsyncMock()
+        mock_connection = AsyncMock()
+        mock_connection.fetch_df_batches = Mock(side_effect=fetch_df_batches)
+        mock_pool.acquire.return_value = mock_connection
+        mock_database._pool = mock_pool
+        
+        table = await mock_database.fetch_arrow("SELECT ... FROM AsPolicy", batch_size=2)
+        
+        assert table.column_names == ['status_code', 'policy_count']
+        assert table.num_rows == 3
+        assert mock_database.dataframe_fetches == {"native": 1, "fallback": 0}
+        mock_connection.cursor.assert_not_called()
+        mock_pool.release.assert_called_once_with(mock_connection)
+    
+    @pytest.mark.asyncio
+    async def test_fallback_without_driver_support(self, mock_database):
+        """Older drivers fall back to fetchmany batches converted column-wise"""
+        pytest.importorskip("pyarrow")
+        
+        mock_pool, mock_connection, mock_cursor = TestAsyncDatabaseOperations._streaming_pool([
+            [('P1',), ('P2',)],
+            [('P3',)]
+        ])
+        del mock_connection.fetch_df_batches
+        mock_database._pool = mock_pool
+        
+        tables = [
+            table async for table in mock_database.stream_arrow(
+                "SELECT PolicyNumber FROM AsPolicy", batch_size=2
+            )
+        ]
+        
+        assert [table.to_pydict() for table in tables] == [
+            {'policy_number': ['P1', 'P2']},
+            {'policy_number': ['P3']}
+        ]
+        assert mock_database.dataframe_fetches == {"native": 0, "fallback": 1}
+        mock_cursor.close.assert_called_once()
+        mock_pool.release.assert_called_once_with(mock_connection)
+    
+    @pytest.mark.asyncio
+    async def test_row_cap_applies_to_arrow_fetches(self, mock_database):
+        """fetch_arrow stops at the same row cap as execute_query and reports it"""
+        pa = pytest.importorskip("pyarrow")
+        from oipa_mcp.connectors.database import collect_truncations, truncation_notes
+        
+        frames = [pa.table({'POLICY_NUMBER': [f'P{i}', f'P{i + 1}']}) for i in range(0, 10, 2)]
+        fetched = []
+        
+        async def fetch_df_batches(statement, parameters, size):
+            for frame in frames:
+                fetched.append(frame)
+                yield frame
+        
+        mock_pool = AsyncMock()
+        mock_connection = AsyncMock()
+        mock_connection.fetch_df_batches = Mock(side_effect=fetch_df_batches)
+        mock_pool.acquire.return_value = mock_connection
+        mock_database._pool = mock_pool
+        mock_database.config.performance.max_query_results = 3
+        
+        with collect_truncations():
+            table = await mock_database.fetch_arrow("SELECT PolicyNumber FROM AsPolicy", batch_size=2)
+            notes = truncation_notes()
+        
+        assert table.num_rows == 3
+        assert len(fetched) == 2
+        assert notes[0]["reason"] == "row_limit" and notes[0]["rows_scanned"] == 4
+        assert mock_database.truncations["row_limit"] == 1
+        assert mock_connection.fetch_df_batches.call_args.kwargs["size"] == 2
+        
+        # The driver is never asked for more than the cap plus one row per batch
+        await mock_database.fetch_arrow("SELECT PolicyNumber FROM AsPolicy")
+        assert mock_connection.fetch_df_batches.call_args.kwargs["size"] == 4
+
+
+class TestFetchByKeys:
+    """Test array-bound bulk lookups"""
+    
+    SHAPE = "SELECT k.key_value as lookup_key, p.PolicyName as policy_name FROM AsPolicy p JOIN {keys} k ON k.key_value = p.PolicyNumber"
+    
+    @staticmethod
+    def _lookup_database(rows):
+        db = OipaDatabase(Config())
+        db._initialized = True
+        db._pool = AsyncMock()
+        mock_connection = AsyncMock()
+        mock_cursor = AsyncMock()
+        mock_cursor.close = Mock()
+        mock_cursor.description = [('LOOKUP_KEY', None), ('POLICY_NAME', None)]
+        # Every execute yields the rows once, then end of fetch
+        mock_cursor.fetchmany.side_effect = itertools.cycle([rows, []])
+        mock_connection.cursor = Mock(return_value=mock_cursor)
+        key_list_type = Mock()
+        key_list_type.newobject = Mock(side_effect=lambda keys: ("collection", tuple(keys)))
+        mock_connection.gettype.return_value = key_list_type
+        db._pool.acquire.return_value = mock_connection
+        return db, mock_connection, mock_cursor
+    
+    @pytest.mark.asyncio
+    async def test_collection_bind_groups_rows_by_key(self):
+        db, mock_connection, mock_cursor = self._lookup_database([('P2', 'Beta'), ('P1', 'Alpha')])
+        
+        results = await db.fetch_by_keys(self.SHAPE, ['P1', 'P2', 'P1', 'P3'])
+        
+        assert list(results) == ['P1', 'P2', 'P3']
+        assert results['P1'] == [{'policy_name': 'Alpha'}]
+        assert results['P3'] == []
+        query, params = mock_cursor.execute.call_args[0]
+        assert "TABLE(:lookup_keys)" in query and "{keys}" not in query
+        assert params['lookup_keys'] == ("collection", ('P1', 'P2', 'P3'))
+        # One statement for all keys; the collection type is looked up once per session
+        mock_cursor.execute.assert_awaited_once()
+        await db.fetch_by_keys(self.SHAPE, ['P4'])
+        mock_connection.gettype.assert_awaited_once_with("SYS.ODCIVARCHAR2LIST")
+    
+    @pytest.mark.asyncio
+    async def test_large_key_lists_use_temp_table(self):
+        db, mock_connection, mock_cursor = self._lookup_database([('P1', 'Alpha')])
+        db.config.database.keys_gtt = "OIPA_MCP_KEYS"
+        db.config.database.keys_gtt_threshold = 2
+        
+        results = await db.fetch_by_keys(self.SHAPE, ['P1', 'P2', 'P3'])
+        
+        assert results['P1'] == [{'policy_name': 'Alpha'}]
+        mock_cursor.executemany.assert_awaited_once_with(
+            "INSERT INTO OIPA_MCP_KEYS (key_value) VALUES (:1)", [('P1',), ('P2',), ('P3',)]
+        )
+        assert "FROM OIPA_MCP_KEYS" in mock_cursor.execute.call_args[0][0]
+        mock_connection.rollback.assert_awaited_once()
+        mock_connection.gettype.assert_not_called()
+        assert db.key_lookups == {"collection": 0, "temp_table": 1}
+    
+    @pytest.mark.asyncio
+    async def test_shape_requires_placeholder(self):
+        db = OipaDatabase(Config())
+        with pytest.raises(ValueError):
+            await db.fetch_by_keys("SELECT 1 FROM DUAL", ['P1'])
+
+
+class TestBulkDml:
+    """Test the chunked bulk DML engine behind execute_many"""
+    
+    QUERY = "UPDATE AsPolicy SET StatusCode = :status WHERE PolicyGUID = :policy_id"
+    
+    @staticmethod
+    def _bulk_database(chunk_results):
+        """Database whose pooled cursors play back one (batch errors, row counts) pair or error per chunk"""
+        db = OipaDatabase(Config())
+        db._initialized = True
+        db._pool = AsyncMock()
+        cursors = []
+        
+        def make_cursor():
+            outcome = chunk_results[len(cursors)]
+            cursor = AsyncMock()
+            cursor.close = Mock()
+            
+            # Yield to the event loop like a network round trip so concurrent chunks interleave
+            async def executemany(*args, **kwargs):
+                await asyncio.sleep(0)
+                if isinstance(outcome, Exception):
+                    raise outcome
+            
+            cursor.executemany.side_effect = executemany
+            if not isinstance(outcome, Exception):
+                errors, counts = outcome
+                cursor.getbatcherrors = Mock(return_value=errors)
+                cursor.getarraydmlrowcounts = Mock(return_value=counts)
+                cursor.rowcount = sum(counts)
+            cursors.append(cursor)
+            return cursor
+        
+        connection = AsyncMock()
+        connection.cursor = Mock(side_effect=make_cursor)
+        db._pool.acquire.return_value = connection
+        return db, connection, cursors
+    
+    @staticmethod
+    def _rows(count):
+        return [{'policy_id': str(i), 'status': '01'} for i in range(count)]
+    
+    @pytest.mark.asyncio
+    async def test_chunks_with_batch_errors_and_row_counts(self):
+        bad_row = Mock(offset=1, full_code="ORA-01407", message="cannot update to NULL")
+        db, connection, cursors = self._bulk_database([
+            ([], [1, 1]),
+            ([bad_row], [1, 0]),
+            ([], [1])
+        ])
+        
+        result = await db.execute_many(self.QUERY, self._rows(5), chunk_size=2, row_counts=True)
+        
+        assert result.chunks == 3 and result.committed_chunks == 3 and result.complete
+        assert result.rows_affected == 4
+        assert result.row_counts == [1, 1, 1, 0, 1]
+        assert result.errors == [{"row": 3, "code": "ORA-01407", "message": "cannot update to NULL"}]
+        assert result.resume_offset == 5
+        assert connection.commit.await_count == 3
+        cursors[0].executemany.assert_awaited_once_with(
+            self.QUERY, self._rows(2), batcherrors=True, arraydmlrowcounts=True
+        )
+    
+    @pytest.mark.asyncio
+    async def test_failed_chunk_is_resumable(self):
+        db, connection, _ = self._bulk_database([
+            ([], [1, 1]),
+            TestPoolHealth._oracle_error("DPY-4011")
+        ])
+        
+        with pytest.raises(BulkDmlError) as error_info:
+            await db.execute_many(self.QUERY, self._rows(6), chunk_size=2)
+        
+        result = error_info.value.result
+        assert result.committed_chunks == 1
+        assert result.failed_chunks[0]["offset"] == 2
+        assert result.resume_offset == 2
+        # Sequential loads stop at the failed chunk
+        assert db._pool.acquire.call_count == 2
+        connection.rollback.assert_awaited_once()
+        
+        # Restarting from resume_offset only sends the remaining rows
+        db, _, cursors = self._bulk_database([([], [1, 1]), ([], [1, 1])])
+        result = await db.execute_many(self.QUERY, self._rows(6), chunk_size=2, start_offset=2)
+        assert result.rows == 4 and result.resume_offset == 6
+        assert cursors[0].executemany.call_args[0][1] == self._rows(6)[2:4]
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_failure_reports_committed_ranges(self):
+        dml_error = TestPoolHealth._oracle_error("ORA-00001")
+        db, connection, _ = self._bulk_database([([], [1, 1]), dml_error, ([], [1, 1]), ([], [1, 1])])
+        connection.rollback.side_effect = TestPoolHealth._oracle_error("DPY-4011")
+        
+        with pytest.raises(BulkDmlError) as error_info:
+            await db.execute_many(self.QUERY, self._rows(10), chunk_size=2, concurrency=4)
+        
+        # The original DML error survives the failed rollback
+        result = error_info.value.result
+        assert result.failed_chunks[0]["error"] == str(dml_error)
+        assert result.resume_offset == 2
+        # Chunks in flight when the second one failed still committed
+        assert result.committed_ranges == [(4, 6), (6, 8)]
+        
+        # Resuming skips them, so no row is applied twice
+        db, _, cursors = self._bulk_database([([], [1, 1]), ([], [1, 1])])
+        result = await db.execute_many(
+            self.QUERY, self._rows(10), chunk_size=2, start_offset=result.resume_offset,
+            skip_ranges=result.committed_ranges
+        )
+        assert [cursor.executemany.call_args[0][1] for cursor in cursors] == [self._rows(10)[2:4], self._rows(10)[8:10]]
+        assert result.complete and result.resume_offset == 10 and result.committed_ranges == []
+    
+    @pytest.mark.asyncio
+    async def test_non_driver_failure_keeps_result(self):
+        from oipa_mcp.connectors.database import QueryTimeoutError
+        
+        db, _, _ = self._bulk_database([([], [1, 1]), QueryTimeoutError("deadline"), ([], [1, 1]), ([], [1, 1])])
+        
+        with pytest.raises(BulkDmlError) as error_info:
+            await db.execute_many(self.QUERY, self._rows(10), chunk_size=2, concurrency=4)
+        
+        result = error_info.value.result
+        assert result.failed_chunks == [{"offset": 2, "rows": 2, "error": "deadline"}]
+        assert result.resume_offset == 2
+        assert result.committed_ranges == [(4, 6), (6, 8)]
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_chunks_use_several_connections(self):
+        db, _, _ = self._bulk_database([([], [1, 1])] * 4)
+        
+        result = await db.execute_many(self.QUERY, self._rows(8), chunk_size=2, concurrency=4)
+        
+        assert result.complete and result.rows_affected == 8
+        assert db._pool.acquire.call_count == 4
+        assert db._pool.release.await_count == 4
+
+
+class TestLatencyMetrics:
+    """Test hot-path latency histograms"""
+    
+    def test_histogram_percentiles_within_bucket_error(self):
+        from oipa_mcp.connectors.metrics import LatencyHistogram
+        
+        histogram = LatencyHistogram()
+        for ms in range(1, 1001):
+            histogram.record(ms / 1000)
+        
+        assert histogram.count == 1000
+        assert histogram.percentile(0.5) == pytest.approx(0.5, rel=0.06)
+        assert histogram.percentile(0.99) == pytest.approx(0.99, rel=0.06)
+        assert histogram.percentile(1.0) == 1.0
+        status = histogram.get_status()
+        assert status["min_ms"] == 1.0 and status["max_ms"] == 1000.0
+    
+    def test_recorder_labels_and_bounded_series(self, tmp_path):
+        import json
+        from oipa_mcp.connectors.metrics import LatencyRecorder
+        
+        recorder = LatencyRecorder(max_series=3)
+        with recorder.tool("oipa_search_policies"):
+            recorder.record("execute", 0.010, shape="aaa")
+            recorder.record("execute", 0.020, shape="bbb")
+        recorder.record("acquire", 0.001)
+        # Past max_series new shapes fold into "other"
+        recorder.record("execute", 0.030, shape="ccc", tool="oipa_search_policies")
+        
+        series = recorder.snapshot(tool="oipa_search_policies")
+        assert {entry["shape"] for entry in series} == {"aaa", "bbb", "other", "-"}
+        assert next(entry for entry in series if entry["phase"] == "tool")["count"] == 1
+        assert recorder.snapshot(phase="acquire")[0]["tool"] == "-"
+        assert recorder.summary()["execute"]["count"] == 3
+        
+        path = tmp_path / "latency.json"
+        assert recorder.dump(str(path)) == 5
+        dumped = json.loads(path.read_text())
+        assert sum(dumped["series"][0]["buckets_ms"].values()) == dumped["series"][0]["count"]
+    
+    def test_disabled_recorder_records_nothing(self):
+        from oipa_mcp.connectors.metrics import LatencyRecorder
+        
+        recorder = LatencyRecorder(enabled=False)
+        with recorder.time("execute"):
+            pass
+        recorder.record("fetch", 0.1)
+        assert recorder.get_status()["series"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_query_phases_recorded_per_shape(self):
+        from oipa_mcp.connectors.database import query_shape
+        from oipa_mcp.connectors.metrics import LatencyRecorder
+        
+        db = OipaDatabase(Config())
+        db._initialized = True
+        db.latency = LatencyRecorder()
+        mock_pool, _, mock_cursor = TestAsyncDatabaseOperations._streaming_pool([[('P1',)]])
+        db._pool = mock_pool
+        
+        query = "SELECT PolicyNumber FROM AsPolicy"
+        with db.latency.tool("oipa_search_policies"):
+            await db.execute_query(query)
+        
+        report = db.get_latency_report(tool="oipa_search_policies", shape=query_shape(query))
+        assert {entry["phase"] for entry in report} == {"execute", "fetch", "convert"}
+        assert db.get_latency_report(phase="acquire")[0]["count"] == 1
+        status = await db.get_pool_status()
+        assert set(status["latency"]["phases"]) == {"acquire", "execute", "fetch", "convert", "tool"}
+
+
+class TestResultCaps:
+    """Hard row and byte caps on fetched results"""
+    
+    @pytest.fixture
+    def mock_database(self):
+        db = OipaDatabase(Config())
+        db._initialized = True
+        return db
+    
+    @pytest.mark.asyncio
+    async def test_row_cap_stops_fetching_early(self, mock_database):
+        from oipa_mcp.connectors import collect_truncations
+        
+        mock_pool, _, mock_cursor = TestAsyncDatabaseOperations._streaming_pool(
+            [[(f'P{i}',) for i in range(3)]] * 10
+        )
+        mock_database._pool = mock_pool
+        mock_database.config.performance.max_query_results = 5
+        
+        with collect_truncations() as notes:
+            results = await mock_database.execute_query("SELECT PolicyNumber FROM AsPolicy")
+        
+        assert len(results) == 5
+        # Two batches cover the cap plus one; the rest is never fetched
+        assert mock_cursor.fetchmany.await_count == 2
+        mock_cursor.close.assert_called_once()
+        assert notes == [{
+            "shape": notes[0]["shape"], "reason": "row_limit", "rows_returned": 5, "rows_scanned": 6
+        }]
+        status = await mock_database.get_pool_status()
+        assert status["truncations"] == {"row_limit": 1, "byte_limit": 0}
+    
+    @pytest.mark.asyncio
+    async def test_byte_budget_truncates_wide_rows(self, mock_database):
+        from oipa_mcp.connectors import collect_truncations
+        
+        mock_pool, _, _ = TestAsyncDatabaseOperations._streaming_pool([[('x' * 1000,)] * 10])
+        mock_database._pool = mock_pool
+        mock_database.config.performance.max_result_bytes = 4000
+        
+        with collect_truncations() as notes:
+            results = await mock_database.execute_query("SELECT Notes FROM AsPolicy", max_rows=100)
+        
+        assert 1 <= len(results) < 4
+        assert notes[0]["reason"] == "byte_limit" and notes[0]["rows_scanned"] == 10
+    
+    @pytest.mark.asyncio
+    async def test_results_within_caps_are_untouched(self, mock_database):
+        from oipa_mcp.connectors import collect_truncations
+        
+        mock_pool, _, _ = TestAsyncDatabaseOperations._streaming_pool([[('P1',), ('P2',)]])
+        mock_database._pool = mock_pool
+        
+        with collect_truncations() as notes:
+            results = await mock_database.execute_query("SELECT PolicyNumber FROM AsPolicy")
+        
+        assert len(results) == 2 and notes == []
+    
+    def test_success_response_reports_truncation(self):
+        from oipa_mcp.connectors import collect_truncations
+        from oipa_mcp.connectors.database import _truncations
+        from oipa_mcp.tools.policy_tools import SearchPoliciesQuality
+        
+        tool = SearchPoliciesQuality()
+        with collect_truncations():
+            _truncations.get().append(
+                {"shape": "abc", "reason": "row_limit", "rows_returned": 5, "rows_scanned": 6}
+            )
+            response = tool._build_success_response([], metadata={"count": 5})
+        
+        assert response["metadata"]["truncated"] is True
+        assert response["metadata"]["rows_scanned"] == 6
+        assert response["metadata"]["count"] == 5
+        assert "metadata" not in tool._build_success_response([])
+
+
+class TestPolicySearchIndex:
+    """In-memory trigram index for substring search"""
+    
+    def test_trigram_search(self):
+        from oipa_mcp.connectors.trigram import TrigramIndex
+        
+        index = TrigramIndex()
+        index.add("G1", ["VG01-002-561-000001063", "María", "García", None, "GARM850101ABC"], stamp=1.0)
+        index.add("G2", ["VG01-002-561-000001064", None, None, "Garcia Hermanos SA", "GHE950204TL0"], stamp=2.0)
+        
+        assert index.search("garc") == ["G2", "G1"]
+        assert index.search("GARCÍA") == ["G1"]
+        assert index.search("1064") == ["G2"]
+        assert index.search("zzz") == []
+        assert index.search("ga") is None
+        # Matches never span two fields
+        assert index.search("MARÍAGAR") == []
+        
+        index.add("G1", ["VG01-002-561-000001063", "Mario", "Lopez"], stamp=3.0)
+        assert index.search("garc") == ["G2"]
+        assert index.search("lopez") == ["G1"]
+        assert index.get_status()["documents"] == 2
+        
+        index.compact()
+        assert index.get_status()["tombstones"] == 0
+        assert index.search("VG01") == ["G1", "G2"]
+        assert index.memory_bytes()["postings"] > 0
+    
+    @pytest.mark.asyncio
+    async def test_incremental_refresh(self):
+        from oipa_mcp.connectors.database import PolicySearchIndex
+        
+        loads = [
+            [[("G1", datetime(2024, 1, 1), "P-1", "Ana", "Ruiz", None, "RUAA800101AB1", datetime(2024, 1, 1)),
+              ("G2", datetime(2024, 1, 2), "P-2", None, None, "ACME Ana SA", "ACM950204TL0", datetime(2024, 1, 5))]],
+            [[("G1", datetime(2024, 2, 1), "P-1", "Ana", "Ortega", None, "RUAA800101AB1", datetime(2024, 2, 1))]]
+        ]
+        queries = []
+        
+        async def stream_batches(query, parameters, row_format):
+            queries.append((query, parameters))
+            for batch in loads.pop(0):
+                yield batch
+        
+        db = Mock()
+        db.stream_batches = stream_batches
+        search_index = PolicySearchIndex(db, interval=60, max_candidates=1)
+        
+        assert search_index.candidates("ruiz") is None
+        assert await search_index.refresh() == 2
+        assert "WHERE" not in queries[0][0]
+        assert search_index.candidates("ruiz") == ["G1"]
+        
+        await search_index.refresh()
+        # Changes are re-read from the high-water mark minus the overlap
+        assert queries[1][1]["since"] == datetime(2024, 1, 5) - PolicySearchIndex.REFRESH_OVERLAP
+        assert search_index.candidates("ruiz") == []
+        assert search_index.candidates("ortega") == ["G1"]
+        # Short and unselective terms go to the database
+        assert search_index.candidates("P-") is None
+        assert search_index.candidates("ana") is None
+        status = search_index.get_status()
+        assert status["ready"] and status["documents"] == 2 and status["memory_bytes"] > 0
+        assert status["fallbacks"]["too_many"] == 1
+        assert status["refresh_lag_seconds"] is not None
+    
+    @pytest.mark.asyncio
+    async def test_reconcile_removes_deleted_policies(self):
+        from oipa_mcp.connectors.database import PolicySearchIndex
+        
+        loads = [
+            [[("G1", datetime(2024, 1, 1), "P-1", "Ana", "Ruiz", None, "RUAA800101AB1", datetime(2024, 1, 1)),
+              ("G2", datetime(2024, 1, 2), "P-2", "Luis", "Ruiz", None, "RULU800101AB1", datetime(2024, 1, 2)),
+              ("G3", datetime(2024, 1, 3), "P-3", "Eva", "Soto", None, "SOEE800101AB1", datetime(2024, 1, 3))]],
+            # G1 was deleted; G3 lost its primary insured without a newer UpdatedGmt
+            [[("G2", datetime(2024, 1, 2), "P-2", "Luis", "Ruiz", None, "RULU800101AB1", datetime(2024, 1, 2)),
+              ("G3", datetime(2024, 1, 3), "P-3", None, None, None, None, datetime(2024, 1, 3))]]
+        ]
+        
+        async def stream_batches(query, parameters, row_format):
+            for batch in loads.pop(0):
+                yield batch
+        
+        db = Mock()
+        db.stream_batches = stream_batches
+        search_index = PolicySearchIndex(db, interval=60, max_candidates=10)
+        await search_index.refresh()
+        
+        assert await search_index.reconcile() == 1
+        assert search_index.candidates("ruiz") == ["G2"]
+        assert search_index.candidates("soto") == []
+        assert search_index.candidates("P-3") == ["G3"]
+        status = search_index.get_status()
+        assert status["removed"] == 1 and status["reindexed"] == 1
+    
+    def test_refresh_query_tracks_role_and_client_changes(self):
+        query, params = OipaQueryBuilder.policy_search_documents(datetime(2024, 1, 1))
+        assert "SELECT PolicyGUID FROM AsRole WHERE RoleCode = '01' AND UpdatedGmt > :since" in query
+        assert "c2.UpdatedGmt > :since" in query
+        assert "NVL(r.UpdatedGmt, p.UpdatedGmt)" in query
+        assert params == {"since": datetime(2024, 1, 1)}
+
+
+class TestPolicyStatusCounts:
+    """Incremental in-process policy counts by status"""
+    
+    @pytest.mark.asyncio
+    async def test_incremental_refresh_and_reconcile(self):
+        from oipa_mcp.connectors.database import PolicyStatusCounts
+        
+        loads = [
+            [[("G1", "01", datetime(2024, 1, 1)), ("G2", "01", datetime(2024, 1, 2)), ("G3", "08", datetime(2024, 1, 3))]],
+            [[("G2", "99", datetime(2024, 2, 1)), ("G3", "08", datetime(2024, 1, 3)), ("G4", "08", datetime(2024, 2, 2))]],
+            # G1 was deleted; only a full recount notices
+            [[("G2", "99", datetime(2024, 2, 1)), ("G3", "08", datetime(2024, 1, 3)), ("G4", "08", datetime(2024, 2, 2))]]
+        ]
+        queries = []
+        
+        async def stream_batches(query, parameters, row_format):
+            queries.append((query, parameters))
+            for batch in loads.pop(0):
+                yield batch
+        
+        db = Mock()
+        db.stream_batches = stream_batches
+        status_counts = PolicyStatusCounts(db, interval=60, reconcile_interval=3600)
+        
+        assert status_counts.snapshot() is None
+        assert await status_counts.refresh() == 3
+        assert "WHERE" not in queries[0][0]
+        assert status_counts.snapshot()[0] == {"01": 2, "08": 1}
+        
+        # Only the status change and the new policy are counted again
+        assert await status_counts.refresh() == 2
+        assert queries[1][1]["since"] == datetime(2024, 1, 3) - PolicyStatusCounts.REFRESH_OVERLAP
+        assert status_counts.snapshot()[0] == {"01": 1, "08": 2, "99": 1}
+        
+        await status_counts.refresh(full=True)
+        assert "WHERE" not in queries[2][0]
+        counts, age_seconds = status_counts.snapshot()
+        assert counts == {"08": 2, "99": 1}
+        assert age_seconds >= 0
+        status = status_counts.get_status()
+        assert status["policies"] == 3 and status["last_drift"] == 1
+        assert status["high_water"] == datetime(2024, 2, 2).isoformat()
+
+
+class TestSummaryViews:
+    """Routing of dashboard aggregates to a summary materialized view"""
+    
+    @pytest.fixture
+    def db(self):
+        db = Mock()
+        db.config = Config()
+        db.execute_query = AsyncMock()
+        return db
+    
+    @pytest.mark.asyncio
+    async def test_fresh_mview_is_used(self, db):
+        from oipa_mcp.connectors.database import SummaryViews
+        
+        db.execute_query.return_value = [("TABLE", "STALE", 120.0), ("MATERIALIZED VIEW", "STALE", 120.0)]
+        summary = SummaryViews(db, "oipa_policy_counts_mv", max_staleness=3600)
+        
+        assert await summary.detect() is True
+        assert db.execute_query.call_args[0][1]["name"] == "OIPA_POLICY_COUNTS_MV"
+        name, age_seconds = await summary.source()
+        assert name == "OIPA_POLICY_COUNTS_MV" and 120 <= age_seconds < 130
+        assert summary.get_status()["object_type"] == "MATERIALIZED VIEW"
+        
+        query, _ = OipaQueryBuilder.count_policies_by_status(name)
+        assert "FROM OIPA_POLICY_COUNTS_MV s" in query
+        assert "AsPolicy" not in query
+    
+    @pytest.mark.asyncio
+    async def test_falls_back_to_base_tables(self, db):
+        from oipa_mcp.connectors.database import SummaryViews
+        
+        assert await SummaryViews(db, None, max_staleness=3600).source() is None
+        db.execute_query.assert_not_called()
+        
+        db.execute_query.return_value = []
+        missing = SummaryViews(db, "OIPA_POLICY_COUNTS_MV", max_staleness=3600)
+        assert await missing.source() is None
+        
+        db.execute_query.return_value = [("MATERIALIZED VIEW", "FRESH", 7200.0)]
+        stale = SummaryViews(db, "OIPA_POLICY_COUNTS_MV", max_staleness=3600)
+        assert await stale.source() is None
+        # Re-checked only after recheck_interval
+        assert await stale.source() is None
+        assert db.execute_query.await_count == 2
+        assert stale.get_status()["fallbacks"]["stale"] == 2
+        
+        # A plain table has no refresh time and needs max_staleness 0
+        db.execute_query.return_value = [("TABLE", None, None)]
+        table = SummaryViews(db, "OIPA_POLICY_COUNTS", max_staleness=3600)
+        assert await table.source() is None
+        table = SummaryViews(db, "OIPA_POLICY_COUNTS", max_staleness=0)
+        assert await table.source() == ("OIPA_POLICY_COUNTS", None)
+        
+        with pytest.raises(ValueError):
+            SummaryViews(db, "counts; DROP TABLE AsPolicy", max_staleness=0)
+    
+    @pytest.mark.asyncio
+    async def test_usable_view_is_rechecked(self, db):
+        from oipa_mcp.connectors.database import SummaryViews
+        
+        db.execute_query.return_value = [("TABLE", None, None)]
+        table = SummaryViews(db, "OIPA_POLICY_COUNTS", max_staleness=0, recheck_interval=0)
+        assert await table.source() == ("OIPA_POLICY_COUNTS", None)
+        
+        # Dropped after detection: the next recheck notices
+        db.execute_query.return_value = []
+        assert await table.source() is None
+        assert table.get_status()["fallbacks"]["missing"] == 1
+        
+        # A failed query routes to the base tables until the recheck finds it again
+        db.execute_query.return_value = [("TABLE", None, None)]
+        table.recheck_interval = 3600
+        table.checked_at = None
+        assert await table.source() == ("OIPA_POLICY_COUNTS", None)
+        table.mark_failed()
+        assert await table.source() is None
+        assert table.get_status()["fallbacks"] == {
+            "not_configured": 0, "missing": 2, "unusable": 0, "stale": 0, "error": 1
+        }
+
+
+class TestCodeDictionary:
+    """In-memory AsCode lookups replacing code-table joins"""
+    
+    @pytest.mark.asyncio
+    async def test_refresh_layers_over_fallback(self):
+        from oipa_mcp.connectors.codes import ROLE, STATE, STATUS
+        from oipa_mcp.connectors.database import CodeDictionary
+        
+        queries = []
+        
+        async def stream_batches(query, parameters, row_format):
+            queries.append((query, parameters))
+            yield [(STATUS, "01", "In Force", "Policy is in force"), (STATE, "CA", "California", "State of California")]
+        
+        db = Mock()
+        db.stream_batches = stream_batches
+        codes = CodeDictionary(db, interval=0)
+        
+        # Built-in descriptions until the first load
+        assert codes.short(STATUS, "01") == "Active"
+        assert codes.short(STATE, "CA") is None
+        
+        assert await codes.refresh() is True
+        assert set(queries[0][1].values()) == {STATUS, STATE, ROLE}
+        assert codes.short(STATUS, "01") == "In Force"
+        assert codes.long(STATE, "CA") == "State of California"
+        # Codes AsCode did not return keep their fallback description
+        assert codes.short(ROLE, "01") == "Primary Insured"
+        assert codes.get_status()["loaded"] is True
+    
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_snapshot(self):
+        from oipa_mcp.connectors.codes import STATUS
+        from oipa_mcp.connectors.database import CodeDictionary
+        
+        async def stream_batches(query, parameters, row_format):
+            raise RuntimeError("ORA-00942: table or view does not exist")
+            yield
+        
+        db = Mock()
+        db.stream_batches = stream_batches
+        codes = CodeDictionary(db, interval=0)
+        
+        assert await codes.refresh() is False
+        assert codes.short(STATUS, "99") == "Cancelled"
+        assert codes.get_status()["load_failures"] == 1
+    
+    def test_queries_return_bare_codes(self):
+        queries = [
+            OipaQueryBuilder.get_policy_details("P1")[0],
+            OipaQueryBuilder.get_policy_roles("G1")[0],
+            OipaQueryBuilder.search_policies("Garcia")[0],
+            OipaQueryBuilder.count_policies_by_status()[0]
+        ]
+        for query in queries:
+            assert "AsCode" not in query
+
+
 class TestBackwardCompatibility:
     """Test backward compatibility after migration"""
     